@@ -0,0 +1,53 @@
+"""
+Indexing throughput and query latency of gdaljson.catalog.Catalog vs. parsing every file and checking
+`VRTBase.extent` per query.
+
+    python benchmarks/bench_catalog.py
+"""
+import os
+import tempfile
+import time
+
+from gdaljson import VRTDataset
+from gdaljson.catalog import Catalog
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "tests", "templates", "translate.vrt")
+
+
+def scan(paths, bbox):
+    hits = []
+    for path in paths:
+        with open(path) as vrtfile:
+            extent = VRTDataset(vrtfile.read()).extent
+        if extent[1] >= bbox[0] and extent[0] <= bbox[1] and extent[3] >= bbox[2] and extent[2] <= bbox[3]:
+            hits.append(path)
+    return hits
+
+
+def main(tile_size=8):
+    with open(TEMPLATE) as vrtfile:
+        vrt = VRTDataset(vrtfile.read())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for (i, tile) in enumerate(vrt.tiles(tile_size)):
+            paths.append(os.path.join(tmpdir, f"{i}.vrt"))
+            tile.to_xml(paths[-1])
+        bbox = [vrt.tlx + 0.01, vrt.tlx + 0.02, vrt.tly - 0.02, vrt.tly - 0.01]
+
+        catalog = Catalog(os.path.join(tmpdir, "catalog.sqlite"))
+        start = time.perf_counter()
+        catalog.add(paths)
+        elapsed = time.perf_counter() - start
+        print(f"indexed {len(paths)} VRTs in {elapsed:.2f}s ({len(paths) / elapsed:.0f} VRTs/s)")
+
+        start = time.perf_counter()
+        hits = catalog.query(bbox=bbox)
+        print(f"catalog query: {len(hits)} hits in {(time.perf_counter() - start) * 1e3:.2f} ms")
+        start = time.perf_counter()
+        hits = scan(paths, bbox)
+        print(f"parse + extent scan: {len(hits)} hits in {(time.perf_counter() - start) * 1e3:.2f} ms")
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cost of warping with a FeatureCollection clipper of many features, of which only four intersect the raster.  The first
+warp parses the file and builds the STRtree; repeated warps query the cached tree and union only the intersecting
+features, so their cost should barely grow with the number of features outside the raster.  "union all" is the cost
+of unioning every feature, which warping paid before features were selected.
+
+    python benchmarks/bench_clipper.py
+"""
+import json
+import os
+import tempfile
+import time
+import timeit
+
+import numpy as np
+import shapely
+from shapely.geometry import box, mapping
+
+from gdaljson import VRTWarpedDataset
+from gdaljson.clipper import clipper_cache
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "tests", "templates", "warped.vrt")
+FEATURES = (1000, 10000, 50000)
+
+
+def collection(vrt, outside: int) -> dict:
+    """FeatureCollection of 4 squares inside the VRT's extent and `outside` squares scattered around it"""
+    (xmin, xmax, ymin, ymax) = vrt.extent
+    (width, height) = (xmax - xmin, ymax - ymin)
+    inside = [
+        box(xmin + width * (0.2 + 0.3 * (i % 2)), ymin + height * (0.2 + 0.3 * (i // 2)),
+            xmin + width * (0.45 + 0.3 * (i % 2)), ymin + height * (0.45 + 0.3 * (i // 2))) for i in range(4)
+    ]
+    rng = np.random.default_rng(0)
+    x = xmax + rng.uniform(0, 100 * width, outside)
+    y = ymin + rng.uniform(-50 * height, 50 * height, outside)
+    far = shapely.box(x, y, x + width / 4, y + height / 4)
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "properties": {}, "geometry": mapping(geom)} for geom in inside + list(far)],
+    }
+
+
+def main():
+    with open(TEMPLATE) as vrtfile:
+        vrt = VRTWarpedDataset(vrtfile.read())
+    print(f"{'features':>10}{'first warp':>14}{'repeat warp':>14}{'union all':>14}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for features in FEATURES:
+            path = os.path.join(tmpdir, f"clipper_{features}.geojson")
+            with open(path, "w") as f:
+                json.dump(collection(vrt, features), f)
+            clipper_cache.clear()
+            start = time.perf_counter()
+            vrt.derive(clipper=path, cropToCutline=True)
+            first = time.perf_counter() - start
+            repeat = min(timeit.repeat(lambda: vrt.derive(clipper=path, cropToCutline=True), number=20, repeat=3)) / 20
+            geoms = clipper_cache.get(path).geoms
+            start = time.perf_counter()
+            shapely.union_all(np.array(geoms, dtype=object))
+            union = time.perf_counter() - start
+            print(f"{features:>10}{first * 1e3:>11.1f} ms{repeat * 1e3:>11.3f} ms{union * 1e3:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
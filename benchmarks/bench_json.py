@@ -0,0 +1,51 @@
+"""
+Parse and serialize cost of the json path (`VRTBase.from_json`/`to_json`, with orjson and with the stdlib json module)
+vs. the xml path (`loads`/`dumps`), on the warped template and on a 1000 source mosaic.
+
+    python benchmarks/bench_json.py
+"""
+import os
+import timeit
+
+from gdaljson import VRTDataset, VRTWarpedDataset, transformations
+from gdaljson.mosaic import MosaicSource, build_vrt
+from gdaljson.transformations import dumps, loads
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "tests", "templates", "warped.vrt")
+
+
+def mosaic(number=1000):
+    sources = [
+        MosaicSource(f"tiles/{i}.tif", [i % 40 * 2560.0, 10, 0, -(i // 40) * 2560.0, 0, -10], 256, 256, 3, "UInt16", 0)
+        for i in range(number)
+    ]
+    return VRTDataset(build_vrt(sources).to_bytes())
+
+
+def bench(name, vrt, number):
+    cls = type(vrt)
+    xml = vrt.to_bytes()
+    backends = ["orjson", "json"] if transformations.orjson is not None else ["json"]
+    orjson = transformations.orjson
+    print(f"{name} ({len(xml) / 1024:.0f} KB of xml)")
+    for label in ["xml"] + backends:
+        transformations.orjson = None if label == "json" else orjson
+        if label == "xml":
+            (load, dump) = (lambda: cls(loads(xml)), lambda: dumps(vrt.data))
+        else:
+            document = vrt.to_json()
+            (load, dump) = (lambda: cls.from_json(document), vrt.to_json)
+        parse = min(timeit.repeat(load, number=number, repeat=3))
+        serialize = min(timeit.repeat(dump, number=number, repeat=3))
+        print(f"  {label:<8}load {parse / number * 1e3:>9.3f} ms   dump {serialize / number * 1e3:>9.3f} ms")
+    transformations.orjson = orjson
+
+
+def main():
+    with open(TEMPLATE) as vrtfile:
+        bench("warped.vrt", VRTWarpedDataset(vrtfile.read()), 500)
+    bench("1000 source mosaic", mosaic(), 5)
+
+
+if __name__ == "__main__":
+    main()
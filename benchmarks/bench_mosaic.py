@@ -0,0 +1,56 @@
+"""
+Build time and peak RSS of gdaljson.mosaic for a large grid of sources: `build_vrt` (document with lazily parsed
+sources, then serialized), `write_vrt` (streamed to a file) and, for comparison, parsing the resulting document into
+dicts with `VRTDataset`.  Each case runs in a fresh interpreter so peak RSS isn't shared between them.
+
+    python benchmarks/bench_mosaic.py [sources]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from gdaljson import VRTDataset
+from gdaljson.mosaic import MosaicSource, build_vrt, write_vrt
+
+CASES = ("build_vrt", "write_vrt", "VRTDataset")
+
+
+def sources(number, per_row=100, size=256, res=10.0):
+    for i in range(number):
+        (row, col) = divmod(i, per_row)
+        gt = [500000 + col * size * res, res, 0, 4000000 - row * size * res, 0, -res]
+        yield MosaicSource(f"tiles/{row}/{col}.tif", gt, size, size, 3, "UInt16", 0)
+
+
+def run(case, number, outfile):
+    start = time.perf_counter()
+    if case == "build_vrt":
+        with open(outfile, "wb") as f:
+            f.write(build_vrt(sources(number)).to_bytes())
+    elif case == "write_vrt":
+        write_vrt(sources(number), outfile)
+    else:
+        with open(outfile, "rb") as f:
+            VRTDataset(f.read())
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{case:<12}{elapsed:>8.2f} s{peak:>10.0f} MB peak RSS")
+
+
+def main(number=100000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outfile = os.path.join(tmpdir, "mosaic.vrt")
+        print(f"{number} sources, 3 bands")
+        for case in CASES:
+            subprocess.run([sys.executable, __file__, case, str(number), outfile], check=True)
+        print(f"document size: {os.path.getsize(outfile) / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        run(sys.argv[1], int(sys.argv[2]), sys.argv[3])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,69 @@
+"""
+Cold start time and resident memory of loading a collection of VRT tiles from a gdaljson.pack file (open only, a
+hundred random VRTs, all of them) vs. unpickling the parsed collection and parsing the xml of every VRT.  Each case runs
+in a fresh interpreter; memory is the growth of private resident memory over the interpreter's footprint after imports.
+Mapped pages of the pack file are shared page cache and aren't counted.  Read from /proc, so Linux only.
+
+    python benchmarks/bench_pack.py [tile_size]
+"""
+import os
+import pickle
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from gdaljson import VRTDataset
+from gdaljson.pack import PackFile, pack
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "tests", "templates", "translate.vrt")
+CASES = ("pack open", "pack 100", "pack all", "pickle", "xml")
+
+
+def rss():
+    with open("/proc/self/statm") as statm:
+        (resident, shared) = [int(x) for x in statm.read().split()[1:3]]
+    return (resident - shared) * resource.getpagesize() / 2**20
+
+
+def run(case, tmpdir):
+    before = rss()
+    start = time.perf_counter()
+    if case.startswith("pack"):
+        vrtpack = PackFile(os.path.join(tmpdir, "tiles.pack"))
+        if case == "pack 100":
+            vrts = [vrtpack[i] for i in random.sample(range(len(vrtpack)), 100)]
+        elif case == "pack all":
+            vrts = list(vrtpack)
+    elif case == "pickle":
+        with open(os.path.join(tmpdir, "tiles.pickle"), "rb") as f:
+            vrts = pickle.load(f)
+    else:
+        with open(os.path.join(tmpdir, "tiles.xml"), "rb") as f:
+            vrts = [VRTDataset(line) for line in f]
+    elapsed = time.perf_counter() - start
+    print(f"{case:<12}{elapsed * 1e3:>10.1f} ms{rss() - before:>10.1f} MB")
+
+
+def main(tile_size=8):
+    with open(TEMPLATE) as vrtfile:
+        vrts = list(VRTDataset(vrtfile.read()).tiles(tile_size))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pack(vrts, os.path.join(tmpdir, "tiles.pack"))
+        with open(os.path.join(tmpdir, "tiles.pickle"), "wb") as f:
+            pickle.dump(vrts, f)
+        with open(os.path.join(tmpdir, "tiles.xml"), "wb") as f:
+            f.write(b"\n".join(vrt.to_bytes() for vrt in vrts))
+        sizes = {name: os.path.getsize(os.path.join(tmpdir, name)) / 2**20 for name in os.listdir(tmpdir)}
+        print(f"{len(vrts)} VRTs, " + ", ".join(f"{name} {size:.1f} MB" for (name, size) in sorted(sizes.items())))
+        for case in CASES:
+            subprocess.run([sys.executable, __file__, case, tmpdir], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and not sys.argv[1].isdigit():
+        run(sys.argv[1], sys.argv[2])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,49 @@
+"""
+Latency of a multi-step translate recipe applied eagerly (one translate per step on a clone) vs. recorded with
+`deferred()` and applied as one fused translate.
+
+    python benchmarks/bench_pipeline.py
+"""
+import os
+import timeit
+
+from gdaljson import VRTDataset
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "tests", "templates", "translate.vrt")
+RECIPE = [
+    {"bandList": [4, 3, 2, 1]},
+    {"srcWin": [10, 10, 400, 400]},
+    {"srcWin": [20, 20, 200, 200]},
+    {"bandList": [1, 2, 3]},
+    {"width": 100},
+]
+
+
+def eager(vrt):
+    out = vrt.clone()
+    for kwargs in RECIPE:
+        out.translate(**kwargs)
+    return out.to_bytes()
+
+
+def deferred(vrt):
+    pipeline = vrt.deferred()
+    for kwargs in RECIPE:
+        pipeline.translate(**kwargs)
+    return pipeline.to_bytes()
+
+
+def main(number=2000):
+    with open(TEMPLATE) as vrtfile:
+        vrt = VRTDataset(vrtfile.read())
+    pipeline = vrt.deferred()
+    for kwargs in RECIPE:
+        pipeline.translate(**kwargs)
+    print(f"{len(RECIPE)} step recipe, fused plan: {pipeline.plan}")
+    for (name, func) in (("eager", eager), ("deferred", deferred)):
+        elapsed = min(timeit.repeat(lambda: func(vrt), number=number, repeat=3))
+        print(f"{name:<12}{elapsed / number * 1e6:>10.1f} us/recipe")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Tiles per second when splitting a VRT into a regular srcWin grid: one parse + translate per tile vs. copy-on-write
+`derive` per tile vs. the batch `tiles` generator.
+
+    python benchmarks/bench_tiles.py
+"""
+import os
+import time
+
+from gdaljson import VRTDataset
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "tests", "templates", "translate.vrt")
+
+
+def reparse(xml, windows):
+    for window in windows:
+        vrt = VRTDataset(xml)
+        vrt.translate(srcWin=window)
+        yield vrt
+
+
+def derive(vrt, windows):
+    for window in windows:
+        yield vrt.derive(srcWin=window)
+
+
+def main(tile_size=16, overlap=2):
+    with open(TEMPLATE) as vrtfile:
+        xml = vrtfile.read()
+    vrt = VRTDataset(xml)
+    windows = vrt.tile_windows(tile_size, overlap=overlap).tolist()
+    cases = [
+        ("parse + translate", lambda: reparse(xml, windows)),
+        ("derive", lambda: derive(vrt, windows)),
+        ("tiles", lambda: vrt.tiles(tile_size, overlap=overlap)),
+    ]
+    print(f"{len(windows)} tiles of {tile_size}px, {overlap}px overlap")
+    for (name, func) in cases:
+        start = time.perf_counter()
+        for _ in func():
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24}{len(windows) / elapsed:>12.0f} tiles/s")
+
+
+if __name__ == "__main__":
+    main()
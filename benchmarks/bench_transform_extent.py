@@ -0,0 +1,47 @@
+"""
+Per-call cost of reprojecting a raster extent: four scalar corner transforms vs. edge-densified sampling, either
+one point at a time or in one batched call.
+
+    python benchmarks/bench_transform_extent.py
+"""
+import timeit
+
+from gdaljson.projection import densify_extent, transform_extent, transformer
+
+EXTENT = [-120.33027767128185, -120.12127580650782, 36.02877092468176, 36.22815613923612]
+
+
+def four_corners(proj_transformer, extent):
+    proj_tl = proj_transformer.transform(extent[0], extent[3])
+    proj_bl = proj_transformer.transform(extent[0], extent[2])
+    proj_br = proj_transformer.transform(extent[1], extent[2])
+    proj_tr = proj_transformer.transform(extent[1], extent[3])
+    return [
+        min(proj_tl[0], proj_bl[0]),
+        max(proj_tr[0], proj_br[0]),
+        min(proj_bl[1], proj_br[1]),
+        max(proj_tl[1], proj_tr[1]),
+    ]
+
+
+def densified_loop(proj_transformer, extent, densify):
+    points = [proj_transformer.transform(x, y) for (x, y) in zip(*densify_extent(extent, densify))]
+    xs, ys = zip(*points)
+    return [min(xs), max(xs), min(ys), max(ys)]
+
+
+def main(number=2000):
+    proj_transformer = transformer(4326, 32611)
+    cases = [("four corners", lambda: four_corners(proj_transformer, EXTENT))]
+    for densify in (2, 21, 101):
+        cases.append((f"scalar loop ({densify} per edge)",
+                      lambda d=densify: densified_loop(proj_transformer, EXTENT, d)))
+        cases.append((f"batched ({densify} per edge)",
+                      lambda d=densify: transform_extent(proj_transformer, EXTENT, densify=d)))
+    for (name, func) in cases:
+        elapsed = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name:<32}{elapsed / number * 1e6:>10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Outputs per second when clipping one VRT by many cutlines: `warp(clipper=...)` on a fresh parse per feature vs.
+`derive` per feature vs. `warp_many`, serially and across a process pool.
+
+    python benchmarks/bench_warp_many.py
+"""
+import os
+import time
+
+from shapely.affinity import translate
+
+from gdaljson import VRTWarpedDataset
+from gdaljson.clipper import load_clipper
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), "..", "tests", "templates")
+
+
+def reparse(xml, geoms, **kwargs):
+    for geom in geoms:
+        vrt = VRTWarpedDataset(xml)
+        vrt.warp(clipper=geom, **kwargs)
+        yield vrt
+
+
+def derive(vrt, geoms, **kwargs):
+    for geom in geoms:
+        yield vrt.derive(clipper=geom, **kwargs)
+
+
+def main(count=2000, workers=4):
+    with open(os.path.join(TEMPLATES, "warped.vrt")) as vrtfile:
+        xml = vrtfile.read()
+    vrt = VRTWarpedDataset(xml)
+    geom = load_clipper(os.path.join(TEMPLATES, "clipper.geojson"))
+    geoms = [translate(geom, 1e-5 * i, -1e-5 * i) for i in range(count)]
+    for kwargs in ({"cropToCutline": True}, {"dstSRS": 32611, "cropToCutline": True}):
+        print(f"{count} cutlines, {kwargs}")
+        cases = [
+            ("parse + warp", lambda: reparse(xml, geoms, **kwargs)),
+            ("derive", lambda: derive(vrt, geoms, **kwargs)),
+            ("warp_many", lambda: vrt.warp_many(geoms, **kwargs)),
+            (f"warp_many ({workers} workers)", lambda: vrt.warp_many(geoms, workers=workers, **kwargs)),
+        ]
+        for (name, func) in cases:
+            start = time.perf_counter()
+            for _ in func():
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<28}{count / elapsed:>10.0f} outputs/s")
+
+
+if __name__ == "__main__":
+    main()
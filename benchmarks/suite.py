@@ -0,0 +1,193 @@
+"""
+Benchmark suite over synthetic VRTs scaled along band count, source count (document size) and cutline vertex count.
+Measures `loads`, `dumps`, `to_xml`, `translate`, `warp` and `coords_to_pix`, recording the best time per call and the
+peak memory (tracemalloc) of one call.  Results are written as json; `compare` flags cases slower or hungrier than a
+baseline (benchmarks/baseline.json, recorded on the reference machine) by more than a threshold.
+
+    python benchmarks/suite.py run [-o results.json] [-k loads]
+    python benchmarks/suite.py compare benchmarks/baseline.json results.json [--threshold 0.25]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+from shapely.geometry import Polygon, mapping
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+from gdaljson.vrt import VRTBase
+from gdaljson.mosaic import MosaicSource, build_vrt
+from gdaljson.transformations import dumps, loads
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), "..", "tests", "templates")
+BANDS = (1, 4, 32)
+SOURCES = (1, 100, 5000)
+VERTICES = (16, 1024, 65536)
+# Memory growth below this many bytes is never flagged
+MEMORY_SLACK = 64 * 1024
+
+
+def synthetic_vrt(bands: int = 4) -> VRTDataset:
+    """Single source VRTDataset (gdal_translate output) with `bands` bands"""
+    with open(os.path.join(TEMPLATES, "translate.vrt")) as vrtfile:
+        vrt = VRTDataset(vrtfile.read())
+    _set_bands(vrt, bands)
+    return vrt
+
+
+def synthetic_warped(bands: int = 4) -> VRTWarpedDataset:
+    """VRTWarpedDataset (gdalwarp output) with `bands` bands"""
+    with open(os.path.join(TEMPLATES, "warped.vrt")) as vrtfile:
+        vrt = VRTWarpedDataset(vrtfile.read())
+    _set_bands(vrt, bands)
+    return vrt
+
+
+def _set_bands(vrt, bands: int) -> None:
+    if bands < vrt.bands:
+        vrt.drop_bands(range(bands + 1, vrt.bands + 1))
+    elif bands > vrt.bands:
+        vrt.add_bands(bands - vrt.bands)
+
+
+def synthetic_mosaic(sources: int, bands: int = 1) -> bytes:
+    """Mosaic document of `sources` 256px tiles, 100 per row"""
+    tiles = [
+        MosaicSource(f"tiles/{i}.tif", [i % 100 * 2560.0, 10, 0, -(i // 100) * 2560.0, 0, -10], 256, 256, bands,
+                     "UInt16", 0) for i in range(sources)
+    ]
+    return build_vrt(tiles).to_bytes()
+
+
+def synthetic_cutline(vrt: VRTWarpedDataset, vertices: int) -> dict:
+    """Geojson feature of a polygon with `vertices` vertices inscribed in the VRT's extent"""
+    (xmin, xmax, ymin, ymax) = vrt.extent
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    # A wobbly circle, so simplification can't trivially remove vertices
+    radius = 0.4 * min(xmax - xmin, ymax - ymin) * (1 + 0.05 * np.sin(angles * 7))
+    (cx, cy) = ((xmin + xmax) / 2, (ymin + ymax) / 2)
+    ring = np.column_stack([cx + radius * np.cos(angles), cy + radius * np.sin(angles)])
+    return {"type": "Feature", "properties": {}, "geometry": mapping(Polygon(ring))}
+
+
+def cases():
+    """Generate (name, function) benchmark cases.  Inputs are built before timing starts"""
+    for sources in SOURCES:
+        xml = synthetic_mosaic(sources)
+        data = loads(xml)
+        vrt = VRTBase(data)
+        yield (f"loads[sources={sources}]", lambda xml=xml: loads(xml))
+        yield (f"loads_lazy[sources={sources}]", lambda xml=xml: loads(xml, lazy=True))
+        yield (f"dumps[sources={sources}]", lambda data=data: dumps(data))
+        yield (f"to_xml[sources={sources}]", lambda vrt=vrt: vrt.to_xml(io.BytesIO()))
+
+    for bands in BANDS:
+        vrt = synthetic_vrt(bands)
+        yield (f"translate[bands={bands}]",
+               lambda vrt=vrt: vrt.derive(srcWin=[10, 20, 300, 200], width=150, noData=0, resampleAlg="Bilinear"))
+        warped = synthetic_warped(bands)
+        yield (f"warp_reproject[bands={bands}]", lambda vrt=warped: vrt.derive(dstSRS=3857))
+        yield (f"warp_alpha[bands={bands}]", lambda vrt=warped: vrt.derive(width=300, dstAlpha=True))
+
+    warped = synthetic_warped()
+    for vertices in VERTICES:
+        clipper = synthetic_cutline(warped, vertices)
+        yield (f"warp_cutline[vertices={vertices}]",
+               lambda clipper=clipper: warped.derive(clipper=clipper, cropToCutline=True))
+
+    for points in (1, 10000, 1000000):
+        (xmin, xmax, ymin, ymax) = warped.extent
+        x = np.random.default_rng(0).uniform(xmin, xmax, points)
+        y = np.random.default_rng(1).uniform(ymin, ymax, points)
+        if points == 1:
+            (x, y) = (float(x[0]), float(y[0]))
+        yield (f"coords_to_pix[points={points}]", lambda x=x, y=y: warped.coords_to_pix(x, y))
+
+
+def measure(func, repeat: int = 5) -> dict:
+    timer = timeit.Timer(func)
+    (number, _) = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {"time": seconds, "peak_memory": peak}
+
+
+def run(args) -> None:
+    results = {}
+    for (name, func) in cases():
+        if args.k and args.k not in name:
+            continue
+        results[name] = measure(func, repeat=args.repeat)
+        print(f"{name:<36}{results[name]['time'] * 1e3:>12.4f} ms{results[name]['peak_memory'] / 1024:>12.1f} KB",
+              flush=True)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+
+
+def compare(args) -> None:
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.results) as f:
+        results = json.load(f)["results"]
+    regressions = []
+    print(f"{'case':<36}{'time':>10}{'memory':>10}")
+    for (name, base) in sorted(baseline.items()):
+        if name not in results:
+            print(f"{name:<36}{'missing':>10}")
+            continue
+        new = results[name]
+        time_ratio = new["time"] / base["time"]
+        memory_ratio = (new["peak_memory"] + 1) / (base["peak_memory"] + 1)
+        flags = []
+        if time_ratio > 1 + args.threshold:
+            flags.append("time")
+        if memory_ratio > 1 + args.threshold and new["peak_memory"] - base["peak_memory"] > MEMORY_SLACK:
+            flags.append("memory")
+        if flags:
+            regressions.append(name)
+        print(f"{name:<36}{time_ratio:>9.2f}x{memory_ratio:>9.2f}x  {'REGRESSION (' + ', '.join(flags) + ')' if flags else ''}")
+    for name in sorted(set(results) - set(baseline)):
+        print(f"{name:<36}{'new':>10}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the suite")
+    run_parser.add_argument("-o", "--output", help="Write results to this json file")
+    run_parser.add_argument("-k", help="Only run cases whose name contains this string")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.set_defaults(func=run)
+    compare_parser = commands.add_parser("compare", help="Compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    compare_parser.set_defaults(func=compare)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from .transformations import dumps, loads
 from .vrt import VRTDataset, VRTWarpedDataset
+from .aio import aload, awrite
@@ -0,0 +1,41 @@
+"""
+asyncio entry points.  File I/O and parsing run in an executor (the event loop's default executor unless one is passed)
+so a single process can serve many concurrent requests; see also `VRTDataset.atranslate`, `VRTWarpedDataset.awarp` and
+`gdaljson.projection.awkt`.
+"""
+import asyncio
+
+from gdaljson.transformations import loads
+from gdaljson.vrt import VRTDataset, VRTWarpedDataset
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as vrtfile:
+        return vrtfile.read()
+
+
+def _write(path: str, data: bytes) -> None:
+    with open(path, "wb") as vrtfile:
+        vrtfile.write(data)
+
+
+def open_vrt(s, lazy: bool = False):
+    """Load a VRTWarpedDataset or VRTDataset from xml, depending on the subClass of the root element"""
+    data = loads(s, lazy=lazy)
+    if data["VRTDataset"].get("@subClass") == "VRTWarpedDataset":
+        return VRTWarpedDataset(data)
+    return VRTDataset(data)
+
+
+async def aload(path: str, lazy: bool = False, executor=None):
+    """Read and parse a .vrt file without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(executor, _read, path)
+    return await loop.run_in_executor(executor, open_vrt, data, lazy)
+
+
+async def awrite(vrt, path: str, executor=None) -> None:
+    """Serialize and write a VRT to a .vrt file without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(executor, vrt.to_bytes)
+    await loop.run_in_executor(executor, _write, path, data)
@@ -0,0 +1,117 @@
+"""
+Batch mode for the `warp` and `translate` console scripts: apply the same options to every VRT in a directory, glob or
+manifest file from a single process, optionally across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import glob
+import os
+import time
+
+import click
+
+from gdaljson.vrt import VRTDataset, VRTWarpedDataset
+
+
+def collect_inputs(source: str) -> list:
+    """
+    Method to list input files from a directory (every *.vrt), a glob pattern, a single .vrt file or a manifest file with
+    one path per line (relative paths are resolved against the manifest, blank lines and lines starting with # are skipped)
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.vrt")))
+    if glob.has_magic(source):
+        return sorted(glob.glob(source))
+    if source.endswith(".vrt"):
+        return [source]
+    root = os.path.dirname(source)
+    with open(source) as manifest:
+        lines = [line.strip() for line in manifest]
+    return [os.path.join(root, line) for line in lines if line and not line.startswith("#")]
+
+
+def warp_file(infile: str, outfile: str, **kwargs) -> None:
+    with open(infile) as vrtfile:
+        vrt = VRTWarpedDataset(vrtfile.read())
+    vrt.warp(**kwargs)
+    vrt.to_xml(outfile)
+
+
+def translate_file(infile: str, outfile: str, **kwargs) -> None:
+    with open(infile) as vrtfile:
+        vrt = VRTDataset(vrtfile.read())
+    vrt.translate(**kwargs)
+    vrt.to_xml(outfile)
+
+
+def _run_one(func, job: tuple) -> tuple:
+    """Run one file, returning (infile, error message or None) so a failure never stops the batch"""
+    (infile, outfile) = job
+    try:
+        func(infile, outfile)
+    except Exception as e:
+        return (infile, f"{type(e).__name__}: {e}")
+    return (infile, None)
+
+
+class BatchResult(object):
+    """Summary of a batch run"""
+
+    def __init__(self, processed: int, failures: list, elapsed: float):
+        self.processed = processed
+        self.failures = failures
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self):
+        return self.processed - len(self.failures)
+
+    @property
+    def throughput(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"Processed {self.processed} files in {self.elapsed:.2f}s ({self.throughput:.1f} files/s), "
+                f"{self.succeeded} succeeded, {len(self.failures)} failed")
+
+
+def run_batch(func, inputs: list, outdir: str, workers: int = None, **kwargs) -> BatchResult:
+    """
+    Method to apply `func(infile, outfile, **kwargs)` to every input, writing outputs to `outdir` under the input's path
+    relative to the inputs' common directory (its basename when all inputs share a directory).  Inputs which would
+    write the same output as an earlier input are reported as failures.  With `workers`, files are processed in a
+    process pool.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    inputs = list(inputs)
+    jobs = []
+    failures = []
+    if inputs:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(infile)) for infile in inputs])
+        outfiles = set()
+        for infile in inputs:
+            outfile = os.path.join(outdir, os.path.relpath(os.path.abspath(infile), root))
+            if outfile in outfiles:
+                failures.append((infile, f"Duplicate output {outfile}"))
+                continue
+            outfiles.add(outfile)
+            os.makedirs(os.path.dirname(outfile), exist_ok=True)
+            jobs.append((infile, outfile))
+    run = functools.partial(_run_one, functools.partial(func, **kwargs))
+    start = time.perf_counter()
+    if workers and workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(run, jobs, chunksize=max(1, len(jobs) // (workers * 16))))
+    else:
+        results = [run(job) for job in jobs]
+    failures += [(infile, error) for (infile, error) in results if error is not None]
+    return BatchResult(len(inputs), failures, time.perf_counter() - start)
+
+
+def report(result: BatchResult) -> None:
+    """Print the summary of a batch run and exit with status 1 if any file failed"""
+    click.echo(str(result))
+    for (infile, error) in result.failures:
+        click.echo(f"FAILED {infile}: {error}", err=True)
+    if result.failures:
+        raise SystemExit(1)
@@ -0,0 +1,263 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Thread-safe, bounded least-recently-used mapping.  Tracks hits and misses so callers can confirm how often a
+    lookup was served from memory.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+class MemoryCache(object):
+    """In-memory LRU backend for ResultCache, bounded by the total size of the stored values in bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._data[key] = value
+            self.nbytes += len(value)
+            while self.nbytes > self.max_bytes:
+                (_, evicted) = self._data.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+class DiskCache(object):
+    """
+    On-disk backend for ResultCache storing one file per key under `path`.  When `max_bytes` is set, the least recently
+    used files are removed once the total size is exceeded.
+    """
+
+    def __init__(self, path: str, max_bytes: int = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def __len__(self):
+        return sum(len(files) for (_, _, files) in os.walk(self.path))
+
+    def get(self, key: str):
+        try:
+            with open(self._file(key), "rb") as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            # Track recency for eviction
+            os.utime(self._file(key))
+        except FileNotFoundError:
+            # Evicted by a concurrent set() since it was read, which doesn't make the value read any less valid
+            pass
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        filename = self._file(key)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial value
+        (fd, tmpname) = tempfile.mkstemp(dir=os.path.dirname(filename))
+        with os.fdopen(fd, "wb") as f:
+            f.write(value)
+        os.replace(tmpname, filename)
+        if self.max_bytes is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for (root, _, files) in os.walk(self.path):
+            for name in files:
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+        total = sum(size for (_, size, _) in entries)
+        for (_, size, filename) in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+
+
+# Parameters documented as file paths, which are keyed by file content
+PATH_PARAMS = ("clipper", )
+
+
+def _canonical(value, path: bool = False):
+    """
+    Convert an operation parameter to a json-serializable value which is stable across equivalent inputs.  With `path`,
+    a string naming an existing file is replaced by a hash of the file's content.
+    """
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for (k, v) in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    elif hasattr(value, "tolist"):
+        return value.tolist()
+    elif hasattr(value, "wkb_hex"):
+        return {"wkb": value.wkb_hex}
+    elif hasattr(value, "__geo_interface__"):
+        return _canonical(value.__geo_interface__)
+    elif path and isinstance(value, str) and os.path.isfile(value):
+        # Files (e.g. clippers) are keyed by content so edits invalidate cached results
+        with open(value, "rb") as f:
+            return {"file": hashlib.sha256(f.read()).hexdigest()}
+    return value
+
+
+class ResultCache(object):
+    """
+    Memoizes the serialized output of `VRTDataset.translate` and `VRTWarpedDataset.warp`.  Results are keyed by a
+    sha256 hash of the input document plus the operation's parameters, normalized against the method's defaults so
+    equivalent calls share an entry.  `backend` is a MemoryCache, DiskCache or any object with get(key)/set(key, value).
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(vrt) -> str:
+        """Hash of the input document (may be computed once and passed to `key` for repeated lookups)"""
+        return hashlib.sha256(vrt.to_bytes()).hexdigest()
+
+    @staticmethod
+    def params(vrt, op: str, kwargs: dict) -> dict:
+        """Bind `kwargs` to the signature of `op`, apply defaults and drop unset options"""
+        bound = inspect.signature(getattr(vrt, op)).bind(**kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        params.update(params.pop("kwargs", {}))
+        return {
+            k: _canonical(v, path=k in PATH_PARAMS)
+            for (k, v) in params.items()
+            if not (v is None or v is False or (isinstance(v, (tuple, list)) and not v))
+        }
+
+    def key(self, vrt, op: str, kwargs: dict, digest: str = None) -> str:
+        payload = json.dumps([digest or self.digest(vrt), op, self.params(vrt, op, kwargs)],
+                             sort_keys=True,
+                             separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _apply(self, vrt, op: str, kwargs: dict, digest: str = None) -> bytes:
+        key = self.key(vrt, op, kwargs, digest=digest)
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+        result = vrt.clone()
+        getattr(result, op)(**kwargs)
+        value = result.to_bytes()
+        self.backend.set(key, value)
+        return value
+
+    def translate(self, vrt, digest: str = None, **kwargs) -> bytes:
+        """Serialized output of `vrt.translate(**kwargs)`, leaving `vrt` untouched"""
+        return self._apply(vrt, "translate", kwargs, digest=digest)
+
+    def warp(self, vrt, digest: str = None, **kwargs) -> bytes:
+        """Serialized output of `vrt.warp(**kwargs)`, leaving `vrt` untouched"""
+        return self._apply(vrt, "warp", kwargs, digest=digest)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.backend),
+        }
@@ -0,0 +1,213 @@
+"""
+Persistent spatial index over a catalog of VRT files.  Each VRT's footprint, SRS/EPSG and grid are read from the
+document header (bands and sources are never parsed) and stored in SQLite R-tree tables, one in the VRT's own SRS and
+one in EPSG:4326, so bbox and geometry queries don't touch the files.  R-tree coordinates are single precision, so
+candidates are confirmed against the exact extents stored alongside.  Entries can be added and removed without
+rebuilding the index.
+"""
+from collections import namedtuple
+import os
+import sqlite3
+import threading
+from xml.parsers import expat
+
+import numpy as np
+import shapely
+
+from gdaljson.projection import transform_extent, transformer
+from gdaljson.vrt import VRTBase
+
+CatalogEntry = namedtuple("CatalogEntry", ["path", "epsg", "extent", "xsize", "ysize", "bands", "geogname"])
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS vrts (
+        id INTEGER PRIMARY KEY,
+        path TEXT UNIQUE NOT NULL,
+        mtime REAL,
+        epsg INTEGER,
+        xsize INTEGER,
+        ysize INTEGER,
+        bands INTEGER,
+        geogname TEXT,
+        xmin REAL, xmax REAL, ymin REAL, ymax REAL,
+        lon_min REAL, lon_max REAL, lat_min REAL, lat_max REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS vrts_epsg ON vrts (epsg)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS footprints USING rtree(id, xmin, xmax, ymin, ymax)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS footprints_wgs84 USING rtree(id, xmin, xmax, ymin, ymax)",
+]
+
+
+class _StopParsing(Exception):
+    pass
+
+
+def read_header(data: bytes) -> VRTBase:
+    """
+    Read the dataset attributes, SRS and GeoTransform of a VRT document, stopping at the first band.  Returns a VRTBase
+    without bands, which is enough for `extent`, `epsg` and `geogname`.
+    """
+    header = {}
+    text = {}
+    stack = []
+
+    def start(tag, attrib):
+        if not stack:
+            header.update({"@" + k: v for (k, v) in attrib.items()})
+        elif tag == "VRTRasterBand":
+            raise _StopParsing()
+        stack.append(tag)
+
+    def end(tag):
+        stack.pop()
+
+    def chars(data):
+        if len(stack) == 2 and stack[1] in ("SRS", "GeoTransform"):
+            text[stack[1]] = text.get(stack[1], "") + data
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = chars
+    try:
+        parser.Parse(data, True)
+    except _StopParsing:
+        pass
+    header["@rasterXSize"] = int(header["@rasterXSize"])
+    header["@rasterYSize"] = int(header["@rasterYSize"])
+    header.update({k: {"$": v.strip()} for (k, v) in text.items()})
+    header["VRTRasterBand"] = []
+    return VRTBase({"VRTDataset": header})
+
+
+class Catalog(object):
+    """
+    Spatial index of VRT files backed by SQLite (`path=":memory:"` for a throwaway index).  Extents are
+    [xmin, xmax, ymin, ymax] like `VRTBase.extent`.
+    """
+
+    def __init__(self, path: str = ":memory:", densify: int = 21):
+        self.path = path
+        self.densify = densify
+        self._lock = threading.Lock()
+        # (path, error message) of the files the last `add` couldn't index
+        self.failures = []
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM vrts").fetchone()[0]
+
+    def __contains__(self, path):
+        return self.conn.execute("SELECT 1 FROM vrts WHERE path = ?", (os.path.abspath(path), )).fetchone() is not None
+
+    def _wgs84(self, epsg, extent):
+        if epsg == 4326:
+            return extent
+        try:
+            (_, _, bounds) = transform_extent(transformer(epsg, 4326), extent, densify=self.densify)
+        except Exception:
+            return None
+        return bounds
+
+    def _record(self, path: str) -> tuple:
+        with open(path, "rb") as vrtfile:
+            data = vrtfile.read()
+        vrt = read_header(data)
+        try:
+            epsg = int(vrt.epsg)
+        except (TypeError, ValueError):
+            epsg = None
+        extent = vrt.extent
+        wgs84 = self._wgs84(epsg, extent) if epsg else None
+        bands = data.count(b"<VRTRasterBand")
+        return (path, os.path.getmtime(path), epsg, vrt.xsize, vrt.ysize, bands, vrt.geogname, extent, wgs84)
+
+    def add(self, paths, update: bool = False) -> int:
+        """
+        Index one or more VRT files.  Files already in the catalog are skipped unless `update` is set, in which case they
+        are re-read if modified since they were indexed.  Files which can't be read or parsed are skipped (keeping any
+        existing entry) and listed with their error in `failures`, so one bad file never loses the rest of the batch.
+        Returns the number of files (re)indexed.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        indexed = 0
+        failures = []
+        with self._lock, self.conn:
+            for path in paths:
+                path = os.path.abspath(path)
+                row = self.conn.execute("SELECT id, mtime FROM vrts WHERE path = ?", (path, )).fetchone()
+                try:
+                    if row is not None and (not update or row[1] == os.path.getmtime(path)):
+                        continue
+                    record = self._record(path)
+                except Exception as e:
+                    failures.append((path, f"{type(e).__name__}: {e}"))
+                    continue
+                if row is not None:
+                    self._delete(row[0])
+                cursor = self.conn.execute(
+                    "INSERT INTO vrts VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*record[:7], *record[7], *(record[8] or [None] * 4)))
+                self.conn.execute("INSERT INTO footprints VALUES (?, ?, ?, ?, ?)", (cursor.lastrowid, *record[7]))
+                if record[8] is not None:
+                    self.conn.execute("INSERT INTO footprints_wgs84 VALUES (?, ?, ?, ?, ?)",
+                                      (cursor.lastrowid, *record[8]))
+                indexed += 1
+        self.failures = failures
+        return indexed
+
+    def _delete(self, rowid: int) -> None:
+        for table in ("vrts", "footprints", "footprints_wgs84"):
+            self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (rowid, ))
+
+    def remove(self, paths) -> int:
+        """Remove one or more VRT files from the catalog, returning the number removed"""
+        if isinstance(paths, str):
+            paths = [paths]
+        removed = 0
+        with self._lock, self.conn:
+            for path in paths:
+                row = self.conn.execute("SELECT id FROM vrts WHERE path = ?", (os.path.abspath(path), )).fetchone()
+                if row is not None:
+                    self._delete(row[0])
+                    removed += 1
+        return removed
+
+    def query(self, bbox: list = None, geometry=None, epsg: int = None) -> list:
+        """
+        Return the entries whose footprint intersects `bbox` ([xmin, xmax, ymin, ymax]) or a shapely `geometry`.  Queries
+        are in EPSG:4326 unless `epsg` is given, in which case only VRTs in that SRS are searched, in their own coordinates.
+        """
+        if (bbox is None) == (geometry is None):
+            raise ValueError("Exactly one of bbox and geometry is required")
+        if geometry is not None:
+            (xmin, ymin, xmax, ymax) = geometry.bounds
+            bbox = [xmin, xmax, ymin, ymax]
+        if epsg:
+            (table, columns) = ("footprints", ("xmin", "xmax", "ymin", "ymax"))
+        else:
+            (table, columns) = ("footprints_wgs84", ("lon_min", "lon_max", "lat_min", "lat_max"))
+        (xmin, xmax, ymin, ymax) = [f"v.{column}" for column in columns]
+        sql = (f"SELECT v.path, v.epsg, {xmin}, {xmax}, {ymin}, {ymax}, v.xsize, v.ysize, v.bands, v.geogname "
+               f"FROM {table} f JOIN vrts v ON v.id = f.id "
+               f"WHERE f.xmax >= ? AND f.xmin <= ? AND f.ymax >= ? AND f.ymin <= ? "
+               f"AND {xmax} >= ? AND {xmin} <= ? AND {ymax} >= ? AND {ymin} <= ?")
+        params = [bbox[0], bbox[1], bbox[2], bbox[3]] * 2
+        if epsg:
+            sql += " AND v.epsg = ?"
+            params.append(int(epsg))
+        rows = self.conn.execute(sql + " ORDER BY v.id", params).fetchall()
+        if geometry is not None and rows:
+            # The R-tree only compares bounding boxes
+            extents = np.array([row[2:6] for row in rows])
+            footprints = shapely.box(extents[:, 0], extents[:, 2], extents[:, 1], extents[:, 3])
+            rows = [row for (row, hit) in zip(rows, shapely.intersects(footprints, geometry)) if hit]
+        return [CatalogEntry(row[0], row[1], list(row[2:6]), *row[6:]) for row in rows]
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,251 @@
+"""
+Loading of cutline geometries passed as `clipper` to `VRTWarpedDataset.warp` and `VRTWarpedDataset.warp_many`.
+"""
+from collections import namedtuple
+import hashlib
+import json
+import os
+import threading
+import geojson
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+
+from gdaljson.cache import LRUCache
+from gdaljson.projection import transformer
+
+
+class CutlineStats(namedtuple("CutlineStats", ["vertices_before", "vertices_after", "bytes_before", "bytes_after"])):
+    """Size of a cutline before and after `optimize_cutlines`"""
+    __slots__ = ()
+
+    @property
+    def vertices_removed(self) -> int:
+        return self.vertices_before - self.vertices_after
+
+    @property
+    def bytes_removed(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def _read(clipper) -> list:
+    """Parse a clipper to a list of geometries, one per feature of a FeatureCollection"""
+    if isinstance(clipper, BaseGeometry):
+        return [clipper]
+    elif type(clipper) is str and clipper.endswith(".geojson"):
+        with open(clipper) as clip_file:
+            clipper = geojson.load(clip_file)
+    elif type(clipper) is dict:
+        clipper = geojson.loads(json.dumps(clipper))
+    elif hasattr(clipper, "__geo_interface__"):
+        if clipper.__geo_interface__.get("type") != "FeatureCollection":
+            return [shape(clipper)]
+        clipper = clipper.__geo_interface__
+    else:
+        raise ValueError("Invalid clipper type")
+    if clipper.get("type") == "FeatureCollection":
+        return [shape(feature["geometry"]) for feature in clipper["features"]]
+    if clipper.get("type") == "Feature":
+        return [shape(clipper["geometry"])]
+    return [shape(clipper)]
+
+
+class Clipper(object):
+    """
+    A parsed clipper: one geometry, or the features of a FeatureCollection.  The polygons of a multi-part clipper are
+    indexed in an STRtree on first use, so `select` only unions those which intersect a footprint.
+    """
+
+    def __init__(self, geoms: list):
+        self.geoms = geoms
+        self.projected = {}
+        self._geom = geoms[0] if len(geoms) == 1 else None
+        self._parts = None
+        self._tree = None
+
+    @property
+    def geom(self):
+        """Union of all features"""
+        if self._geom is None:
+            self._geom = shapely.union_all(np.array(self.geoms, dtype=object))
+        return self._geom
+
+    def select(self, footprint=None):
+        """Union of the polygons intersecting `footprint` (a geometry in the clipper's SRS), or of all of them"""
+        if footprint is None:
+            return self.geom
+        if self._parts is None:
+            self._parts = shapely.get_parts(np.array(self.geoms, dtype=object))
+            if len(self._parts) > 1:
+                self._tree = shapely.STRtree(self._parts)
+        if self._tree is None:
+            return self.geom if footprint.intersects(self.geom) else shapely.Polygon()
+        hits = self._tree.query(footprint, predicate="intersects")
+        if len(hits) == len(self._parts):
+            return self.geom
+        if not len(hits):
+            return shapely.Polygon()
+        return shapely.union_all(self._parts[np.sort(hits)])
+
+
+def load_clipper(clipper, footprint=None):
+    """
+    Load a clipper (geojson file path, geojson-like dict or object with __geo_interface__, holding a geometry, Feature or
+    FeatureCollection) to a shapely geometry.  Collections and multi-part geometries are unioned, keeping only the parts
+    which intersect `footprint` if given.
+    """
+    return Clipper(_read(clipper)).select(footprint)
+
+
+def load_clippers(clippers, footprint=None) -> list:
+    """
+    Load many clippers to a list of shapely geometries.  Accepts a FeatureCollection (geojson file path, dict or object
+    with __geo_interface__), a single clipper, or an iterable of clippers.  As in `load_clipper`, only the parts of each
+    clipper which intersect `footprint` are kept if given.
+    """
+    if type(clippers) is str and clippers.endswith(".geojson"):
+        with open(clippers) as clip_file:
+            clippers = geojson.load(clip_file)
+    if isinstance(clippers, BaseGeometry):
+        return [Clipper([clippers]).select(footprint)]
+    collection = getattr(clippers, "__geo_interface__", clippers)
+    if isinstance(collection, dict):
+        if collection.get("type") == "FeatureCollection":
+            return [Clipper([shape(feature["geometry"])]).select(footprint) for feature in collection["features"]]
+        return [load_clipper(collection, footprint)]
+    return [clipper_cache.get(clipper).select(footprint) for clipper in clippers]
+
+
+def _plain(obj):
+    """`default` hook for json.dumps which converts numpy arrays and scalars in full"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ClipperCache(object):
+    """
+    Bounded LRU of parsed clipper geometries, each with its reprojections by (source, target) EPSG code.  Geojson files
+    are keyed by path, mtime and size, and dicts and objects with __geo_interface__ by a hash of their content on every
+    use, so edited files and objects are reloaded.  Shapely geometries are returned as they are.  `maxsize=0` disables
+    caching.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.entries = LRUCache(maxsize)
+        self.projected_hits = 0
+        self.projected_misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        return {
+            "hits": self.entries.hits,
+            "misses": self.entries.misses,
+            "projected_hits": self.projected_hits,
+            "projected_misses": self.projected_misses,
+            "entries": len(self.entries),
+        }
+
+    def key(self, clipper):
+        """Cache key of a clipper, or None if it isn't cacheable"""
+        if isinstance(clipper, BaseGeometry):
+            return None
+        if type(clipper) is str:
+            if not clipper.endswith(".geojson"):
+                return None
+            path = os.path.abspath(clipper)
+            stat = os.stat(path)
+            return ("file", path, stat.st_mtime_ns, stat.st_size)
+        content = getattr(clipper, "__geo_interface__", clipper)
+        try:
+            payload = json.dumps(content, sort_keys=True, default=_plain)
+        except TypeError:
+            return None
+        return ("geojson", hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+    def get(self, clipper) -> Clipper:
+        """Parsed (and indexed) clipper, parsing it only on the first use"""
+        key = self.key(clipper) if self.entries.maxsize else None
+        if key is None:
+            return Clipper(_read(clipper))
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = Clipper(_read(clipper))
+            self.entries.set(key, entry)
+        return entry
+
+    def load(self, clipper, footprint=None):
+        """Load a clipper (see `load_clipper`), parsing it only on the first use"""
+        return self.get(clipper).select(footprint)
+
+    def projected(self, clipper, src_epsg, dst_epsg, footprint=None):
+        """
+        Load a clipper in `src_epsg` (see `load`) and reproject it to `dst_epsg`.  Unless only part of a collection is
+        selected by `footprint`, the reprojection is computed only on the first use.
+        """
+        entry = self.get(clipper)
+        return self.reproject(entry, entry.select(footprint), src_epsg, dst_epsg)
+
+    def reproject(self, entry: Clipper, geom, src_epsg, dst_epsg):
+        """Reproject `geom`, selected from `entry`, to `dst_epsg`, caching the reprojection of the full clipper"""
+        epsgs = (int(src_epsg), int(dst_epsg))
+        # Compared with the union only if it was already computed; partial selections never compute it
+        cacheable = geom is entry._geom
+        if cacheable:
+            projected = entry.projected.get(epsgs)
+            with self._lock:
+                if projected is not None:
+                    self.projected_hits += 1
+                    return projected
+                self.projected_misses += 1
+        proj_transformer = transformer(*epsgs)
+
+        def project(coords):
+            return np.column_stack(proj_transformer.transform(coords[:, 0], coords[:, 1]))
+
+        projected = shapely.transform(geom, project)
+        if cacheable:
+            entry.projected[epsgs] = projected
+        return projected
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.projected_hits = self.projected_misses = 0
+
+
+clipper_cache = ClipperCache()
+
+
+def optimize_cutlines(geoms,
+                      xsize: int,
+                      ysize: int,
+                      margin: float = 1.0,
+                      tolerance: float = 0.25,
+                      precision: int = 2) -> tuple:
+    """
+    Shrink cutlines (geometries in pixel coordinates of a `xsize` x `ysize` raster) before they are embedded as wkt:
+    clip to the raster plus `margin` pixels, simplify with a `tolerance` (in pixels) which preserves topology, and write
+    coordinates with `precision` decimals.  Clipping and rounding can collapse thin rings or make them self-intersect,
+    so any cutline which is no longer valid afterwards is kept unoptimized.  Returns the list of wkt strings and a list
+    of CutlineStats.
+    """
+    original = np.asarray(geoms, dtype=object)
+    before = shapely.to_wkt(original, rounding_precision=-1)
+    geoms = shapely.clip_by_rect(original, -margin, -margin, xsize + margin, ysize + margin)
+    if tolerance:
+        geoms = shapely.simplify(geoms, tolerance, preserve_topology=True)
+    after = shapely.to_wkt(geoms, rounding_precision=precision, trim=True)
+    invalid = ~shapely.is_valid(shapely.from_wkt(after))
+    after = np.where(invalid, before, after)
+    geoms = np.where(invalid, original, geoms)
+    stats = [
+        CutlineStats(*args) for args in zip(
+            shapely.get_num_coordinates(original).tolist(),
+            shapely.get_num_coordinates(geoms).tolist(),
+            [len(wkt) for wkt in before.tolist()],
+            [len(wkt) for wkt in after.tolist()],
+        )
+    ]
+    return (after.tolist(), stats)
@@ -0,0 +1,128 @@
+"""
+Opt-in instrumentation of loading, translating, warping and serializing VRTs.  Instrumented code opens named spans; each
+finished span (name, duration, counters and the name of its parent span) is delivered to every subscribed callback.
+With no subscribers, `span` returns a shared no-op and nothing is timed or allocated.
+
+Spans: "init" and "loads" (bytes), "translate" (bands), "warp" (bands), "warp.crs_lookup", "warp.transformer",
+"warp.transform_extent" (points), "warp.cutline" (vertices), "warp.finish" and "to_xml" (bytes).
+"""
+from contextvars import ContextVar
+import time
+
+_subscribers = []
+_current = ContextVar("gdaljson_span", default=None)
+
+
+class _NoopSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def count(self, key: str, value=1) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span(object):
+    """A timed phase.  `duration` is in seconds, `counters` maps names to numbers, `parent` is the enclosing span's name"""
+
+    __slots__ = ("name", "counters", "parent", "start", "duration", "_token")
+
+    def __init__(self, name: str, counters: dict):
+        self.name = name
+        self.counters = counters
+        self.parent = None
+        self.start = None
+        self.duration = None
+
+    def __enter__(self):
+        parent = _current.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.duration = time.perf_counter() - self.start
+        _current.reset(self._token)
+        for callback in list(_subscribers):
+            callback(self)
+
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.duration}, {self.counters})"
+
+    def count(self, key: str, value=1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + value
+
+
+def span(name: str, **counters):
+    """Open a span (use as a context manager), or a no-op if nothing is subscribed"""
+    if not _subscribers:
+        return _NOOP
+    return Span(name, counters)
+
+
+def enabled() -> bool:
+    return bool(_subscribers)
+
+
+def subscribe(callback):
+    """Deliver every finished span to `callback(span)`.  Returns the callback, so this can be used as a decorator"""
+    _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback) -> None:
+    _subscribers.remove(callback)
+
+
+class Collector(object):
+    """
+    Metrics collector aggregating spans by name: count, total/min/max duration and summed counters.  Subscribes itself
+    while used as a context manager.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def __call__(self, span: Span) -> None:
+        stats = self.stats.get(span.name)
+        if stats is None:
+            stats = self.stats[span.name] = {
+                "count": 0,
+                "total": 0.0,
+                "min": span.duration,
+                "max": span.duration,
+                "counters": {},
+            }
+        stats["count"] += 1
+        stats["total"] += span.duration
+        stats["min"] = min(stats["min"], span.duration)
+        stats["max"] = max(stats["max"], span.duration)
+        for (key, value) in span.counters.items():
+            stats["counters"][key] = stats["counters"].get(key, 0) + value
+
+    def __enter__(self):
+        subscribe(self)
+        return self
+
+    def __exit__(self, *args):
+        unsubscribe(self)
+
+    def reset(self) -> None:
+        self.stats = {}
+
+    def report(self) -> str:
+        """Table of spans sorted by total time"""
+        lines = [f"{'span':<24}{'count':>8}{'total ms':>12}{'mean ms':>12}{'max ms':>12}  counters"]
+        for (name, stats) in sorted(self.stats.items(), key=lambda item: -item[1]["total"]):
+            counters = ", ".join(f"{k}={v}" for (k, v) in stats["counters"].items())
+            lines.append(f"{name:<24}{stats['count']:>8}{stats['total'] * 1e3:>12.3f}"
+                         f"{stats['total'] / stats['count'] * 1e3:>12.3f}{stats['max'] * 1e3:>12.3f}  {counters}")
+        return "\n".join(lines)
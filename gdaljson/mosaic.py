@@ -0,0 +1,174 @@
+"""
+Pure-python equivalent of gdalbuildvrt.  Mosaics are built from source descriptors (path, geotransform, size, bands, data
+type) without opening the sources: the union grid and every DstRect are computed with numpy, and source elements are
+generated as raw xml, either into the LazyLists of a VRTDataset or streamed straight to a file.
+"""
+from collections import namedtuple, OrderedDict
+import os
+
+import numpy as np
+
+from gdaljson.transformations import LazyList, _escape_attrib, _escape_cdata, _materialize
+from gdaljson.vrt import VRTDataset
+
+MosaicSource = namedtuple(
+    "MosaicSource", ["path", "geotransform", "xsize", "ysize", "bands", "dtype", "nodata", "blockxsize", "blockysize"])
+# Block sizes default to the size of the source (the tile is read as one block)
+MosaicSource.__new__.__defaults__ = (1, "Byte", None, None, None)
+
+SOURCE_TYPES = ("SimpleSource", "ComplexSource")
+
+
+def _descriptor(source) -> MosaicSource:
+    if isinstance(source, MosaicSource):
+        return source
+    if isinstance(source, dict):
+        return MosaicSource(**source)
+    return MosaicSource(*source)
+
+
+def _number(value) -> str:
+    """Format a DstRect value like GDAL (%.15g), which also drops floating point noise"""
+    return "%.15g" % value
+
+
+class _Layout(object):
+    """Union grid of a set of sources and the DstRect of every source in it"""
+
+    def __init__(self, sources, resolution="average"):
+        paths = []
+        numbers = []
+        self.bands = self.dtype = None
+        for source in sources:
+            source = _descriptor(source)
+            gt = source.geotransform
+            if isinstance(gt, str):
+                gt = [float(x) for x in gt.split(",")]
+            if gt[2] != 0 or gt[4] != 0:
+                raise ValueError(f"Rotated geotransforms are not supported ({source.path})")
+            if self.bands is None:
+                (self.bands, self.dtype, self.nodata) = (source.bands, source.dtype, source.nodata)
+            elif source.bands != self.bands or source.dtype != self.dtype:
+                raise ValueError(f"All sources must have {self.bands} band(s) of type {self.dtype} ({source.path})")
+            paths.append(source.path)
+            numbers.append((gt[0], gt[1], gt[3], abs(gt[5]), source.xsize, source.ysize,
+                            source.blockxsize or source.xsize, source.blockysize or source.ysize))
+        if not paths:
+            raise ValueError("No sources")
+        self.paths = paths
+        (tlx, xres, tly, yres, xsize, ysize, xblock, yblock) = np.array(numbers, dtype=float).T
+        self.sizes = np.column_stack([xsize, ysize, xblock, yblock]).astype(int)
+
+        if resolution == "highest":
+            (self.xres, self.yres) = (xres.min(), yres.min())
+        elif resolution == "lowest":
+            (self.xres, self.yres) = (xres.max(), yres.max())
+        elif resolution == "average":
+            # The mean of identical resolutions isn't always exact
+            (self.xres, self.yres) = [r[0] if (r == r[0]).all() else r.mean() for r in (xres, yres)]
+        else:
+            (self.xres, self.yres) = (float(resolution[0]), abs(float(resolution[1])))
+        (self.xres, self.yres) = (float(self.xres), float(self.yres))
+
+        brx = tlx + xsize * xres
+        bry = tly - ysize * yres
+        (self.tlx, self.tly) = (float(tlx.min()), float(tly.max()))
+        self.xsize = int(0.5 + (brx.max() - self.tlx) / self.xres)
+        self.ysize = int(0.5 + (self.tly - bry.min()) / self.yres)
+        self.dst = np.column_stack([
+            (tlx - self.tlx) / self.xres,
+            (self.tly - tly) / self.yres,
+            xsize * xres / self.xres,
+            ysize * yres / self.yres,
+        ])
+
+    @property
+    def geotransform(self) -> str:
+        return ",".join(str(x) for x in [self.tlx, self.xres, 0.0, self.tly, 0.0, -self.yres])
+
+    def sources(self, band: int, source_type: str = "SimpleSource", nodata=None):
+        """Generate the xml of every source element of a band"""
+        dtype = _escape_attrib(self.dtype)
+        extra = f"<NODATA>{nodata}</NODATA>" if source_type == "ComplexSource" and nodata is not None else ""
+        for (path, (xsize, ysize, xblock, yblock), rect) in zip(self.paths, self.sizes.tolist(), self.dst.tolist()):
+            rect = [_number(v) for v in rect]
+            relative = 0 if os.path.isabs(path) else 1
+            yield (f'<{source_type}><SourceFilename relativeToVRT="{relative}">{_escape_cdata(path)}</SourceFilename>'
+                   f'<SourceBand>{band}</SourceBand>'
+                   f'<SourceProperties RasterXSize="{xsize}" RasterYSize="{ysize}" DataType="{dtype}" '
+                   f'BlockXSize="{xblock}" BlockYSize="{yblock}" />'
+                   f'<SrcRect xOff="0" yOff="0" xSize="{xsize}" ySize="{ysize}" />'
+                   f'<DstRect xOff="{rect[0]}" yOff="{rect[1]}" xSize="{rect[2]}" ySize="{rect[3]}" />'
+                   f'{extra}</{source_type}>')
+
+
+def _options(sources, resolution, nodata, source_type):
+    if source_type not in SOURCE_TYPES:
+        raise ValueError(f"source_type must be one of {SOURCE_TYPES}")
+    layout = _Layout(sources, resolution)
+    if nodata is None:
+        nodata = layout.nodata
+    return (layout, nodata)
+
+
+def build_vrt(sources,
+              srs: str = None,
+              resolution="average",
+              nodata=None,
+              source_type: str = "SimpleSource") -> VRTDataset:
+    """
+    Build a mosaic VRTDataset from an iterable of source descriptors (MosaicSource, dicts or tuples of path,
+    geotransform, xsize, ysize, bands, dtype, nodata, blockxsize, blockysize).  `resolution` is "highest", "lowest",
+    "average" or an (xres, yres) pair, as in gdalbuildvrt.  Sources are stored as raw xml in LazyLists and only
+    converted to dicts when accessed.
+    """
+    (layout, nodata) = _options(sources, resolution, nodata, source_type)
+    dataset = OrderedDict([("@rasterXSize", layout.xsize), ("@rasterYSize", layout.ysize)])
+    if srs:
+        dataset["SRS"] = {"$": srs}
+    dataset["GeoTransform"] = {"$": layout.geotransform}
+    bands = []
+    for band in range(1, layout.bands + 1):
+        data = OrderedDict([("@dataType", layout.dtype), ("@band", band)])
+        if nodata is not None:
+            data["NoDataValue"] = {"$": nodata}
+        items = [xml.encode("utf-8") for xml in layout.sources(band, source_type, nodata)]
+        data[source_type] = _materialize(items[0]) if len(items) == 1 else LazyList(items)
+        bands.append(data)
+    dataset["VRTRasterBand"] = bands
+    return VRTDataset({"VRTDataset": dataset})
+
+
+def write_vrt(sources,
+              outfile,
+              srs: str = None,
+              resolution="average",
+              nodata=None,
+              source_type: str = "SimpleSource",
+              chunksize: int = 4096) -> None:
+    """
+    Stream a mosaic to a file path or binary file object without building the document in memory (see `build_vrt`).
+    Only the grid arrays and source paths are held; source elements are written in chunks of `chunksize`.
+    """
+    if isinstance(outfile, str):
+        with open(outfile, "wb") as f:
+            return write_vrt(sources, f, srs, resolution, nodata, source_type, chunksize)
+    (layout, nodata) = _options(sources, resolution, nodata, source_type)
+    header = f'<VRTDataset rasterXSize="{layout.xsize}" rasterYSize="{layout.ysize}">'
+    if srs:
+        header += f"<SRS>{_escape_cdata(srs)}</SRS>"
+    header += f"<GeoTransform>{layout.geotransform}</GeoTransform>"
+    outfile.write(header.encode("utf-8"))
+    for band in range(1, layout.bands + 1):
+        head = f'<VRTRasterBand dataType="{_escape_attrib(layout.dtype)}" band="{band}">'
+        if nodata is not None:
+            head += f"<NoDataValue>{nodata}</NoDataValue>"
+        outfile.write(head.encode("utf-8"))
+        chunk = []
+        for xml in layout.sources(band, source_type, nodata):
+            chunk.append(xml)
+            if len(chunk) == chunksize:
+                outfile.write("".join(chunk).encode("utf-8"))
+                chunk = []
+        outfile.write(("".join(chunk) + "</VRTRasterBand>").encode("utf-8"))
+    outfile.write(b"</VRTDataset>")
@@ -0,0 +1,291 @@
+"""
+Compact binary container for collections of parsed VRTs, meant to be memory mapped.  Every VRT's badgerfish dict is
+flattened to a tape of uint32 tokens; strings (keys and values) are deduplicated into one string table, numbers,
+geotransforms and Src/DstRects are stored in packed numpy arrays, and an offset index points at each VRT's slice of the
+tape.  Opening a pack only reads its header, and a VRT is decoded from the tape on demand, so load time and resident
+memory scale with the VRTs actually accessed.
+
+Layout: header (magic, version, count, then the (offset, length) of each section), followed by the sections, 8-byte
+aligned.
+"""
+from array import array
+from collections import OrderedDict
+import mmap
+import struct
+
+import numpy as np
+
+from gdaljson.transformations import LazyList
+from gdaljson.vrt import VRTBase, VRTDataset, VRTWarpedDataset
+
+MAGIC = b"GDJPACK\x00"
+VERSION = 1
+# (name, dtype, items per row)
+SECTIONS = [
+    ("index", np.uint64, 1),
+    ("names", np.uint32, 1),
+    ("tape", np.uint32, 1),
+    ("ints", np.int64, 1),
+    ("floats", np.float64, 1),
+    ("geotransforms", np.float64, 6),
+    ("rects", np.float64, 4),
+    ("string_offsets", np.uint64, 1),
+    ("strings", np.uint8, 1),
+]
+HEADER = struct.Struct("<8sII" + "QQ" * len(SECTIONS))
+
+# Token opcodes, in the low 4 bits of a token.  The high 28 bits hold a count, index or small integer
+(DICT, LIST, STR, INT, FLOAT, TRUE, FALSE, NULL, GT, GT_GDAL, RECT_INT, RECT_FLOAT, SMALLINT) = range(13)
+PAYLOAD_MAX = 1 << 28
+NO_NAME = 0xFFFFFFFF
+RECT_KEYS = ("@xOff", "@yOff", "@xSize", "@ySize")
+
+
+def _gt_format(text: str, values: list):
+    """Opcode of the geotransform format `text` was written in, if it can be reproduced exactly from `values`"""
+    if ",".join(str(x) for x in values) == text:
+        return GT
+    if ",".join("%24.16e" % x for x in values) == text:
+        return GT_GDAL
+    return None
+
+
+class _Writer(object):
+
+    def __init__(self):
+        self.strings = {}
+        self.tape = array("I")
+        self.ints = array("q")
+        self.floats = array("d")
+        self.geotransforms = array("d")
+        self.rects = array("d")
+
+    def token(self, op: int, payload: int) -> None:
+        if payload >= PAYLOAD_MAX:
+            raise OverflowError("Pack section too large")
+        self.tape.append(payload << 4 | op)
+
+    def string(self, value: str) -> int:
+        try:
+            return self.strings[value]
+        except KeyError:
+            index = self.strings[value] = len(self.strings)
+            return index
+
+    def rect(self, value) -> bool:
+        if not isinstance(value, dict) or tuple(value) != RECT_KEYS:
+            return False
+        values = list(value.values())
+        if all(type(x) is int for x in values):
+            op = RECT_INT
+        elif all(type(x) is float for x in values):
+            op = RECT_FLOAT
+        else:
+            return False
+        self.token(op, len(self.rects) // 4)
+        self.rects.extend(values)
+        return True
+
+    def geotransform(self, value) -> bool:
+        if not isinstance(value, dict) or list(value) != ["$"] or not isinstance(value["$"], str):
+            return False
+        try:
+            values = [float(x) for x in value["$"].split(",")]
+        except ValueError:
+            return False
+        op = _gt_format(value["$"], values) if len(values) == 6 else None
+        if op is None:
+            return False
+        self.token(op, len(self.geotransforms) // 6)
+        self.geotransforms.extend(values)
+        return True
+
+    def value(self, value, key: str = None) -> None:
+        if isinstance(value, np.generic):
+            value = value.item()
+        if key is not None:
+            if key.endswith("Rect") and self.rect(value):
+                return
+            if key.endswith("GeoTransform") and self.geotransform(value):
+                return
+        if isinstance(value, dict):
+            self.token(DICT, len(value))
+            for (k, v) in value.items():
+                self.token(STR, self.string(k))
+                self.value(v, k)
+        elif isinstance(value, (list, tuple, LazyList)):
+            self.token(LIST, len(value))
+            for item in value:
+                self.value(item, key)
+        elif isinstance(value, str):
+            self.token(STR, self.string(value))
+        elif value is True:
+            self.token(TRUE, 0)
+        elif value is False:
+            self.token(FALSE, 0)
+        elif value is None:
+            self.token(NULL, 0)
+        elif isinstance(value, int):
+            if 0 <= value < PAYLOAD_MAX:
+                self.token(SMALLINT, value)
+            else:
+                self.token(INT, len(self.ints))
+                self.ints.append(value)
+        elif isinstance(value, float):
+            self.token(FLOAT, len(self.floats))
+            self.floats.append(value)
+        else:
+            raise TypeError(f"Can't pack values of type {type(value).__name__}")
+
+
+def pack(vrts, outfile) -> int:
+    """
+    Write a collection of VRTs (VRT objects or badgerfish dicts) to a pack file, returning the number of VRTs written.
+    `vrts` is either a mapping of names to VRTs, which can then be looked up by name, or an iterable.
+    """
+    items = vrts.items() if hasattr(vrts, "items") else ((None, vrt) for vrt in vrts)
+    writer = _Writer()
+    index = array("Q", [0])
+    names = array("I")
+    for (name, vrt) in items:
+        writer.value(vrt.data if isinstance(vrt, VRTBase) else vrt)
+        index.append(len(writer.tape))
+        names.append(NO_NAME if name is None else writer.string(str(name)))
+
+    encoded = [s.encode("utf-8") for s in writer.strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(s) for s in encoded], out=string_offsets[1:])
+    sections = [index, names, writer.tape, writer.ints, writer.floats, writer.geotransforms, writer.rects,
+                string_offsets, b"".join(encoded)]
+
+    layout = []
+    offset = HEADER.size
+    for section in sections:
+        offset += -offset % 8
+        size = len(memoryview(section).cast("B"))
+        layout.extend([offset, size])
+        offset += size
+    with open(outfile, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(names), *layout))
+        for (section, section_offset) in zip(sections, layout[::2]):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(memoryview(section).cast("B"))
+    return len(names)
+
+
+class PackFile(object):
+    """
+    Memory-mapped pack of VRTs written by `pack`.  Index by position or name to decode a VRTDataset/VRTWarpedDataset,
+    or use `data` for the badgerfish dict.  Decoded strings are cached; nothing else is read until it's accessed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_RANDOM"):
+            # VRTs are decoded one at a time, read-ahead would map in neighbours which may never be used
+            self._mmap.madvise(mmap.MADV_RANDOM)
+        header = HEADER.unpack_from(self._mmap)
+        if header[0] != MAGIC or header[1] != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} gdaljson pack")
+        self._count = header[2]
+        self._sections = {}
+        for (i, (name, dtype, width)) in enumerate(SECTIONS):
+            (offset, size) = header[3 + 2 * i:5 + 2 * i]
+            section = np.frombuffer(self._mmap, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset)
+            self._sections[name] = section.reshape(-1, width) if width > 1 else section
+        self._strings = {}
+        self._names = None
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getitem__(self, key):
+        data = self.data(key)
+        if data["VRTDataset"].get("@subClass") == "VRTWarpedDataset":
+            return VRTWarpedDataset(data)
+        return VRTDataset(data)
+
+    @property
+    def names(self) -> dict:
+        """Mapping of names to positions, built on first use"""
+        if self._names is None:
+            self._names = {
+                self._string(int(i)): position
+                for (position, i) in enumerate(self._sections["names"].tolist()) if i != NO_NAME
+            }
+        return self._names
+
+    def _string(self, i: int) -> str:
+        try:
+            return self._strings[i]
+        except KeyError:
+            offsets = self._sections["string_offsets"]
+            value = self._strings[i] = self._sections["strings"][offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+            return value
+
+    def data(self, key) -> dict:
+        """Decode the badgerfish dict of the VRT at position `key`, or named `key`"""
+        position = key if isinstance(key, int) else self.names[key]
+        if not -self._count <= position < self._count:
+            raise IndexError("Pack index out of range")
+        position %= self._count
+        (start, end) = self._sections["index"][position:position + 2].tolist()
+        tokens = self._sections["tape"][start:end].tolist()
+        (value, _) = self._decode(tokens, 0)
+        return dict(value)
+
+    def _decode(self, tokens: list, i: int):
+        token = tokens[i]
+        (op, payload) = (token & 15, token >> 4)
+        i += 1
+        if op == DICT:
+            value = OrderedDict()
+            for _ in range(payload):
+                key = self._string(tokens[i] >> 4)
+                (value[key], i) = self._decode(tokens, i + 1)
+            return (value, i)
+        if op == LIST:
+            value = []
+            for _ in range(payload):
+                (item, i) = self._decode(tokens, i)
+                value.append(item)
+            return (value, i)
+        if op == STR:
+            return (self._string(payload), i)
+        if op == SMALLINT:
+            return (payload, i)
+        if op == INT:
+            return (int(self._sections["ints"][payload]), i)
+        if op == FLOAT:
+            return (float(self._sections["floats"][payload]), i)
+        if op in (RECT_INT, RECT_FLOAT):
+            cast = int if op == RECT_INT else float
+            values = [cast(x) for x in self._sections["rects"][payload].tolist()]
+            return (OrderedDict(zip(RECT_KEYS, values)), i)
+        if op in (GT, GT_GDAL):
+            values = self._sections["geotransforms"][payload].tolist()
+            text = ",".join(str(x) for x in values) if op == GT else ",".join("%24.16e" % x for x in values)
+            return (OrderedDict([("$", text)]), i)
+        return ({TRUE: True, FALSE: False, NULL: None}[op], i)
+
+    def close(self) -> None:
+        # numpy views must be released before the map can be closed
+        self._sections = {}
+        self._mmap.close()
+        self._file.close()
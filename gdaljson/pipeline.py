@@ -0,0 +1,208 @@
+"""
+Deferred translate/warp pipelines.  Operations are recorded instead of applied, fused algebraically into as few
+`translate`/`warp` calls as possible, and applied once to a copy-on-write clone when the result is needed.
+
+Materializing a pipeline gives the same VRT as the eager chain of calls.  Each step applies to the output of the
+previous step, as if gdal_translate/gdalwarp were run on it: a `srcWin` or `projWin` is a window of the previous output
+and a `bandList` selects from the previous output's bands.  Steps are only fused when one call gives the same output as
+the chain (up to floating point noise in the geotransform); all other steps are applied in turn.
+"""
+import copy
+
+TRANSLATE_RESIZE = ("height", "width", "xRes", "yRes")
+WARP_PHASES = {
+    "dstSRS": 0,
+    "densifyPts": 0,
+    "clipper": 1,
+    "cropToCutline": 1,
+    "optimizeCutline": 1,
+    "height": 2,
+    "width": 2,
+    "xRes": 2,
+    "yRes": 2,
+    "dstAlpha": 3,
+    "tune": 4,
+}
+
+
+def _unset(value) -> bool:
+    # translate/warp treat every falsy option as unset
+    return value is None or value is False or (isinstance(value, (tuple, list, str)) and not len(value))
+
+
+def _options(kwargs: dict) -> dict:
+    """Drop unset options"""
+    return {k: v for (k, v) in kwargs.items() if not _unset(v)}
+
+
+class Pipeline(object):
+    """
+    Records translate/warp operations on a VRT (see `VRTBase.deferred`).  `plan` is the fused list of (operation,
+    kwargs) steps, `materialize` applies it to a clone of the VRT, leaving the VRT itself untouched.
+    """
+
+    def __init__(self, vrt):
+        self.vrt = vrt
+        self.ops = []
+        self._result = None
+
+    def translate(self, **kwargs):
+        self.ops.append(("translate", _options(kwargs)))
+        self._result = None
+        return self
+
+    def warp(self, **kwargs):
+        self.ops.append(("warp", _options(kwargs)))
+        self._result = None
+        return self
+
+    @property
+    def plan(self) -> list:
+        steps = []
+        for (op, kwargs) in self.ops:
+            if steps and steps[-1][0] == op:
+                fused = None
+                if op == "warp":
+                    fused = self._fuse_warp(steps[-1][1], kwargs)
+                elif len(steps) == 1:
+                    # Translate fusion needs the geometry of the step's input, which is only known for the first step
+                    fused = self._fuse_translate(steps[-1][1], kwargs)
+                if fused is not None:
+                    steps[-1] = (op, fused)
+                    continue
+            kwargs = dict(kwargs)
+            if not steps and op == "translate" and "projWin" in kwargs:
+                kwargs["srcWin"] = self.vrt.projwin_to_srcwin(kwargs.pop("projWin"))
+            steps.append((op, kwargs))
+        return steps
+
+    def materialize(self):
+        """Apply the fused plan to a clone of the VRT (cached until another operation is recorded)"""
+        if self._result is None:
+            vrt = self.vrt.clone()
+            for (op, kwargs) in self.plan:
+                getattr(vrt, op)(**kwargs)
+            self._result = vrt
+        return self._result
+
+    def to_bytes(self) -> bytes:
+        return self.materialize().to_bytes()
+
+    def to_xml(self, outfile) -> None:
+        self.materialize().to_xml(outfile)
+
+    def __str__(self):
+        return str(self.materialize())
+
+    def __repr__(self):
+        steps = ", ".join(f"{op}({kwargs})" for (op, kwargs) in self.plan)
+        return f"Pipeline({len(self.ops)} operations -> [{steps}])"
+
+    def _output(self, kwargs: dict) -> tuple:
+        """Window, output size and output geotransform of a single translate step (same math as translate)"""
+        vrt = self.vrt
+        window = kwargs.get("srcWin") or [0, 0, vrt.xsize, vrt.ysize]
+        (width, height) = (window[2], window[3])
+        if "height" in kwargs and "width" in kwargs:
+            (width, height) = (kwargs["width"], kwargs["height"])
+        elif "height" in kwargs:
+            width = int(round(window[2] / (window[3] / kwargs["height"])))
+            height = kwargs["height"]
+        elif "width" in kwargs:
+            height = int(round(window[3] / (window[2] / kwargs["width"])))
+            width = kwargs["width"]
+        elif "xRes" in kwargs and "yRes" in kwargs:
+            width = int(round((vrt.xres * window[2]) / kwargs["xRes"]))
+            height = int(round((vrt.yres * window[3]) / kwargs["yRes"]))
+        gt = [
+            vrt.tlx + window[0] * vrt.xres,
+            vrt.xres * window[2] / width,
+            vrt.tly - window[1] * vrt.yres,
+            vrt.yres * window[3] / height,
+        ]
+        return (window, (width, height), gt)
+
+    def _fuse_translate(self, first: dict, second: dict):
+        """Fuse two translate steps into one, or return None if the result can't be expressed as one translate"""
+        if "snap" in first or "snap" in second:
+            # Snapped windows depend on the source's block grid
+            return None
+        resize = {k: second[k] for k in TRANSLATE_RESIZE if k in second}
+        if not ("height" in resize or "width" in resize or ("xRes" in resize and "yRes" in resize)):
+            # translate ignores a lone xRes/yRes
+            resize = {}
+        if len(resize) == 1 and any(key in first for key in TRANSLATE_RESIZE):
+            # A single dimension is scaled from the rounded size of the previous output
+            return None
+        if ("xRes" in first or "yRes" in first) and ("srcWin" in second or "projWin" in second or resize):
+            # ... and so is everything on the grid of a resolution (the output size is rounded)
+            return None
+        if "scaleParams" in first and ("srcWin" in second or "projWin" in second or resize):
+            # The ComplexSource block size follows the output size when the source type changes
+            return None
+        if "scaleParams" in second and "noData" in first:
+            # ... and its NODATA follows the nodata value
+            return None
+        if "bandList" in second and "bandList" in first and sorted(set(first["bandList"])) != first["bandList"]:
+            # Band elements keep their order when sources are reordered, so a later bandList selects by position
+            return None
+        (window, size, gt) = self._output(first)
+        fused = dict(first)
+
+        if "projWin" in second:
+            projWin = second["projWin"]
+            srcWin = [
+                int((projWin[0] - gt[0]) / gt[1]),
+                int((gt[2] - projWin[1]) / gt[3]),
+                int(round((projWin[2] - projWin[0]) / gt[1])),
+                int(round((projWin[1] - projWin[3]) / gt[3])),
+            ]
+        else:
+            srcWin = second.get("srcWin")
+
+        if srcWin:
+            # Nested windows: scale the window of the previous output back to source pixels
+            (fx, fy) = (window[2] / size[0], window[3] / size[1])
+            nested = [window[0] + srcWin[0] * fx, window[1] + srcWin[1] * fy, srcWin[2] * fx, srcWin[3] * fy]
+            if not all(float(v).is_integer() for v in nested):
+                return None
+            fused["srcWin"] = [int(v) for v in nested]
+            for key in TRANSLATE_RESIZE:
+                fused.pop(key, None)
+            if (fx, fy) != (1, 1):
+                (fused["width"], fused["height"]) = (srcWin[2], srcWin[3])
+
+        if resize:
+            for key in TRANSLATE_RESIZE:
+                fused.pop(key, None)
+            fused.update(resize)
+
+        if "bandList" in second:
+            if "bandList" in first:
+                fused["bandList"] = [first["bandList"][b - 1] for b in second["bandList"]]
+            else:
+                fused["bandList"] = list(second["bandList"])
+
+        for key in ("noData", "resampleAlg", "scaleParams"):
+            if key in second:
+                fused[key] = second[key]
+        return fused
+
+    @staticmethod
+    def _fuse_warp(first: dict, second: dict):
+        """
+        Fuse two warp steps into one if the second only adds an alpha band or tuning, which warp applies after the
+        reprojection, cutline and resize of the first.  Anything else depends on the grid the first step outputs: a
+        clipper is read in its SRS, a resize is rounded from its size and the block size was clamped to it.
+        """
+        first_phases = [WARP_PHASES[k] for k in first if k in WARP_PHASES]
+        second_phases = [WARP_PHASES[k] for k in second if k in WARP_PHASES]
+        if not second_phases or min(second_phases) < WARP_PHASES["dstAlpha"]:
+            return None
+        if first_phases and min(second_phases) <= max(first_phases):
+            return None
+        fused = copy.copy(first)
+        # warp() always resets the resampling algorithm
+        fused.pop("resample", None)
+        fused.update(second)
+        return fused
@@ -1,8 +1,237 @@
+import asyncio
+import os
+import sqlite3
+import threading
+
+import numpy as np
 import requests
+from pyproj import CRS, Transformer
+from pyproj.enums import WktVersion
+from pyproj.exceptions import CRSError
+
+from gdaljson.cache import LRUCache
+
+
+class CRSRegistry(object):
+    """
+    Resolves EPSG codes to WKT through a layered cache: an in-process LRU, an optional persistent SQLite store
+    (which may be pre-seeded with `seed`), pyproj's bundled database and, only as a last resort, epsg.io.  Every
+    layer keeps hit counters so callers can verify where definitions came from.
+    """
+
+    def __init__(self,
+                 path: str = None,
+                 maxsize: int = 256,
+                 network: bool = True,
+                 timeout: float = 5.0):
+        self.path = path
+        self.network = network
+        self.timeout = timeout
+        self.memory = LRUCache(maxsize)
+        self.counters = {"disk": 0, "local": 0, "network": 0, "errors": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self.path and self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS crs (epsg INTEGER PRIMARY KEY, wkt TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @property
+    def stats(self):
+        return {
+            "memory_hits": self.memory.hits,
+            "memory_misses": self.memory.misses,
+            "disk_hits": self.counters["disk"],
+            "local_hits": self.counters["local"],
+            "network_hits": self.counters["network"],
+            "errors": self.counters["errors"],
+            "coalesced": self.counters["coalesced"],
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def _disk_get(self, epsg):
+        if not self.path:
+            return None
+        with self._lock:
+            row = self.conn.execute("SELECT wkt FROM crs WHERE epsg = ?",
+                                    (epsg, )).fetchone()
+        return row[0] if row else None
+
+    def _disk_set(self, items):
+        if not self.path:
+            return
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO crs (epsg, wkt) VALUES (?, ?)", items)
+            self.conn.commit()
+
+    @staticmethod
+    def _local(epsg):
+        """Resolve from pyproj's bundled PROJ database"""
+        try:
+            return CRS.from_epsg(epsg).to_wkt(WktVersion.WKT1_GDAL)
+        except CRSError:
+            return None
+
+    def _remote(self, epsg):
+        url = f"http://epsg.io/?q={epsg}&format=json"
+        resp = requests.get(url, timeout=self.timeout)
+        data = resp.json()
+        return data["results"][0]["wkt"]
+
+    def resolve(self, epsg) -> str:
+        """Return the WKT definition of an EPSG code"""
+        epsg = int(epsg)
+        wkt_string = self.memory.get(epsg)
+        if wkt_string is not None:
+            return wkt_string
+
+        wkt_string = self._disk_get(epsg)
+        if wkt_string is not None:
+            self._count("disk")
+            self.memory.set(epsg, wkt_string)
+            return wkt_string
+
+        wkt_string = self._local(epsg)
+        if wkt_string is not None:
+            self._count("local")
+        elif self.network:
+            try:
+                wkt_string = self._remote(epsg)
+            except (requests.RequestException, ValueError, LookupError):
+                wkt_string = None
+            if wkt_string is not None:
+                self._count("network")
+
+        if wkt_string is None:
+            self._count("errors")
+            raise ValueError(f"Unable to resolve EPSG:{epsg}")
+
+        self._disk_set([(epsg, wkt_string)])
+        self.memory.set(epsg, wkt_string)
+        return wkt_string
+
+    async def aresolve(self, epsg, executor=None) -> str:
+        """
+        Return the WKT definition of an EPSG code without blocking the event loop.  Cache misses are resolved in
+        `executor` and concurrent lookups of the same code share one resolution.
+        """
+        epsg = int(epsg)
+        # Misses are counted by resolve()
+        wkt_string = self.memory.get(epsg) if epsg in self.memory else None
+        if wkt_string is not None:
+            return wkt_string
+
+        loop = asyncio.get_running_loop()
+        key = (loop, epsg)
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count("coalesced")
+        else:
+            future = self._inflight[key] = loop.run_in_executor(executor, self.resolve, epsg)
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def seed(self, definitions) -> None:
+        """Pre-populate the registry from an iterable of EPSG codes or a mapping of EPSG code to WKT"""
+        if isinstance(definitions, dict):
+            items = [(int(k), v) for (k, v) in definitions.items()]
+        else:
+            items = [(int(epsg), self._local(epsg)) for epsg in definitions]
+            missing = [epsg for (epsg, v) in items if v is None]
+            if missing:
+                raise ValueError(f"Unable to resolve EPSG codes {missing}")
+        self._disk_set(items)
+        for (epsg, wkt_string) in items:
+            self.memory.set(epsg, wkt_string)
+
+    def clear(self) -> None:
+        """Clear the in-process cache and reset counters (the persistent store is left untouched)"""
+        self.memory.clear()
+        with self._lock:
+            self.counters = {k: 0 for k in self.counters}
+
+
+registry = CRSRegistry(
+    path=os.environ.get("GDALJSON_CRS_DB"),
+    network=os.environ.get("GDALJSON_CRS_NETWORK", "1") != "0",
+)
 
 
 def wkt(epsg):
-    url = f"http://epsg.io/?q={epsg}&format=json"
-    resp = requests.get(url)
-    data = resp.json()
-    return data["results"][0]["wkt"]
+    return registry.resolve(epsg)
+
+
+async def awkt(epsg, executor=None):
+    return await registry.aresolve(epsg, executor=executor)
+
+
+transformers = LRUCache(maxsize=64)
+
+
+def transformer(src_epsg, dst_epsg) -> Transformer:
+    """
+    Return a pooled transformer between two EPSG codes with x/y (lon/lat) axis order.  Pyproj transformers are not
+    safe to share between threads, so each thread gets its own instance for a given (source, target) pair.
+    """
+    key = (int(src_epsg), int(dst_epsg), threading.get_ident())
+    proj_transformer = transformers.get(key)
+    if proj_transformer is None:
+        proj_transformer = Transformer.from_crs(
+            CRS.from_epsg(key[0]), CRS.from_epsg(key[1]), always_xy=True)
+        transformers.set(key, proj_transformer)
+    return proj_transformer
+
+
+def densify_extent(extent: list, densify: int = 21) -> tuple:
+    """
+    Sample `densify` points along each edge of an [xmin, xmax, ymin, ymax] extent.  Returns x and y arrays ordered as
+    top, bottom, left and right edges so the first point is the top-left corner and the last bottom-edge point is the
+    bottom-right corner.
+    """
+    if densify < 2:
+        raise ValueError(f"densify must be at least 2 (the corners), got {densify}")
+    steps = np.arange(densify, dtype=float) / (densify - 1)
+    xs = np.empty(4 * densify)
+    ys = np.empty(4 * densify)
+    xs[:densify] = xs[densify:2 * densify] = extent[0] + (extent[1] - extent[0]) * steps
+    ys[2 * densify:3 * densify] = ys[3 * densify:] = extent[2] + (extent[3] - extent[2]) * steps
+    xs[densify - 1] = xs[2 * densify - 1] = extent[1]
+    ys[3 * densify - 1] = ys[-1] = extent[3]
+    ys[:densify] = extent[3]
+    ys[densify:2 * densify] = extent[2]
+    xs[2 * densify:3 * densify] = extent[0]
+    xs[3 * densify:] = extent[1]
+    return xs, ys
+
+
+def transform_extent(proj_transformer: Transformer,
+                     extent: list,
+                     densify: int = 21) -> tuple:
+    """
+    Reproject an [xmin, xmax, ymin, ymax] extent in one batched call, following the edges rather than only the
+    corners (see GDALSuggestedWarpOutput2).  Returns the projected top-left and bottom-right corners along with the
+    projected bounds as [xmin, xmax, ymin, ymax].  `densify` must be at least 2.
+    """
+    xs, ys = densify_extent(extent, densify)
+    px, py = proj_transformer.transform(xs, ys)
+    valid = np.isfinite(px) & np.isfinite(py)
+    bounds = [
+        float(px[valid].min()),
+        float(px[valid].max()),
+        float(py[valid].min()),
+        float(py[valid].max())
+    ]
+    tl = (float(px[0]), float(py[0]))
+    br = (float(px[2 * densify - 1]), float(py[2 * densify - 1]))
+    return tl, br, bounds
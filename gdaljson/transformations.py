@@ -1,16 +1,333 @@
+from collections import OrderedDict
+from collections.abc import MutableSequence
+import json
 from xmljsonfork import badgerfish as bf
 import xml.etree.ElementTree as ET
 import xml.dom.minidom as md
+from xml.parsers import expat
+
+import numpy as np
+
+from gdaljson.instrument import enabled, span
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Repeated elements which may be deferred by the lazy loader
+SOURCE_TAGS = {
+    "SimpleSource",
+    "ComplexSource",
+    "AveragedSource",
+    "KernelFilteredSource",
+}
+LAZY_TAGS = SOURCE_TAGS | {"VRTRasterBand"}
+
+
+class _Deferred(object):
+    """An element whose own (non-deferred) children are parsed but whose repeated band/source children are not"""
+
+    __slots__ = ("elem", "children", "order", "offset")
+
+    def __init__(self, elem):
+        self.elem = elem
+        self.offset = None
+        self.children = OrderedDict()
+        self.order = []
+
+    def data(self):
+        """Convert to a badgerfish dict, keeping deferred children in LazyLists"""
+        value = bf.data(self.elem)[self.elem.tag]
+        if not self.children:
+            return value
+        result = OrderedDict(
+            (k, v) for (k, v) in value.items() if k.startswith("@") or k == "$")
+        for tag in self.order:
+            if tag in self.children:
+                items = self.children[tag]
+                result[tag] = _materialize(items[0]) if len(items) == 1 else LazyList(items)
+            elif tag in value:
+                result[tag] = value[tag]
+        return result
+
+
+def _materialize(item):
+    """Convert a deferred item (raw xml bytes or _Deferred) to its badgerfish value"""
+    if isinstance(item, bytes):
+        elem = ET.fromstring(item)
+        return bf.data(elem)[elem.tag]
+    if isinstance(item, _Deferred):
+        return item.data()
+    return item
+
+
+class LazyList(MutableSequence):
+    """
+    List of repeated elements (bands or sources) produced by `loads(s, lazy=True)`.  Items are stored as raw xml and only
+    converted to badgerfish dicts when first accessed.  Items which are never accessed are written back verbatim by
+    `dumps`.
+    """
+
+    def __init__(self, items=()):
+        self._items = list(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if isinstance(item, (bytes, _Deferred)):
+            item = self._items[index] = _materialize(item)
+        return item
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"LazyList({len(self)} items, {self.materialized} materialized)"
+
+    def __copy__(self):
+        return LazyList(self._items)
+
+    @property
+    def materialized(self):
+        return sum(1 for item in self._items if not isinstance(item, (bytes, _Deferred)))
+
+
+def jsonable(obj):
+    """`default` hook for json.dumps which materializes LazyLists"""
+    if isinstance(obj, LazyList):
+        return list(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _tostring(value):
+    if value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif value is None:
+        return ""
+    return str(value)
+
+
+def _escape_cdata(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attrib(text):
+    text = _escape_cdata(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+def _write(out, tag, value):
+    """Append the xml of badgerfish value(s) as <tag> elements to the list of string chunks `out`"""
+    if isinstance(value, LazyList):
+        values = value._items
+    elif isinstance(value, list):
+        values = value
+    else:
+        values = (value, )
+    for v in values:
+        if isinstance(v, bytes):
+            out.append(v.decode("utf-8"))
+            continue
+        if isinstance(v, _Deferred):
+            v = v.data()
+        if not isinstance(v, (dict, list)):
+            v = {"$": v}
+        text = None
+        children = []
+        out.append("<" + tag)
+        for (k, x) in v.items():
+            if k[0] == "@":
+                # Numbers never need escaping
+                if type(x) is int or type(x) is float:
+                    out.append(f' {k.lstrip("@")}="{x}"')
+                elif isinstance(x, dict):
+                    raise ValueError("XML namespaces not yet supported")
+                else:
+                    out.append(f' {k.lstrip("@")}="{_escape_attrib(_tostring(x))}"')
+            elif k == "$":
+                text = x if type(x) is int or type(x) is float else _escape_cdata(_tostring(x))
+            else:
+                children.append((k, x))
+        if text != "" and text is not None or children:
+            out.append(">")
+            if text is not None:
+                out.append(str(text))
+            for (k, x) in children:
+                _write(out, k, x)
+            out.append(f"</{tag}>")
+        else:
+            out.append(" />")
+
+
+def to_bytes(d) -> bytes:
+    """Serialize dict (json) straight to xml bytes, without building an intermediate ElementTree"""
+    out = []
+    (tag, value) = next(iter(d.items()))
+    _write(out, tag, value)
+    return "".join(out).encode("us-ascii", "xmlcharrefreplace")
+
+
+def write(d, outfile) -> int:
+    """Serialize dict (json) to a file path or binary file object, returning the number of bytes written"""
+    data = to_bytes(d)
+    if isinstance(outfile, str):
+        with open(outfile, "wb") as f:
+            f.write(data)
+    else:
+        outfile.write(data)
+    return len(data)
 
 
 def dumps(d, pretty=False):
     """Dump from dict (json) to xml"""
-    vrtxml = ET.tostring(bf.etree(d)[0])
+    vrtxml = to_bytes(d)
     if pretty:
         return md.parseString(vrtxml)
     return vrtxml
 
 
-def loads(s):
-    """Load dict(json) from xml string"""
-    return dict(bf.data(ET.fromstring(s)))
+class _LazyLoader(object):
+    """
+    Single-pass expat loader behind `iterloads`.  Source elements are never built; their raw bytes are sliced straight
+    from the document using the parser's byte offsets.  Bands are built without their sources and, if they have no
+    deferred children, are also kept as raw bytes.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.builder = ET.TreeBuilder()
+        self.stack = []
+        self.skip = 0
+        self.offset = None
+        self.root = None
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        self.parser.CharacterDataHandler = self.text
+
+    def parse(self):
+        try:
+            self.parser.Parse(self.data, True)
+        except expat.ExpatError as e:
+            raise ET.ParseError(str(e)) from e
+        return {self.root.elem.tag: self.root.data()}
+
+    def raw(self, offset, tag):
+        """Slice the element `tag` starting at `offset` and ending at the current end tag"""
+        index = self.parser.CurrentByteIndex
+        # The end event of an element is reported at its end tag, or for an empty element <tag/>, at whatever follows
+        # it, which may be the parent's end tag (never a `tag` element, bands and sources don't nest in themselves)
+        end = b"</" + tag.encode("utf-8")
+        if self.data.startswith(end, index) and self.data[index + len(end):index + len(end) + 1] in b"> \t\r\n":
+            index = self.data.index(b">", index) + 1
+        return self.data[offset:index]
+
+    def start(self, tag, attrib):
+        if self.skip:
+            self.skip += 1
+            return
+        if self.stack and tag not in self.stack[-1].order:
+            self.stack[-1].order.append(tag)
+        if tag in SOURCE_TAGS:
+            self.skip = 1
+            self.offset = self.parser.CurrentByteIndex
+            return
+        deferred = _Deferred(self.builder.start(tag, attrib))
+        deferred.offset = self.parser.CurrentByteIndex
+        self.stack.append(deferred)
+
+    def end(self, tag):
+        if self.skip:
+            self.skip -= 1
+            if not self.skip:
+                self.stack[-1].children.setdefault(tag, []).append(
+                    self.raw(self.offset, tag))
+            return
+        elem = self.builder.end(tag)
+        deferred = self.stack.pop()
+        if not self.stack:
+            self.root = deferred
+        elif tag in LAZY_TAGS:
+            parent = self.stack[-1]
+            parent.elem.remove(elem)
+            if not deferred.children:
+                deferred = self.raw(deferred.offset, tag)
+            parent.children.setdefault(tag, []).append(deferred)
+
+    def text(self, data):
+        if not self.skip:
+            self.builder.data(data)
+
+
+def iterloads(s):
+    """
+    Incrementally load dict(json) from an xml string, bytes or file object.  Repeated band and source elements are kept
+    as raw xml in LazyLists and only converted when accessed.
+    """
+    if hasattr(s, "read"):
+        s = s.read()
+    if isinstance(s, str):
+        s = s.encode("utf-8")
+    return _LazyLoader(s).parse()
+
+
+def to_json(d) -> bytes:
+    """Dump dict(json) to json bytes, with orjson if it is installed"""
+    if orjson is not None:
+        return orjson.dumps(d, default=jsonable, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(d, default=jsonable, separators=(",", ":")).encode("utf-8")
+
+
+def from_json(s) -> dict:
+    """Load dict(json) from json string, bytes or file object, with orjson if it is installed"""
+    if hasattr(s, "read"):
+        s = s.read()
+    if orjson is not None:
+        return orjson.loads(s)
+    return dict(json.loads(s, object_pairs_hook=OrderedDict))
+
+
+def loads(s, lazy=False):
+    """Load dict(json) from xml string (or bytes, or with `lazy`, a file object)"""
+    if hasattr(s, "read"):
+        s = s.read()
+    with span("loads") as loads_span:
+        if enabled():
+            # Strings are measured as the utf-8 bytes they would be read from
+            loads_span.count("bytes", len(s.encode("utf-8")) if isinstance(s, str) else len(s))
+        if lazy:
+            return iterloads(s)
+        return dict(bf.data(ET.fromstring(s)))
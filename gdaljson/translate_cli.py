@@ -1,39 +1,34 @@
 import click
 from gdaljson import VRTDataset
+from gdaljson.batch import collect_inputs, report, run_batch, translate_file
 
 
-@click.command()
-@click.argument("infile", type=click.File("r"))
-@click.argument("outfile", type=click.File("wb"))
-@click.option("--bandlist", "-b", type=int, multiple=True)
-@click.option("--srcwin", type=click.Tuple([int, int, int, int]))
-@click.option("--projwin", type=click.Tuple([float, float, float, float]))
-@click.option("--height", type=int)
-@click.option("--width", type=int)
-@click.option("--xres", type=float)
-@click.option("--yres", type=float)
-@click.option("--nodata", type=float)
-@click.option("--resample", type=str)
-@click.option("--scale", type=click.Tuple([int, int, int, int]))
-def cli(
-        infile,
-        outfile,
-        bandlist,
-        srcwin,
-        projwin,
-        height,
-        width,
-        xres,
-        yres,
-        nodata,
-        resample,
-        scale,
-):
-    vrt = VRTDataset(infile.read())
-    vrt.translate(
+def translate_options(func):
+    """Options shared by the single-file and batch commands"""
+    options = [
+        click.option("--bandlist", "-b", type=int, multiple=True),
+        click.option("--srcwin", type=click.Tuple([int, int, int, int])),
+        click.option("--projwin", type=click.Tuple([float, float, float, float])),
+        click.option("--snap", type=click.Choice(["expand", "align"]), help="Snap the window to source blocks"),
+        click.option("--height", type=int),
+        click.option("--width", type=int),
+        click.option("--xres", type=float),
+        click.option("--yres", type=float),
+        click.option("--nodata", type=float),
+        click.option("--resample", type=str),
+        click.option("--scale", type=click.Tuple([int, int, int, int])),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def translate_kwargs(bandlist, srcwin, projwin, snap, height, width, xres, yres, nodata, resample, scale):
+    return dict(
         bandList=bandlist,
         srcWin=srcwin,
         projWin=projwin,
+        snap=snap,
         height=height,
         width=width,
         xRes=xres,
@@ -42,4 +37,25 @@ def cli(
         resampleAlg=resample,
         scaleParams=scale,
     )
-    vrt.to_xml(outfile)
\ No newline at end of file
+
+
+@click.command()
+@click.argument("infile", type=click.File("r"))
+@click.argument("outfile", type=click.File("wb"))
+@translate_options
+def cli(infile, outfile, **kwargs):
+    """Translate INFILE (.vrt) to OUTFILE (.vrt)"""
+    vrt = VRTDataset(infile.read())
+    vrt.translate(**translate_kwargs(**kwargs))
+    vrt.to_xml(outfile)
+
+
+@click.command()
+@click.argument("source")
+@click.argument("outdir", type=click.Path(file_okay=False))
+@click.option("--workers", "-w", type=int, help="Number of worker processes")
+@translate_options
+def batch_cli(source, outdir, workers, **kwargs):
+    """Translate every VRT in SOURCE (directory, glob or manifest file) into OUTDIR"""
+    result = run_batch(translate_file, collect_inputs(source), outdir, workers=workers, **translate_kwargs(**kwargs))
+    report(result)
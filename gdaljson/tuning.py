@@ -0,0 +1,113 @@
+"""
+Tuning of the block size, WarpMemoryLimit and warp options of a VRTWarpedDataset.  GDAL warps a VRTWarpedDataset one
+block at a time, each block being one warp chunk: its source window, padded by the resampling kernel, is read, and the
+destination block is computed from it.  `tune_warp` picks the parameters with these rules:
+
+- Blocks are 512x512, clamped to the raster.  While the memory of one chunk exceeds the budget, the longer side is
+  halved, down to 64 pixels.
+- The memory of one chunk is the destination block plus the source window (the block scaled by the ratio of source to
+  destination resolution, padded by the kernel radius and SOURCE_EXTRA on each side), at the working data type's size
+  for every band, plus 4 bytes per source pixel for GDAL's density mask.
+- WarpMemoryLimit is the budget, so GDAL never splits a chunk.
+- SOURCE_EXTRA is the kernel radius plus one pixel (for the error of the approximate transformer) for kernels with a
+  radius, so chunks have no seams.  Nearest neighbour needs none.
+- NUM_THREADS is one thread per 64 rows of the block, up to `threads`, for kernels with a radius or blocks of at least
+  512x512 pixels.  Without `threads` it is ALL_CPUS, so the VRT uses the CPUs of whichever host runs it and doesn't
+  depend on the host which built it.  Smaller nearest neighbour chunks are single threaded, as starting the threads
+  costs more than they save.
+"""
+from collections import namedtuple
+import math
+
+# Resampling kernel radius in source pixels, at a 1:1 scale
+KERNEL_RADIUS = {
+    "NearestNeighbour": 0,
+    "NearestNeighbor": 0,
+    "Bilinear": 1,
+    "Cubic": 2,
+    "CubicSpline": 2,
+    "Lanczos": 3,
+}
+# Area kernels cover the source pixels of a destination pixel, their radius grows with the scale
+AREA_KERNELS = ("Average", "RMS", "Mode", "Max", "Min", "Med", "Q1", "Q3", "Sum")
+DTYPE_SIZE = {
+    "Byte": 1,
+    "Int8": 1,
+    "UInt16": 2,
+    "Int16": 2,
+    "UInt32": 4,
+    "Int32": 4,
+    "Float32": 4,
+    "UInt64": 8,
+    "Int64": 8,
+    "Float64": 8,
+    "CInt16": 4,
+    "CInt32": 8,
+    "CFloat32": 8,
+    "CFloat64": 16,
+}
+DEFAULT_BLOCK = 512
+MIN_BLOCK = 64
+ROWS_PER_THREAD = 64
+DEFAULT_MEMORY = 64 * 1024 * 1024
+
+
+class WarpTuning(namedtuple("WarpTuning", ["blocksize", "warp_memory_limit", "options", "chunk_bytes"])):
+    """
+    Parameters chosen by `tune_warp`: [BlockXSize, BlockYSize], WarpMemoryLimit (bytes), warp options by name, and the
+    estimated memory of one chunk
+    """
+    __slots__ = ()
+
+
+def kernel_radius(resample: str, scale: float = 1.0) -> int:
+    """Radius of the resampling kernel in source pixels"""
+    if resample in AREA_KERNELS:
+        return int(math.ceil(scale / 2))
+    try:
+        return int(math.ceil(KERNEL_RADIUS[resample] * max(scale, 1.0)))
+    except KeyError:
+        raise ValueError(f"Unknown resampling algorithm {resample}")
+
+
+def chunk_bytes(blocksize: list, bands: int, bitdepth: str, radius: int = 0, extra: int = 0, scale: float = 1.0) -> int:
+    """Estimated memory of warping one block"""
+    pixel = DTYPE_SIZE[bitdepth] * bands
+    (xblock, yblock) = blocksize
+    pad = 2 * (radius + extra)
+    source = int(math.ceil(xblock * scale + pad) * math.ceil(yblock * scale + pad))
+    return xblock * yblock * pixel + source * (pixel + 4)
+
+
+def tune_warp(xsize: int,
+              ysize: int,
+              bands: int,
+              bitdepth: str,
+              resample: str = "NearestNeighbour",
+              memory: int = DEFAULT_MEMORY,
+              threads: int = None,
+              scale: float = 1.0) -> WarpTuning:
+    """
+    Choose the block size, WarpMemoryLimit and NUM_THREADS/SOURCE_EXTRA options for warping to a `xsize` x `ysize`
+    raster of `bands` bands of type `bitdepth`, within `memory` bytes per chunk.  `scale` is the ratio of destination to
+    source resolution (2 when downsampling by half).
+    """
+    radius = kernel_radius(resample, scale)
+    extra = radius + 1 if radius else 0
+    blocksize = [min(DEFAULT_BLOCK, xsize), min(DEFAULT_BLOCK, ysize)]
+    size = chunk_bytes(blocksize, bands, bitdepth, radius, extra, scale)
+    while size > memory and max(blocksize) > MIN_BLOCK:
+        longer = 0 if blocksize[0] >= blocksize[1] else 1
+        blocksize[longer] = max(MIN_BLOCK, blocksize[longer] // 2)
+        size = chunk_bytes(blocksize, bands, bitdepth, radius, extra, scale)
+
+    num_threads = "1"
+    if radius or blocksize[0] * blocksize[1] >= DEFAULT_BLOCK * DEFAULT_BLOCK:
+        if threads:
+            num_threads = str(max(1, min(threads, blocksize[1] // ROWS_PER_THREAD)))
+        else:
+            num_threads = "ALL_CPUS"
+    options = {"NUM_THREADS": num_threads}
+    if extra:
+        options["SOURCE_EXTRA"] = str(extra)
+    return WarpTuning(blocksize, int(memory), options, size)
@@ -1,18 +1,20 @@
+import asyncio
 import json
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Generator, Union
-from xmljsonfork import badgerfish as bf
-import xml.etree.ElementTree as ET
 import copy
-import math
 import functools
-import geojson
-from pyproj import Proj, transform
-from shapely.ops import transform as transform_geom
-from shapely.geometry import shape
+import math
+import numpy as np
+import shapely
 
-from gdaljson.projection import wkt
-from gdaljson.transformations import loads, dumps
+from gdaljson.clipper import clipper_cache, load_clippers, optimize_cutlines
+from gdaljson.instrument import span
+from gdaljson.pipeline import Pipeline
+from gdaljson.projection import awkt, transform_extent, transformer, wkt
+from gdaljson.transformations import from_json, jsonable, loads, to_bytes, to_json, write
+from gdaljson.tuning import DEFAULT_MEMORY, WarpTuning, tune_warp
 
 maxval = {
     "Byte": 2**8,
@@ -37,6 +39,19 @@ class GeoTransform(object):
         inverse = [-(gt[0] / gt[1]), 1 / gt[1], 0, gt[3] / gt[1], 0, 1 / gt[5]]
         return inverse
 
+    @staticmethod
+    def invert(gt):
+        """Method to calculate the full inverse of a (possibly rotated) geotransform"""
+        inv_det = 1 / (gt[1] * gt[5] - gt[2] * gt[4])
+        return [
+            (gt[2] * gt[3] - gt[0] * gt[5]) * inv_det,
+            gt[5] * inv_det,
+            -gt[2] * inv_det,
+            (gt[0] * gt[4] - gt[1] * gt[3]) * inv_det,
+            -gt[4] * inv_det,
+            gt[1] * inv_det,
+        ]
+
     @staticmethod
     def from_element(gt_element):
         """Load GT from VRT element"""
@@ -83,6 +98,27 @@ class GeoTransform(object):
         self.tly = gt[3]
         self.yres = gt[5]
 
+    @property
+    def is_rotated(self):
+        return self.gt[2] != 0 or self.gt[4] != 0
+
+    def world_to_pixel(self, x, y) -> tuple:
+        """Convert world coordinates (scalars or arrays) to pixel/line coordinates"""
+        if self.is_rotated:
+            inv = self.invert(self.gt)
+            return (inv[0] + inv[1] * x + inv[2] * y,
+                    inv[3] + inv[4] * x + inv[5] * y)
+        return ((x - self.tlx) / self.xres, (self.tly - y) / self.yres)
+
+    def geometry_to_pixel(self, geom):
+        """Convert every vertex of a shapely geometry to pixel/line coordinates in one vectorized pass"""
+
+        def affine(coords):
+            return np.column_stack(
+                self.world_to_pixel(coords[:, 0], coords[:, 1]))
+
+        return shapely.transform(geom, affine)
+
     def to_element(self, inverse=False):
         """Dump the GT or inverse GT to VRT element"""
         if inverse:
@@ -94,16 +130,60 @@ class GeoTransform(object):
 class VRTBase(object):
     """Base clase for VRT parsing.  Contains methods compatible with both VRTDatasets and VRTWarpedDatasets"""
 
-    def __init__(self, vrt):
-        if type(vrt) is dict:
-            self.data = vrt
-        else:
-            self.data = loads(vrt)
+    def __init__(self, vrt, lazy: bool = False):
+        with span("init"):
+            if type(vrt) is dict:
+                self.data = vrt
+            else:
+                self.data = loads(vrt, lazy=lazy)
 
-        self.__gt = GeoTransform(self.data["VRTDataset"]["GeoTransform"]["$"])
+            self.__gt = GeoTransform(self.data["VRTDataset"]["GeoTransform"]["$"])
+        # Containers this VRT may mutate in place, by id.  None (everything is owned) until the VRT is first cloned
+        self._owned = None
 
     def __str__(self):
-        return dumps(self.data).decode('utf-8')
+        return to_bytes(self.data).decode('utf-8')
+
+    def _writable(self, *path):
+        """
+        Return the container at `path` in self.data, ready to be mutated in place.  Containers along the path which are
+        still shared with a clone are shallow-copied first (copy-on-write).
+        """
+        node = self.data
+        if self._owned is None:
+            for key in path:
+                node = node[key]
+            return node
+        if id(node) not in self._owned:
+            node = self.data = self._own(node)
+        for key in path:
+            child = node[key]
+            if id(child) not in self._owned:
+                child = node[key] = self._own(child)
+            node = child
+        return node
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # An unpickled VRT shares nothing, and ids recorded by the pickled VRT are meaningless here
+        self._owned = None
+
+    def _own(self, container):
+        owned = copy.copy(container)
+        self._owned[id(owned)] = owned
+        return owned
+
+    def clone(self):
+        """
+        Cheap copy which shares all unchanged subtrees of `data` with this VRT.  Containers are copied the first time
+        either VRT mutates them, so memory and time scale with the size of the change rather than the document.
+        """
+        other = copy.copy(self)
+        self._owned = {}
+        other._owned = {}
+        other._VRTBase__gt = copy.copy(self.gt)
+        other._VRTBase__gt.gt = list(self.gt.gt)
+        return other
 
     @property
     def geogname(self):
@@ -119,7 +199,7 @@ class VRTBase(object):
 
     @srs.setter
     def srs(self, wkt_string: str) -> None:
-        self.data["VRTDataset"]["SRS"]["$"] = wkt_string
+        self._writable("VRTDataset", "SRS")["$"] = wkt_string
 
     @property
     def epsg(self):
@@ -139,7 +219,7 @@ class VRTBase(object):
         return self.__gt
 
     def update_gt(self):
-        self.data["VRTDataset"]["GeoTransform"]["$"] = self.gt.to_element()
+        self._writable("VRTDataset", "GeoTransform")["$"] = self.gt.to_element()
 
     @property
     def tlx(self):
@@ -179,7 +259,7 @@ class VRTBase(object):
 
     @xsize.setter
     def xsize(self, value: Union[int, float]) -> None:
-        self.data["VRTDataset"]["@rasterXSize"] = value
+        self._writable("VRTDataset")["@rasterXSize"] = value
 
     @property
     def ysize(self):
@@ -187,7 +267,7 @@ class VRTBase(object):
 
     @ysize.setter
     def ysize(self, value: Union[int, float]) -> None:
-        self.data["VRTDataset"]["@rasterYSize"] = value
+        self._writable("VRTDataset")["@rasterYSize"] = value
 
     @property
     def bands(self):
@@ -203,12 +283,8 @@ class VRTBase(object):
 
     @bitdepth.setter
     def bitdepth(self, value: str) -> None:
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i]["@dataType"].update({
-                "$":
-                value
-            }) for i in range(self.bands)
-        ]
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i)["@dataType"] = value
 
     @property
     def nodata(self):
@@ -220,12 +296,9 @@ class VRTBase(object):
 
     @nodata.setter
     def nodata(self, value: Union[int, float]) -> None:
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i]["NoDataValue"].update({
-                "$":
-                value
-            }) for i in range(self.bands)
-        ]
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i,
+                           "NoDataValue")["$"] = value
 
     @property
     def extent(self):
@@ -244,24 +317,17 @@ class VRTBase(object):
         ]
 
     def drop_band(self, band: int) -> None:
-        self.data["VRTDataset"]["VRTRasterBand"].pop(band - 1)
+        self._writable("VRTDataset", "VRTRasterBand").pop(band - 1)
         # Update all band numbers
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i].update({
-                "@band": i + 1
-            }) for i in range(band - 1, self.bands)
-        ]
+        for i in range(band - 1, self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i)["@band"] = i + 1
 
     def drop_bands(self, bands):
-        [
-            self.data["VRTDataset"]["VRTRasterBand"].pop(i - 1)
-            for i in sorted(bands, reverse=True)
-        ]
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i].update({
-                "@band": i + 1
-            }) for i in range(self.bands)
-        ]
+        band_list = self._writable("VRTDataset", "VRTRasterBand")
+        for i in sorted(bands, reverse=True):
+            band_list.pop(i - 1)
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i)["@band"] = i + 1
 
     def get_band(self, band: int) -> OrderedDict:
         return self.data["VRTDataset"]["VRTRasterBand"][band - 1]
@@ -273,20 +339,35 @@ class VRTBase(object):
 
         return gen_band()
 
+    def deferred(self):
+        """Method to record translate/warp operations and apply them fused, once, to a clone (see gdaljson.pipeline)"""
+        return Pipeline(self)
+
     def pprint(self):
-        print(json.dumps(self.data, indent=1))
+        print(json.dumps(self.data, indent=1, default=jsonable))
+
+    def to_bytes(self) -> bytes:
+        return to_bytes(self.data)
 
     def to_xml(self, outfile: str) -> None:
-        test = bf.etree(self.data)[0]
-        tree = ET.ElementTree(test)
-        tree.write(outfile)
+        with span("to_xml") as s:
+            s.count("bytes", write(self.data, outfile))
+
+    @classmethod
+    def from_json(cls, s):
+        """Method to load a VRT from the json encoding of its badgerfish dict (string, bytes or file object)"""
+        return cls(from_json(s))
+
+    def to_json(self) -> bytes:
+        """Method to dump the badgerfish dict of the VRT to json, without going through xml"""
+        return to_json(self.data)
 
 
 class VRTDataset(VRTBase):
     """Standard VRT Dataset made with gdal.Translate"""
 
-    def __init__(self, vrt):
-        VRTBase.__init__(self, vrt)
+    def __init__(self, vrt, lazy: bool = False):
+        VRTBase.__init__(self, vrt, lazy=lazy)
         self.source = [
             x for x in list(self.data["VRTDataset"]["VRTRasterBand"][0])
             if "Source" in x
@@ -299,12 +380,9 @@ class VRTDataset(VRTBase):
 
     @filename.setter
     def filename(self, value: str) -> None:
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i][self.source]
-            ["SourceFilename"].update({
-                "$": value
-            }) for i in range(self.bands)
-        ]
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i, self.source,
+                           "SourceFilename")["$"] = value
 
     @property
     def scale_ratio(self):
@@ -316,13 +394,9 @@ class VRTDataset(VRTBase):
 
     @scale_ratio.setter
     def scale_ratio(self, value: list) -> None:
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i][self.source].update({
-                "ScaleRatio": {
-                    "$": value
-                }
-            }) for i in range(self.bands)
-        ]
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i,
+                           self.source)["ScaleRatio"] = {"$": value}
 
     @property
     def scale_offset(self):
@@ -334,13 +408,9 @@ class VRTDataset(VRTBase):
 
     @scale_offset.setter
     def scale_offset(self, value: int) -> None:
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i][self.source].update({
-                "ScaleOffset": {
-                    "$": value
-                }
-            }) for i in range(self.bands)
-        ]
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i,
+                           self.source)["ScaleOffset"] = {"$": value}
 
     @property
     def resampling(self):
@@ -352,19 +422,22 @@ class VRTDataset(VRTBase):
 
     @resampling.setter
     def resampling(self, value: str) -> None:
-        [
-            self.data["VRTDataset"]["VRTRasterBand"][i][self.source].update({
-                "@resampling":
-                value
-            }) for i in range(self.bands)
-        ]
+        for i in range(self.bands):
+            self._writable("VRTDataset", "VRTRasterBand", i,
+                           self.source)["@resampling"] = value
+
+    @property
+    def _source_properties(self):
+        """SourceProperties of the first source of the first band (mosaics hold a list of sources)"""
+        source = self.data["VRTDataset"]["VRTRasterBand"][0][self.source]
+        if not isinstance(source, dict):
+            source = source[0]
+        return source["SourceProperties"]
 
     @property
     def blocksize(self):
-        return [
-            self.data["VRTDataset"]["VRTRasterBand"][0]["SimpleSource"]["SourceProperties"]["@BlockXSize"],
-            self.data["VRTDataset"]["VRTRasterBand"][0]["SimpleSource"]["SourceProperties"]["@BlockYSize"]
-        ]
+        props = self._source_properties
+        return [props["@BlockXSize"], props["@BlockYSize"]]
 
     @property
     def src_rect(self):
@@ -382,14 +455,12 @@ class VRTDataset(VRTBase):
     @src_rect.setter
     def src_rect(self, offset: list) -> None:
         for band in range(self.shape[2]):
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["SrcRect"]["@xOff"] = offset[0]
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["SrcRect"]["@yOff"] = offset[1]
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["SrcRect"]["@xSize"] = offset[2]
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["SrcRect"]["@ySize"] = offset[3]
+            rect = self._writable("VRTDataset", "VRTRasterBand", band,
+                                  self.source, "SrcRect")
+            rect["@xOff"] = offset[0]
+            rect["@yOff"] = offset[1]
+            rect["@xSize"] = offset[2]
+            rect["@ySize"] = offset[3]
 
     @property
     def dst_rect(self):
@@ -407,34 +478,31 @@ class VRTDataset(VRTBase):
     @dst_rect.setter
     def dst_rect(self, offset: list) -> None:
         for band in range(self.shape[2]):
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["DstRect"]["@xOff"] = offset[0]
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["DstRect"]["@yOff"] = offset[1]
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["DstRect"]["@xSize"] = offset[2]
-            self.data["VRTDataset"]["VRTRasterBand"][band][
-                self.source]["DstRect"]["@ySize"] = offset[3]
+            rect = self._writable("VRTDataset", "VRTRasterBand", band,
+                                  self.source, "DstRect")
+            rect["@xOff"] = offset[0]
+            rect["@yOff"] = offset[1]
+            rect["@xSize"] = offset[2]
+            rect["@ySize"] = offset[3]
 
     def change_source(self, new_source: str) -> None:
         for band in range(self.bands):
-            self.data["VRTDataset"]["VRTRasterBand"][band].update({
-                new_source:
-                self.data["VRTDataset"]["VRTRasterBand"][band][self.source]
-            })
-            del (self.data["VRTDataset"]["VRTRasterBand"][band][self.source])
+            band_data = self._writable("VRTDataset", "VRTRasterBand", band)
+            band_data.update({new_source: band_data[self.source]})
+            del (band_data[self.source])
 
             if new_source == "ComplexSource":
-                self.data["VRTDataset"]["VRTRasterBand"][band][
-                    new_source].update({
-                        "NODATA": {
-                            "$": self.nodata
-                        }
-                    })
-                self.data["VRTDataset"]["VRTRasterBand"][band][new_source][
-                    "SourceProperties"]["@BlockXSize"] = min(128, self.xsize)
-                self.data["VRTDataset"]["VRTRasterBand"][band][new_source][
-                    "SourceProperties"]["@BlockYSize"] = min(128, self.ysize)
+                self._writable("VRTDataset", "VRTRasterBand", band,
+                               new_source).update({
+                                   "NODATA": {
+                                       "$": self.nodata
+                                   }
+                               })
+                source_props = self._writable("VRTDataset", "VRTRasterBand",
+                                              band, new_source,
+                                              "SourceProperties")
+                source_props["@BlockXSize"] = min(128, self.xsize)
+                source_props["@BlockYSize"] = min(128, self.ysize)
         self.source = new_source
 
     def add_band(self):
@@ -443,7 +511,7 @@ class VRTDataset(VRTBase):
         template_band["@band"] = self.bands + 1
         if "ColorInterp" in template_band.keys():
             del (template_band["ColorInterp"])
-        self.data["VRTDataset"]["VRTRasterBand"].append(template_band)
+        self._writable("VRTDataset", "VRTRasterBand").append(template_band)
 
     def add_bands(self, bands: int) -> None:
         """Generate band(s) with same band profile as Band1 and ambiguous color interp"""
@@ -451,6 +519,74 @@ class VRTDataset(VRTBase):
         for _ in range(bands):
             self.add_band()
 
+    def projwin_to_srcwin(self, projWin: list) -> list:
+        """Method to convert a projWin [ulx, uly, lrx, lry] to a srcWin [xoff, yoff, xsize, ysize]"""
+        xoff, yoff = [
+            int((projWin[0] - self.gt.tlx) / self.gt.xres),
+            int((self.gt.tly - projWin[1]) / self.gt.yres),
+        ]
+        xsize, ysize = [
+            int(round((projWin[2] - projWin[0]) / self.gt.xres)),
+            int(round((projWin[1] - projWin[3]) / self.gt.yres)),
+        ]
+        return [xoff, yoff, xsize, ysize]
+
+    def _window_to_source(self, srcWin: list) -> list:
+        """Method to convert a window of the output [xoff, yoff, xsize, ysize] to source pixels (SrcRect)"""
+        (src, dst) = (self.src_rect, self.dst_rect)
+        if src[2:] == dst[2:]:
+            return [src[0] + srcWin[0] - dst[0], src[1] + srcWin[1] - dst[1], srcWin[2], srcWin[3]]
+        (fx, fy) = (src[2] / dst[2], src[3] / dst[3])
+        return [src[0] + (srcWin[0] - dst[0]) * fx, src[1] + (srcWin[1] - dst[1]) * fy, srcWin[2] * fx, srcWin[3] * fy]
+
+    def _window_from_source(self, window: list) -> list:
+        """Method to convert a window in source pixels to a window of the output (at the source's resolution)"""
+        (src, dst) = (self.src_rect, self.dst_rect)
+        return [dst[0] + window[0] - src[0], dst[1] + window[1] - src[1], window[2], window[3]]
+
+    def blocks_read(self, srcWin: list = None):
+        """
+        Method to count the source blocks (of one band) read for a srcWin [xoff, yoff, xsize, ysize], the current SrcRect
+        by default.  Also accepts an (n, 4) array of windows such as `tile_windows`, returning an array of counts.
+        """
+        windows = np.asarray(self.src_rect if srcWin is None else srcWin)
+        (xblock, yblock) = self.blocksize
+        (xoff, yoff, xsize, ysize) = np.asarray(windows.T, dtype=float)
+        # Blocks from the one holding floor(off) to the one holding ceil(off + size) - 1, so fractional windows count
+        # every block they touch
+        columns = (np.ceil(xoff + xsize) - 1) // xblock - np.floor(xoff) // xblock + 1
+        rows = (np.ceil(yoff + ysize) - 1) // yblock - np.floor(yoff) // yblock + 1
+        count = np.where((xsize > 0) & (ysize > 0), columns * rows, 0).astype(np.int64)
+        return int(count) if windows.ndim == 1 else count
+
+    def snap_window(self, srcWin: list, snap: str = "expand") -> list:
+        """
+        Method to snap a srcWin to the block grid of the source (SourceProperties@BlockXSize/BlockYSize).  "expand" grows
+        the window to the enclosing block boundaries, "align" moves its origin to the nearest block corner (or as close as
+        the raster edge allows) and keeps its size.  Either way, the window is clipped to the source raster.
+        """
+        props = self._source_properties
+        (xblock, yblock) = self.blocksize
+        (xoff, yoff, xsize, ysize) = srcWin
+        if (xoff >= props["@RasterXSize"] or yoff >= props["@RasterYSize"] or xoff + xsize <= 0 or yoff + ysize <= 0
+                or xsize <= 0 or ysize <= 0):
+            raise ValueError(f"srcWin {list(srcWin)} does not intersect the source raster")
+        if snap == "expand":
+            (x0, y0) = (xoff // xblock * xblock, yoff // yblock * yblock)
+            x1 = -(-(xoff + xsize) // xblock) * xblock
+            y1 = -(-(yoff + ysize) // yblock) * yblock
+        elif snap == "align":
+            (x0, y0) = (int(round(xoff / xblock)) * xblock, int(round(yoff / yblock)) * yblock)
+            # Keep the window inside the raster; near the far edge, the origin can't be on a block corner
+            x0 = max(0, min(x0, props["@RasterXSize"] - xsize))
+            y0 = max(0, min(y0, props["@RasterYSize"] - ysize))
+            (x1, y1) = (x0 + xsize, y0 + ysize)
+        else:
+            raise ValueError(f"Unknown snap mode {snap}")
+        (x0, y0) = (max(x0, 0), max(y0, 0))
+        (x1, y1) = (min(x1, props["@RasterXSize"]), min(y1, props["@RasterYSize"]))
+        return [int(x0), int(y0), int(x1 - x0), int(y1 - y0)]
+
     def translate(
             self,
             bandList: list = None,
@@ -463,80 +599,157 @@ class VRTDataset(VRTBase):
             noData: Union[int, float] = None,
             resampleAlg: str = None,
             scaleParams: list = None,
+            snap: str = None,
             **kwargs
     ) -> None:
-
-        # Handle bands first
-        if bandList:
-            self.drop_bands(
-                set(range(1, self.bands + 1)).difference(set(bandList)))
-            [
-                self.data["VRTDataset"]["VRTRasterBand"][i][self.source]
-                ["SourceBand"].update({
-                    "$": bandList[i]
-                }) for i in range(self.bands)
-            ]
-        if srcWin or projWin:
-            if srcWin and projWin:
-                raise ValueError("srcWin and projWin are mutually exlusive")
-            if projWin:
-                xoff, yoff = [
-                    int((projWin[0] - self.gt.tlx) / self.gt.xres),
-                    int((self.gt.tly - projWin[1]) / self.gt.yres),
-                ]
-                xsize, ysize = [
-                    int(round((projWin[2] - projWin[0]) / self.gt.xres)),
-                    int(round((projWin[1] - projWin[3]) / self.gt.yres)),
-                ]
-                srcWin = [xoff, yoff, xsize, ysize]
-            self.src_rect = srcWin
-            self.dst_rect = [0, 0, srcWin[2], srcWin[3]]
-
-        self.tlx = self.src_rect[0] * self.xres + self.tlx
-        self.tly = self.tly - self.src_rect[1] * self.yres
-
-        if height or width:
-            if (height or width) and (xRes or yRes):
-                raise ValueError(
-                    "height/width and xRes/yRes are mutually exclusive")
-            if height and width:
-                self.dst_rect = [0, 0, width, height]
-                _width = width
-                _height = height
-            else:
-                if height:
-                    ratio = self.src_rect[3] / height
-                    _width = int(round(self.src_rect[2] / ratio))
-                    _height = height
-                elif width:
-                    ratio = self.src_rect[2] / width
-                    _height = int(round(self.src_rect[3] / ratio))
+        """
+        Method to translate the VRT like gdal_translate.  With `snap` ("expand" or "align", see `snap_window`), the
+        srcWin/projWin is snapped to the source's block grid so no partially used blocks are read; the output grid
+        follows the snapped window.  Like gdal_translate run on the output of an earlier translate, band numbers and
+        windows refer to the current output, so translates can be chained.
+        """
+        with span("translate") as s:
+            # Handle bands first
+            if bandList:
+                source_bands = [self.get_band(band)[self.source]["SourceBand"]["$"] for band in bandList]
+                self.drop_bands(
+                    set(range(1, self.bands + 1)).difference(set(bandList)))
+                for i in range(self.bands):
+                    self._writable("VRTDataset", "VRTRasterBand", i, self.source,
+                                   "SourceBand")["$"] = source_bands[i]
+            # Size of the (windowed) current output, which a resize is relative to
+            (xsize, ysize) = (self.xsize, self.ysize)
+            if srcWin or projWin:
+                if srcWin and projWin:
+                    raise ValueError("srcWin and projWin are mutually exlusive")
+                if projWin:
+                    srcWin = self.projwin_to_srcwin(projWin)
+                window = self._window_to_source(srcWin)
+                if snap:
+                    if self.src_rect[2:] != self.dst_rect[2:]:
+                        raise ValueError("snap requires an output which isn't resampled from the source")
+                    window = self.snap_window(window, snap)
+                    srcWin = self._window_from_source(window)
+                self.src_rect = window
+                self.dst_rect = [0, 0, srcWin[2], srcWin[3]]
+                self.tlx = srcWin[0] * self.xres + self.tlx
+                self.tly = self.tly - srcWin[1] * self.yres
+                (xsize, ysize) = (srcWin[2], srcWin[3])
+
+            if height or width:
+                if (height or width) and (xRes or yRes):
+                    raise ValueError(
+                        "height/width and xRes/yRes are mutually exclusive")
+                if height and width:
+                    self.dst_rect = [0, 0, width, height]
                     _width = width
+                    _height = height
+                else:
+                    if height:
+                        ratio = ysize / height
+                        _width = int(round(xsize / ratio))
+                        _height = height
+                    elif width:
+                        ratio = xsize / width
+                        _height = int(round(ysize / ratio))
+                        _width = width
+                    self.dst_rect = [0, 0, _width, _height]
+
+                self.xres = self.xres * xsize / _width
+                self.yres = -(self.yres * ysize) / _height
+
+            elif xRes and yRes:
+                _width = int(round((self.xres * xsize) / xRes))
+                _height = int(round((self.yres * ysize) / yRes))
+                self.xres = xRes
+                self.yres = -yRes
                 self.dst_rect = [0, 0, _width, _height]
 
-            self.xres = self.xres * self.src_rect[2] / _width
-            self.yres = -(self.yres * self.src_rect[3]) / _height
-
-        elif xRes and yRes:
-            _width = int(round((self.xres * self.src_rect[2]) / xRes))
-            _height = int(round((self.yres * self.src_rect[3]) / yRes))
-            self.xres = xRes
-            self.yres = -yRes
-            self.dst_rect = [0, 0, _width, _height]
-
-        self.update_gt()
-        self.xsize = self.dst_rect[2]
-        self.ysize = self.dst_rect[3]
-
-        if scaleParams:
-            self.scale_ratio = scaleParams[3] / scaleParams[1]
-            self.scale_offset = 0
-            self.change_source("ComplexSource")
-
-        if noData:
-            self.nodata = noData
-        if resampleAlg:
-            self.resampling = resampleAlg
+            self.update_gt()
+            self.xsize = self.dst_rect[2]
+            self.ysize = self.dst_rect[3]
+
+            if scaleParams:
+                self.scale_ratio = scaleParams[3] / scaleParams[1]
+                self.scale_offset = 0
+                if self.source != "ComplexSource":
+                    self.change_source("ComplexSource")
+
+            if noData:
+                self.nodata = noData
+            if resampleAlg:
+                self.resampling = resampleAlg
+            s.count("bands", self.bands)
+
+    async def atranslate(self, executor=None, **kwargs) -> None:
+        """Method to translate in `executor` without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, functools.partial(self.translate, **kwargs))
+
+    def derive(self, **kwargs):
+        """Method to translate a copy-on-write clone, leaving this VRT untouched"""
+        other = self.clone()
+        other.translate(**kwargs)
+        return other
+
+    def tile_windows(self,
+                     tile_size: Union[int, list],
+                     overlap: Union[int, list] = 0,
+                     projWin: list = None) -> np.ndarray:
+        """
+        Method to compute the srcWin of every tile in a regular grid covering the VRT (or `projWin`), row by row.
+        Returns an (n, 4) array of [xoff, yoff, xsize, ysize].  Tiles along the edges are truncated to the grid and to the
+        raster (tiles of a `projWin` entirely outside the raster are dropped), and a tile is only started if it reaches
+        past the overlap of the previous one.
+        """
+        tile_size = np.broadcast_to(tile_size, 2)
+        overlap = np.broadcast_to(overlap, 2)
+        step = tile_size - overlap
+        if (step <= 0).any():
+            raise ValueError("overlap must be smaller than tile_size")
+        if projWin:
+            window = self.projwin_to_srcwin(projWin)
+        else:
+            window = [0, 0, self.xsize, self.ysize]
+        (x0, y0, width, height) = window
+        xoffs = np.arange(x0, x0 + max(width - overlap[0], 1), step[0])
+        yoffs = np.arange(y0, y0 + max(height - overlap[1], 1), step[1])
+        (xoff, yoff) = [a.ravel() for a in np.meshgrid(xoffs, yoffs)]
+        # Truncate tiles to the region and the raster, dropping those left empty
+        (xend, yend) = (min(x0 + width, self.xsize), min(y0 + height, self.ysize))
+        xsize = np.minimum(xoff + tile_size[0], xend)
+        ysize = np.minimum(yoff + tile_size[1], yend)
+        (xoff, yoff) = (np.maximum(xoff, 0), np.maximum(yoff, 0))
+        (xsize, ysize) = (xsize - xoff, ysize - yoff)
+        keep = (xsize > 0) & (ysize > 0)
+        return np.column_stack([xoff, yoff, xsize, ysize])[keep]
+
+    def tiles(self,
+              tile_size: Union[int, list],
+              overlap: Union[int, list] = 0,
+              projWin: list = None) -> Generator:
+        """
+        Method to lazily generate one VRTDataset per tile of `tile_windows`.  Each tile is a copy-on-write clone equal to
+        `self.derive(srcWin=window)`; windows and geotransforms are computed for the whole grid at once.
+        """
+        windows = self.tile_windows(tile_size, overlap=overlap, projWin=projWin)
+        tlx = (windows[:, 0] * self.xres + self.tlx).tolist()
+        tly = (self.tly - windows[:, 1] * self.yres).tolist()
+        windows = windows.tolist()
+
+        def gen_tile():
+            for (i, window) in enumerate(windows):
+                tile = self.clone()
+                tile.src_rect = self._window_to_source(window)
+                tile.dst_rect = [0, 0, window[2], window[3]]
+                tile.tlx = tlx[i]
+                tile.tly = tly[i]
+                tile.update_gt()
+                tile.xsize = window[2]
+                tile.ysize = window[3]
+                yield tile
+
+        return gen_tile()
 
 
 class VRTWarpedDataset(VRTBase):
@@ -546,11 +759,19 @@ class VRTWarpedDataset(VRTBase):
     format (tests/templates/warped.vrt).
     """
 
-    def __init__(self, vrt):
-        super().__init__(vrt)
+    def __init__(self, vrt, lazy: bool = False):
+        super().__init__(vrt, lazy=lazy)
 
         self.__warp_options = WarpOpts(
-            self.data["VRTDataset"]["GDALWarpOptions"])
+            self.data["VRTDataset"]["GDALWarpOptions"], owner=self)
+        # Savings of the last optimized cutline (see warp)
+        self.cutline_stats = None
+
+    def clone(self):
+        other = super().clone()
+        other._VRTWarpedDataset__warp_options = WarpOpts(
+            other.data["VRTDataset"]["GDALWarpOptions"], owner=other)
+        return other
 
     @property
     def filename(self):
@@ -558,20 +779,20 @@ class VRTWarpedDataset(VRTBase):
 
     @filename.setter
     def filename(self, value: str) -> None:
-        self.data["VRTDataset"]["GDALWarpOptions"]["SourceDataset"][
-            "$"] = value
+        self._writable("VRTDataset", "GDALWarpOptions",
+                       "SourceDataset")["$"] = value
 
     @property
     def blocksize(self):
         return [
             self.data["VRTDataset"]["BlockXSize"]["$"],
-            self.data["VRTDataset"]["BlockXSize"]["$"],
+            self.data["VRTDataset"]["BlockYSize"]["$"],
         ]
 
     @blocksize.setter
     def blocksize(self, value: list) -> None:
-        self.data["VRTDataset"]["BlockXSize"]["$"] = value[0]
-        self.data["VRTDataset"]["BlockYSize"]["$"] = value[1]
+        self._writable("VRTDataset", "BlockXSize")["$"] = value[0]
+        self._writable("VRTDataset", "BlockYSize")["$"] = value[1]
 
     @property
     def warp_options(self):
@@ -579,7 +800,7 @@ class VRTWarpedDataset(VRTBase):
 
     @warp_options.setter
     def warp_options(self, value: dict) -> None:
-        self.data["VRTDataset"]["GDALWarpOptions"].update(value)
+        self._writable("VRTDataset", "GDALWarpOptions").update(value)
 
     def add_band(self, alpha: bool = False) -> None:
         """Add one band with same band profile as Band1 and ambiguous color interp"""
@@ -591,7 +812,7 @@ class VRTWarpedDataset(VRTBase):
         else:
             if "ColorInterp" in template_band.keys():
                 del (template_band["ColorInterp"])
-        self.data["VRTDataset"]["VRTRasterBand"].append(template_band)
+        self._writable("VRTDataset", "VRTRasterBand").append(template_band)
 
         # Also update band mapping
         if not alpha:
@@ -599,8 +820,8 @@ class VRTWarpedDataset(VRTBase):
                 self.data["VRTDataset"]["GDALWarpOptions"]["BandList"]
                 ["BandMapping"][0])
             template_mapping["@src"] = template_mapping["@dst"] = bands + 1
-            self.data["VRTDataset"]["GDALWarpOptions"]["BandList"][
-                "BandMapping"].append(template_mapping)
+            self._writable("VRTDataset", "GDALWarpOptions", "BandList",
+                           "BandMapping").append(template_mapping)
 
     def add_bands(self, bands: int) -> None:
         """Generate band(s) with same band profile as Band1 and ambiguous color interp"""
@@ -608,7 +829,8 @@ class VRTWarpedDataset(VRTBase):
 
     def filter_band_properties(self, allowed: list) -> None:
         """Delete all band elements not in the input list"""
-        for band in self.data["VRTDataset"]["VRTRasterBand"]:
+        for i in range(self.bands):
+            band = self._writable("VRTDataset", "VRTRasterBand", i)
             for (k, v) in dict(band).items():
                 if k not in allowed:
                     del (band[k])
@@ -624,106 +846,208 @@ class VRTWarpedDataset(VRTBase):
             yRes: Union[int, float] = None,
             dstAlpha: bool = False,
             resample: str = "NearestNeighbour",
+            densifyPts: int = 21,
+            optimizeCutline: Union[bool, dict] = False,
+            tune: Union[bool, dict] = False,
             **kwargs
     ) -> None:
-
-        self.warp_options.resample = resample
-
+        """
+        Method to warp the VRT like gdalwarp.  With `optimizeCutline` (True, or a dict of `optimize_cutlines` keyword
+        arguments), the cutline is clipped to the raster, simplified and written at fixed precision before it is
+        embedded; the savings are recorded in `cutline_stats`.  With `tune` (True, or a dict of `tune` keyword
+        arguments), the block size, WarpMemoryLimit and warp options are chosen for the output (see
+        `gdaljson.tuning`).  A clipper holding a FeatureCollection or MultiPolygon is reduced to the union of the
+        polygons intersecting the raster.
+        """
+        with span("warp") as s:
+            self.warp_options.resample = resample
+            # Cutlines are in pixels and the SRS of the source grid, which the reprojection below replaces
+            src_size = (self.xsize, self.ysize)
+            src_epsg = self.epsg if dstSRS and clipper and cropToCutline else None
+            footprint = None
+            if clipper:
+                (xmin, xmax, ymin, ymax) = self.extent
+                footprint = shapely.box(xmin, ymin, xmax, ymax)
+
+            if dstSRS:
+                self._reproject(dstSRS, densifyPts)
+
+            if clipper:
+                with span("warp.cutline") as cutline_span:
+                    entry = clipper_cache.get(clipper)
+                    geom = entry.select(footprint)
+                    if geom.is_empty:
+                        raise ValueError("Clipper does not intersect the raster")
+                    cutline_span.count("vertices", int(shapely.get_num_coordinates(geom)))
+                    src_gt = GeoTransform(self.data["VRTDataset"]["GeoTransform"]["$"])
+                    bounds = None
+                    if cropToCutline:
+                        if dstSRS:
+                            bounds = clipper_cache.reproject(entry, geom, src_epsg, dstSRS).bounds
+                        else:
+                            bounds = geom.bounds
+                    geom = src_gt.geometry_to_pixel(geom)
+                    if optimizeCutline:
+                        options = optimizeCutline if isinstance(optimizeCutline, dict) else {}
+                        ([cutline], [self.cutline_stats]) = optimize_cutlines([geom], *src_size, **options)
+                        cutline_span.count("vertices_removed", self.cutline_stats.vertices_removed)
+                        cutline_span.count("bytes_removed", self.cutline_stats.bytes_removed)
+                    else:
+                        cutline = geom.wkt
+                    self._cutline(cutline, bounds)
+
+            with span("warp.finish"):
+                self._finish(height, width, xRes, yRes, dstAlpha, tune)
+            s.count("bands", self.bands)
+
+    def warp_many(self,
+                  clippers,
+                  dstSRS: int = None,
+                  cropToCutline: bool = False,
+                  height: int = None,
+                  width: int = None,
+                  xRes: Union[int, float] = None,
+                  yRes: Union[int, float] = None,
+                  dstAlpha: bool = False,
+                  resample: str = "NearestNeighbour",
+                  densifyPts: int = 21,
+                  optimizeCutline: Union[bool, dict] = False,
+                  tune: Union[bool, dict] = False,
+                  workers: int = None,
+                  **kwargs) -> Generator:
+        """
+        Method to warp one copy-on-write clone per clipper (FeatureCollection, iterable of geometries, etc., see
+        `load_clippers`), leaving this VRT untouched.  Each output equals `self.derive(clipper=geom, ...)`, but the
+        reprojection is computed once and all cutlines are converted in one vectorized pass.  With `workers`, clones are
+        finished in a process pool.  Outputs are generated lazily and in the order of the clippers.
+        """
+        (xmin, xmax, ymin, ymax) = self.extent
+        geoms = load_clippers(clippers, shapely.box(xmin, ymin, xmax, ymax))
+        empty = np.flatnonzero(shapely.is_empty(np.array(geoms, dtype=object)))
+        if len(empty):
+            raise ValueError(f"Clipper {int(empty[0])} does not intersect the raster")
+        base = self.clone()
+        base.warp_options.resample = resample
+        proj_transformer = None
         if dstSRS:
-            extent = self.extent
+            proj_transformer = base._reproject(dstSRS, densifyPts)
+
+        src_gt = GeoTransform(self.data["VRTDataset"]["GeoTransform"]["$"])
+        pixel_geoms = src_gt.geometry_to_pixel(geoms)
+        stats = [None] * len(geoms)
+        if optimizeCutline:
+            options = optimizeCutline if isinstance(optimizeCutline, dict) else {}
+            (cutlines, stats) = optimize_cutlines(pixel_geoms, self.xsize, self.ysize, **options)
+        else:
+            cutlines = shapely.to_wkt(pixel_geoms, rounding_precision=-1).tolist()
+        bounds = [None] * len(geoms)
+        if cropToCutline:
+            if dstSRS:
+
+                def project(coords):
+                    return np.column_stack(
+                        proj_transformer.transform(coords[:, 0], coords[:, 1]))
+
+                geoms = shapely.transform(geoms, project)
+            bounds = [tuple(b) for b in shapely.bounds(geoms).tolist()]
+
+        finish = (height, width, xRes, yRes, dstAlpha, tune)
+        jobs = zip(cutlines, bounds, stats)
+
+        def gen_warped():
+            if not workers:
+                for job in jobs:
+                    yield _warp_one(base, job, finish)
+                return
+            with ProcessPoolExecutor(workers, initializer=_warp_init, initargs=(base, finish)) as executor:
+                yield from executor.map(_warp_job, jobs, chunksize=max(1, len(cutlines) // (workers * 4)))
+
+        return gen_warped()
+
+    def _reproject(self, dstSRS: int, densifyPts: int = 21):
+        """Method to reproject the output grid to `dstSRS`, returning the pyproj transformer used"""
+        extent = self.extent
+        with span("warp.crs_lookup"):
             out_wkt = wkt(dstSRS)
-            in_srs = Proj(init=f"epsg:{self.epsg}")
-            out_srs = Proj(init=f"epsg:{dstSRS}")
-
-            # Calculate new resolution (see https://www.gdal.org/gdal__alg_8h.html#a816819e7495bfce06dbd110f7c57af65)
-            # Resolution is computed with the intent that the length of the distance from the top left corner of the output
-            # imagery to the bottom right corner would represent the same number of pixels as in the source
-
-            source_pixels_diag = math.sqrt(self.xsize**2 + self.ysize**2)
-            proj_tl = transform(in_srs, out_srs, extent[0], extent[3])
-            proj_bl = transform(in_srs, out_srs, extent[0], extent[2])
-            proj_br = transform(in_srs, out_srs, extent[1], extent[2])
-            proj_tr = transform(in_srs, out_srs, extent[1], extent[3])
-
-            proj_tl_corner = [
-                min(proj_tl[0], proj_bl[0]),
-                max(proj_tl[1], proj_tr[1])
+        with span("warp.transformer"):
+            proj_transformer = transformer(self.epsg, dstSRS)
+
+        # Calculate new resolution (see https://www.gdal.org/gdal__alg_8h.html#a816819e7495bfce06dbd110f7c57af65)
+        # Resolution is computed with the intent that the length of the distance from the top left corner of the output
+        # imagery to the bottom right corner would represent the same number of pixels as in the source.  Output bounds
+        # follow `densifyPts` samples along each edge of the extent, so curved edges are not cut off (densifyPts=2
+        # only samples the corners)
+
+        source_pixels_diag = math.sqrt(self.xsize**2 + self.ysize**2)
+        with span("warp.transform_extent", points=4 * max(densifyPts, 2)):
+            proj_tl, proj_br, proj_bounds = transform_extent(
+                proj_transformer, extent, densify=densifyPts)
+
+        proj_tl_corner = [proj_bounds[0], proj_bounds[3]]
+        proj_br_corner = [proj_bounds[1], proj_bounds[2]]
+
+        projwidth = proj_br[0] - proj_tl[0]
+        projheight = proj_tl[1] - proj_br[1]
+        projdiag = math.sqrt(projwidth**2 + projheight**2)
+        res = projdiag / source_pixels_diag
+
+        # Calculate new cols and rows based on res
+        cols = round((proj_br_corner[0] - proj_tl_corner[0]) / res)
+        rows = round((proj_tl_corner[1] - proj_br_corner[1]) / res)
+
+        proj_gt = [proj_tl_corner[0], res, 0, proj_tl_corner[1], 0, -res]
+        self.gt.load(proj_gt)
+
+        # Update transformer
+        self.warp_options.reproject_transformer = {
+            "ReprojectionTransformer": {
+                "SourceSRS": {
+                    "$": self.srs
+                },
+                "TargetSRS": {
+                    "$": out_wkt
+                },
+            }
+        }
+        self.warp_options.dst_gt = self.gt.to_element()
+        self.warp_options.dst_invgt = self.gt.to_element(inverse=True)
+        self.srs = out_wkt
+        self.xsize = cols
+        self.ysize = rows
+        return proj_transformer
+
+    def _cutline(self, cutline: str, bounds: tuple = None) -> None:
+        """Method to set a cutline (wkt in source pixel coordinates), cropping the output grid to `bounds` if given"""
+        self.warp_options.cutline = cutline
+
+        if bounds:
+            xsize, ysize = [
+                int(round((bounds[2] - bounds[0]) / self.xres)),
+                int(round((bounds[3] - bounds[1]) / self.yres)),
             ]
-            proj_br_corner = [
-                max(proj_tr[0], proj_br[0]),
-                min(proj_bl[1], proj_br[1])
+            clip_gt = [
+                bounds[0],
+                (bounds[2] - bounds[0]) / xsize,
+                0,
+                bounds[3],
+                0,
+                -((bounds[3] - bounds[1]) / ysize),
             ]
-
-            projwidth = proj_br[0] - proj_tl[0]
-            projheight = proj_tl[1] - proj_br[1]
-            projdiag = math.sqrt(projwidth**2 + projheight**2)
-            res = projdiag / source_pixels_diag
-
-            # Calculate new cols and rows based on res
-            cols = round((proj_br_corner[0] - proj_tl_corner[0]) / res)
-            rows = round((proj_tl_corner[1] - proj_br_corner[1]) / res)
-
-            proj_gt = [proj_tl_corner[0], res, 0, proj_tl_corner[1], 0, -res]
-            self.gt.load(proj_gt)
-
-            # Update transformer
-            self.warp_options.reproject_transformer = {
-                "ReprojectionTransformer": {
-                    "SourceSRS": {
-                        "$": self.srs
-                    },
-                    "TargetSRS": {
-                        "$": out_wkt
-                    },
-                }
-            }
-            self.warp_options.dst_gt = self.gt.to_element()
-            self.warp_options.dst_invgt = self.gt.to_element(inverse=True)
-            self.srs = out_wkt
-            self.xsize = cols
-            self.ysize = rows
-
-        if clipper:
-            if hasattr(clipper, "__geo_interface__"):
-                geom = shape(clipper)
-            elif type(clipper) is str and clipper.endswith(".geojson"):
-                clip_file = open(clipper)
-                geom = shape(geojson.load(clip_file)["geometry"])
-            elif type(clipper) is dict:
-                geom = shape(geojson.loads(json.dumps(clipper)))
-            else:
-                raise ValueError("Invalid clipper type")
-
-            self.warp_options.cutline = transform_geom(self.coords_to_pix,
-                                                       geom).wkt
-
-            if cropToCutline:
-                if dstSRS:
-                    project = functools.partial(transform, in_srs, out_srs)
-                    geom = transform_geom(project, geom)
-                bounds = geom.bounds
-                xsize, ysize = [
-                    int(round((bounds[2] - bounds[0]) / self.xres)),
-                    int(round((bounds[3] - bounds[1]) / self.yres)),
-                ]
-                clip_gt = [
-                    bounds[0],
-                    (bounds[2] - bounds[0]) / xsize,
-                    0,
-                    bounds[3],
-                    0,
-                    -((bounds[3] - bounds[1]) / ysize),
-                ]
-                self.xsize = xsize
-                self.ysize = ysize
-
-                self.gt.load(clip_gt)
-            self.warp_options.dst_gt = self.gt.to_element()
-            self.warp_options.dst_invgt = self.gt.to_element(inverse=True)
-
-        if type(clipper) is str and clipper.endswith(".geojson"):
-            clip_file.close()
-
+            self.xsize = xsize
+            self.ysize = ysize
+
+            self.gt.load(clip_gt)
+        self.warp_options.dst_gt = self.gt.to_element()
+        self.warp_options.dst_invgt = self.gt.to_element(inverse=True)
+
+    def _finish(self,
+                height: int = None,
+                width: int = None,
+                xRes: Union[int, float] = None,
+                yRes: Union[int, float] = None,
+                dstAlpha: bool = False,
+                tune: Union[bool, dict] = False) -> None:
+        """Method to apply output size/resolution, alpha band and block size, then write the GT and warp options back"""
         if height or width:
             if (height or width) and (xRes or yRes):
                 raise ValueError(
@@ -767,31 +1091,114 @@ class VRTWarpedDataset(VRTBase):
                 "@name": "DST_ALPHA_MAX",
                 "$": maxval[self.bitdepth] - 1
             })
-            self.warp_options.opts["Option"][0]["$"] = 0
+            self._writable("VRTDataset", "GDALWarpOptions", "Option",
+                           0)["$"] = 0
             self.warp_options.reset_nodata()
             self.filter_band_properties([
                 "ColorInterp", "@dataType", "@band", "@subClass",
                 "VRTRasterBand"
             ])
 
-        if min(self.blocksize) > max(self.xsize, self.ysize):
-            self.blocksize = [self.xsize, self.xsize]
+        if tune:
+            self.tune(**(tune if isinstance(tune, dict) else {}))
+        else:
+            (xblock, yblock) = self.blocksize
+            if xblock > self.xsize or yblock > self.ysize:
+                self.blocksize = [min(xblock, self.xsize), min(yblock, self.ysize)]
 
         self.update_gt()
         self.warp_options = self.warp_options.dumps()
 
-    def coords_to_pix(self, x: float, y: float, z: float = None) -> tuple:
-        """"""
+    def tune(self, memory: int = DEFAULT_MEMORY, threads: int = None, scale: float = None) -> WarpTuning:
+        """
+        Method to set the block size, WarpMemoryLimit and NUM_THREADS/SOURCE_EXTRA options for the current output size,
+        bands, data type and resampling algorithm (see `tune_warp`).  `scale` (destination over source resolution) is
+        read from the geotransforms unless the warp reprojects.
+        """
+        if scale is None:
+            scale = 1.0
+            if "ReprojectTransformer" not in self.warp_options.proj_transformer:
+                scale = abs(self.xres / GeoTransform(self.warp_options.src_gt).xres)
+        tuning = tune_warp(self.xsize, self.ysize, self.bands, self.bitdepth, self.warp_options.resample, memory,
+                           threads, scale)
+        self.blocksize = tuning.blocksize
+        self.warp_options.warp_memory_limit = tuning.warp_memory_limit
+        for (name, value) in tuning.options.items():
+            self.warp_options.set_option(name, value)
+        if "SOURCE_EXTRA" not in tuning.options:
+            self.warp_options.remove_option("SOURCE_EXTRA")
+        return tuning
+
+    async def awarp(self, executor=None, **kwargs) -> None:
+        """
+        Method to warp without blocking the event loop.  `dstSRS` is resolved with `awkt` and a clipper file is read in
+        `executor` before the warp itself runs there.
+        """
+        loop = asyncio.get_running_loop()
+        if kwargs.get("dstSRS"):
+            await awkt(kwargs["dstSRS"], executor=executor)
+        if type(kwargs.get("clipper")) is str:
+            # Parse the file into the clipper cache, where warp finds it
+            await loop.run_in_executor(executor, clipper_cache.load, kwargs["clipper"])
+        await loop.run_in_executor(executor, functools.partial(self.warp, **kwargs))
+
+    def derive(self, **kwargs):
+        """Method to warp a copy-on-write clone, leaving this VRT untouched"""
+        other = self.clone()
+        other.warp(**kwargs)
+        return other
+
+    def coords_to_pix(self, x, y, z: float = None) -> tuple:
+        """Convert world coordinates (scalars or arrays) to pixel coordinates of the source raster"""
         gt = GeoTransform(self.data["VRTDataset"]["GeoTransform"]["$"])
-        return ((x - gt.tlx) / gt.xres, (gt.tly - y) / gt.yres)
+        return gt.world_to_pixel(x, y)
+
+
+def _warp_one(base: VRTWarpedDataset, job: tuple, finish: tuple) -> VRTWarpedDataset:
+    vrt = base.clone()
+    (cutline, bounds, vrt.cutline_stats) = job
+    vrt._cutline(cutline, bounds)
+    vrt._finish(*finish)
+    return vrt
+
+
+_worker_state = None
+
+
+def _warp_init(base: VRTWarpedDataset, finish: tuple) -> None:
+    global _worker_state
+    _worker_state = (base, finish)
+
+
+def _warp_job(job: tuple) -> VRTWarpedDataset:
+    (base, finish) = _worker_state
+    return _warp_one(base, job, finish)
 
 
 class WarpOpts:
     """Class for manipulating gdal.Warp options"""
 
-    def __init__(self, gdalwarp_opts):
-        self.opts = gdalwarp_opts
-        self.opts["Option"] = [self.opts["Option"]]
+    def __init__(self, gdalwarp_opts, owner: VRTBase = None):
+        # When bound to a VRTWarpedDataset, options are read from and written through the owner so copy-on-write clones
+        # never modify each other's options
+        self.__opts = gdalwarp_opts
+        self.owner = owner
+        if not isinstance(self.opts["Option"], list):
+            self._writable()["Option"] = [self.opts["Option"]]
+
+    @property
+    def opts(self):
+        if self.owner is None:
+            return self.__opts
+        return self.owner.data["VRTDataset"]["GDALWarpOptions"]
+
+    def _writable(self, *path):
+        if self.owner is None:
+            node = self.opts
+            for key in path:
+                node = node[key]
+            return node
+        return self.owner._writable("VRTDataset", "GDALWarpOptions", *path)
 
     @property
     def warp_memory_limit(self):
@@ -799,7 +1206,7 @@ class WarpOpts:
 
     @warp_memory_limit.setter
     def warp_memory_limit(self, value: Union[int, float]) -> None:
-        self.opts["WarpMemoryLimit"]["$"] = value
+        self._writable("WarpMemoryLimit")["$"] = value
 
     @property
     def resample(self):
@@ -807,7 +1214,7 @@ class WarpOpts:
 
     @resample.setter
     def resample(self, value: str) -> None:
-        self.opts["ResampleAlg"]["$"] = value
+        self._writable("ResampleAlg")["$"] = value
 
     @property
     def reproject_transformer(self):
@@ -818,10 +1225,10 @@ class WarpOpts:
 
     @reproject_transformer.setter
     def reproject_transformer(self, d: dict) -> None:
-        self.opts["Transformer"]["ApproxTransformer"]["BaseTransformer"][
-            "GenImgProjTransformer"].update({
-                "ReprojectTransformer": d
-            })
+        self._writable("Transformer", "ApproxTransformer", "BaseTransformer",
+                       "GenImgProjTransformer").update({
+                           "ReprojectTransformer": d
+                       })
 
     @property
     def proj_transformer(self):
@@ -838,8 +1245,8 @@ class WarpOpts:
 
     @dst_gt.setter
     def dst_gt(self, value: str) -> None:
-        self.opts["Transformer"]["ApproxTransformer"]["BaseTransformer"][
-            "GenImgProjTransformer"]["DstGeoTransform"]["$"] = value
+        self._writable("Transformer", "ApproxTransformer", "BaseTransformer",
+                       "GenImgProjTransformer", "DstGeoTransform")["$"] = value
 
     @property
     def dst_invgt(self):
@@ -847,8 +1254,8 @@ class WarpOpts:
 
     @dst_invgt.setter
     def dst_invgt(self, value: str) -> None:
-        self.opts["Transformer"]["ApproxTransformer"]["BaseTransformer"][
-            "GenImgProjTransformer"]["DstInvGeoTransform"]["$"] = value
+        self._writable("Transformer", "ApproxTransformer", "BaseTransformer",
+                       "GenImgProjTransformer", "DstInvGeoTransform")["$"] = value
 
     @property
     def cutline(self):
@@ -856,7 +1263,7 @@ class WarpOpts:
 
     @cutline.setter
     def cutline(self, value: str) -> None:
-        self.opts.update({"Cutline": {"$": value}})
+        self._writable().update({"Cutline": {"$": value}})
 
     @property
     def alphaband(self):
@@ -864,13 +1271,34 @@ class WarpOpts:
 
     @alphaband.setter
     def alphaband(self, value: int) -> None:
-        self.opts.update({"DstAlphaBand": {"$": value}})
+        self._writable().update({"DstAlphaBand": {"$": value}})
 
     def add_option(self, option: dict) -> None:
-        self.opts["Option"].append(option)
+        self._writable("Option").append(option)
+
+    def option(self, name: str):
+        """Value of the warp option `name`, or None if it isn't set"""
+        for option in self.opts["Option"]:
+            if option["@name"] == name:
+                return option["$"]
+        return None
+
+    def set_option(self, name: str, value) -> None:
+        """Set the warp option `name`, replacing its value if it is already set"""
+        for (i, option) in enumerate(self.opts["Option"]):
+            if option["@name"] == name:
+                self._writable("Option", i)["$"] = value
+                return
+        self.add_option({"@name": name, "$": value})
+
+    def remove_option(self, name: str) -> None:
+        options = self.opts["Option"]
+        if any(option["@name"] == name for option in options):
+            self._writable()["Option"] = [option for option in options if option["@name"] != name]
 
     def reset_nodata(self):
-        for band in self.opts["BandList"]["BandMapping"]:
+        for i in range(len(self.opts["BandList"]["BandMapping"])):
+            band = self._writable("BandList", "BandMapping", i)
             del (band["DstNoDataReal"])
             del (band["DstNoDataImag"])
 
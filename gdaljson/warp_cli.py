@@ -1,64 +1,70 @@
 import click
 from gdaljson import VRTWarpedDataset
+from gdaljson.batch import collect_inputs, report, run_batch, warp_file
 
 
-@click.command()
-@click.argument("infile", type=click.File("r"), help="Input .VRT file")
-@click.argument("outfile", type=click.File("wb"), help="Output .VRT file")
-@click.option("--dstsrs", type=int, help="Output EPSG")
-@click.option(
-    "--cutline",
-    type=click.Path(exists=True),
-    help="Geojson file containing geojson feature in same SRS as raster")
-@click.option(
-    "--croptocutline",
-    help="Crop the output raster's extent to that of the cutline",
-    type=bool,
-)
-@click.option(
-    "--height",
-    help="Override height of output raster in # of pixels",
-    type=int)
-@click.option(
-    "--width",
-    help="Override width of output raster in # of pixels",
-    type=int)
-@click.option(
-    "--xres",
-    help="Override x-resolution of output raster",
-    type=(float, int))
-@click.option(
-    "--yres",
-    help="Override y-resolution of output raster",
-    type=(float, int))
-@click.option(
-    "--dstalpha",
-    help="Add an alpha band to the output raster",
-    type=bool)
-@click.option(
-    "--resample",
-    default="NearestNeighbor",
-    help="Choose a resampling algorithm",
-    type=str,
-)
-def cli(
-        infile,
-        outfile,
-        dstsrs,
-        cutline,
-        croptocutline,
-        height,
-        width,
-        xres,
-        yres,
-        dstalpha,
-        resample,
-):
-    vrt = VRTWarpedDataset(infile.read())
-    vrt.warp(
+def warp_options(func):
+    """Options shared by the single-file and batch commands"""
+    options = [
+        click.option("--dstsrs", type=int, help="Output EPSG"),
+        click.option(
+            "--cutline",
+            type=click.Path(exists=True),
+            help="Geojson file containing geojson feature in same SRS as raster"),
+        click.option(
+            "--croptocutline",
+            help="Crop the output raster's extent to that of the cutline",
+            type=bool,
+        ),
+        click.option(
+            "--optimizecutline",
+            help="Clip, simplify and round the cutline before embedding it",
+            type=bool,
+        ),
+        click.option(
+            "--tune",
+            help="Choose the block size, warp memory limit and threads for the output",
+            type=bool,
+        ),
+        click.option(
+            "--height",
+            help="Override height of output raster in # of pixels",
+            type=int),
+        click.option(
+            "--width",
+            help="Override width of output raster in # of pixels",
+            type=int),
+        click.option(
+            "--xres",
+            help="Override x-resolution of output raster",
+            type=float),
+        click.option(
+            "--yres",
+            help="Override y-resolution of output raster",
+            type=float),
+        click.option(
+            "--dstalpha",
+            help="Add an alpha band to the output raster",
+            type=bool),
+        click.option(
+            "--resample",
+            default="NearestNeighbor",
+            help="Choose a resampling algorithm",
+            type=str,
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def warp_kwargs(dstsrs, cutline, croptocutline, optimizecutline, tune, height, width, xres, yres, dstalpha, resample):
+    return dict(
         dstSRS=dstsrs,
         clipper=cutline,
         cropToCutline=croptocutline,
+        optimizeCutline=optimizecutline,
+        tune=tune,
         height=height,
         width=width,
         xRes=xres,
@@ -66,4 +72,25 @@ def cli(
         dstAlpha=dstalpha,
         resample=resample,
     )
+
+
+@click.command()
+@click.argument("infile", type=click.File("r"))
+@click.argument("outfile", type=click.File("wb"))
+@warp_options
+def cli(infile, outfile, **kwargs):
+    """Warp INFILE (.vrt) to OUTFILE (.vrt)"""
+    vrt = VRTWarpedDataset(infile.read())
+    vrt.warp(**warp_kwargs(**kwargs))
     vrt.to_xml(outfile)
+
+
+@click.command()
+@click.argument("source")
+@click.argument("outdir", type=click.Path(file_okay=False))
+@click.option("--workers", "-w", type=int, help="Number of worker processes")
+@warp_options
+def batch_cli(source, outdir, workers, **kwargs):
+    """Warp every VRT in SOURCE (directory, glob or manifest file) into OUTDIR"""
+    result = run_batch(warp_file, collect_inputs(source), outdir, workers=workers, **warp_kwargs(**kwargs))
+    report(result)
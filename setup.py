@@ -12,10 +12,13 @@ setup(
     author_email="geospatialjeff@gmail.com",
     packages=find_packages(exclude=["tests"]),
     install_requires=requirements,
+    extras_require={"fast": ["orjson"]},
     entry_points={
         "console_scripts": [
             "warp=gdaljson.warp_cli:cli",
             "translate=gdaljson.translate_cli:cli",
+            "warp-batch=gdaljson.warp_cli:batch_cli",
+            "translate-batch=gdaljson.translate_cli:batch_cli",
         ]
     },
 )
@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+import os
+import tempfile
+import time
+
+import gdaljson
+from gdaljson import VRTDataset, VRTWarpedDataset
+from gdaljson.projection import CRSRegistry
+
+
+class AsyncTestCases(unittest.TestCase):
+    """
+    Testing the asyncio entry points
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        self.paths = {name: os.path.join(templates, f"{name}.vrt") for name in ("translate", "warped")}
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_aload(self):
+        translate = asyncio.run(gdaljson.aload(self.paths["translate"]))
+        warped = asyncio.run(gdaljson.aload(self.paths["warped"], lazy=True))
+        self.assertIs(type(translate), VRTDataset)
+        self.assertIs(type(warped), VRTWarpedDataset)
+        with open(self.paths["translate"]) as vrtfile:
+            self.assertEqual(translate.to_bytes(), VRTDataset(vrtfile.read()).to_bytes())
+
+    def test_awarp(self):
+        kwargs = {"dstSRS": 32611, "clipper": self.clipper, "cropToCutline": True}
+
+        async def run():
+            vrts = [await gdaljson.aload(self.paths["warped"]) for _ in range(4)]
+            await asyncio.gather(*[vrt.awarp(**kwargs) for vrt in vrts])
+            outfile = os.path.join(self.tmpdir.name, "out.vrt")
+            await gdaljson.awrite(vrts[0], outfile)
+            return (vrts, outfile)
+
+        (vrts, outfile) = asyncio.run(run())
+        with open(self.paths["warped"]) as vrtfile:
+            expected = VRTWarpedDataset(vrtfile.read())
+        expected.warp(**kwargs)
+        for vrt in vrts:
+            self.assertEqual(vrt.to_bytes(), expected.to_bytes())
+        with open(outfile, "rb") as f:
+            self.assertEqual(f.read(), expected.to_bytes())
+
+    def test_atranslate(self):
+        vrt = asyncio.run(gdaljson.aload(self.paths["translate"]))
+        asyncio.run(vrt.atranslate(srcWin=[0, 0, 100, 100]))
+        self.assertEqual(vrt.shape, (100, 100, 4))
+
+    def test_coalesced_lookups(self):
+        registry = CRSRegistry(network=False)
+        resolved = []
+
+        def slow_local(epsg):
+            # Keep the lookup in flight until every coroutine has asked for it
+            time.sleep(0.2)
+            resolved.append(epsg)
+            return CRSRegistry._local(epsg)
+
+        registry._local = slow_local
+
+        async def run():
+            return await asyncio.gather(*[registry.aresolve(32611) for _ in range(10)])
+
+        results = asyncio.run(run())
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(resolved, [32611])
+        self.assertEqual(registry.stats["local_hits"], 1)
+        self.assertEqual(registry.stats["coalesced"], 9)
+        self.assertEqual(registry.stats["memory_misses"], 1)
+        asyncio.run(registry.aresolve(32611))
+        self.assertEqual(registry.stats["memory_hits"], 1)
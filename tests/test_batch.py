@@ -0,0 +1,77 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from click.testing import CliRunner
+
+from gdaljson import VRTDataset
+from gdaljson.batch import collect_inputs, run_batch, translate_file
+from gdaljson import translate_cli, warp_cli
+
+
+class BatchTestCases(unittest.TestCase):
+    """
+    Testing batch mode of the console scripts
+    """
+
+    def setUp(self):
+        self.templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.tmpdir = tempfile.mkdtemp()
+        self.indir = os.path.join(self.tmpdir, "in")
+        os.mkdir(self.indir)
+        for name in ("translate", "warped"):
+            for i in range(3):
+                shutil.copy(os.path.join(self.templates, f"{name}.vrt"),
+                            os.path.join(self.indir, f"{name}_{i}.vrt"))
+        with open(os.path.join(self.indir, "broken.vrt"), "w") as broken:
+            broken.write("<VRTDataset>")
+        self.runner = CliRunner()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_collect_inputs(self):
+        self.assertEqual(len(collect_inputs(self.indir)), 7)
+        self.assertEqual(len(collect_inputs(os.path.join(self.indir, "translate_*.vrt"))), 3)
+        manifest = os.path.join(self.indir, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("# inputs\ntranslate_0.vrt\n\nwarped_1.vrt\n")
+        self.assertEqual(collect_inputs(manifest),
+                         [os.path.join(self.indir, "translate_0.vrt"), os.path.join(self.indir, "warped_1.vrt")])
+
+    def test_translate_batch(self):
+        outdir = os.path.join(self.tmpdir, "out")
+        source = os.path.join(self.indir, "translate_*.vrt")
+        result = self.runner.invoke(translate_cli.batch_cli, [source, outdir, "--srcwin", "0", "0", "100", "100"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("3 succeeded, 0 failed", result.output)
+
+        with open(os.path.join(self.templates, "translate.vrt")) as vrtfile:
+            expected = VRTDataset(vrtfile.read())
+        expected.translate(srcWin=[0, 0, 100, 100])
+        with open(os.path.join(outdir, "translate_1.vrt"), "rb") as outfile:
+            self.assertEqual(outfile.read(), expected.to_bytes())
+
+    def test_failures_isolated(self):
+        outdir = os.path.join(self.tmpdir, "out")
+        result = self.runner.invoke(warp_cli.batch_cli,
+                                    [self.indir, outdir, "--workers", "2", "--xres", "0.001", "--yres", "0.001"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("3 succeeded, 4 failed", result.output)
+        self.assertEqual(sorted(os.listdir(outdir)), ["warped_0.vrt", "warped_1.vrt", "warped_2.vrt"])
+
+    def test_same_basename(self):
+        for name in ("a", "b"):
+            os.mkdir(os.path.join(self.indir, name))
+            shutil.copy(os.path.join(self.templates, "translate.vrt"), os.path.join(self.indir, name, "scene.vrt"))
+        manifest = os.path.join(self.indir, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("a/scene.vrt\nb/scene.vrt\nb/../b/scene.vrt\n")
+        outdir = os.path.join(self.tmpdir, "out")
+        result = run_batch(translate_file, collect_inputs(manifest), outdir, srcWin=[0, 0, 100, 100])
+        # Outputs keep their path relative to the inputs' common directory
+        self.assertTrue(os.path.isfile(os.path.join(outdir, "a", "scene.vrt")))
+        self.assertTrue(os.path.isfile(os.path.join(outdir, "b", "scene.vrt")))
+        self.assertEqual((result.processed, result.succeeded), (3, 2))
+        self.assertIn("Duplicate output", result.failures[0][1])
@@ -0,0 +1,73 @@
+import unittest
+import os
+
+import numpy as np
+
+from gdaljson import VRTDataset
+
+
+class BlockTestCases(unittest.TestCase):
+    """
+    Testing block counts and block-aligned windows of translate
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+        # A tiled (COG-like) source
+        for i in range(self.vrt.bands):
+            props = self.vrt.data["VRTDataset"]["VRTRasterBand"][i]["SimpleSource"]["SourceProperties"]
+            props["@BlockXSize"] = props["@BlockYSize"] = 256
+
+    def test_blocks_read(self):
+        self.assertEqual(self.vrt.blocksize, [256, 256])
+        self.assertEqual(self.vrt.blocks_read(), 9)
+        self.assertEqual(self.vrt.blocks_read([0, 0, 256, 256]), 1)
+        # A block-sized window straddling block boundaries reads 4 blocks
+        self.assertEqual(self.vrt.blocks_read([100, 100, 256, 256]), 4)
+        self.assertEqual(self.vrt.blocks_read([100, 100, 0, 256]), 0)
+        # Fractional windows count every block they touch
+        self.assertEqual(self.vrt.blocks_read([255.5, 0, 1, 1]), 2)
+        self.assertEqual(self.vrt.blocks_read([0.5, 0.5, 255, 255]), 1)
+        self.assertEqual(self.vrt.blocks_read([511, 511, 141, 111]), 4)
+        windows = self.vrt.tile_windows(256, overlap=56)
+        np.testing.assert_array_equal(self.vrt.blocks_read(windows)[:4], [1, 2, 2, 2])
+
+    def test_snap_window(self):
+        self.assertEqual(self.vrt.snap_window([100, 300, 256, 100]), [0, 256, 512, 256])
+        self.assertEqual(self.vrt.snap_window([100, 300, 256, 100], "align"), [0, 256, 256, 100])
+        # Clipped to the 652x622 source
+        self.assertEqual(self.vrt.snap_window([600, 500, 40, 100]), [512, 256, 140, 366])
+        # Aligned windows near the far edge are moved back inside the raster, keeping their size
+        self.assertEqual(self.vrt.snap_window([400, 400, 256, 256], "align"), [396, 366, 256, 256])
+        self.assertEqual(self.vrt.snap_window([650, 0, 2, 10], "align"), [650, 0, 2, 10])
+        self.assertEqual(self.vrt.snap_window([-10, -10, 100, 100], "align"), [0, 0, 100, 100])
+        self.assertEqual(self.vrt.snap_window([-10, -10, 100, 100]), [0, 0, 256, 256])
+        with self.assertRaises(ValueError):
+            self.vrt.snap_window([700, 0, 10, 10])
+        with self.assertRaises(ValueError):
+            self.vrt.snap_window([0, 0, 10, 10], "shrink")
+
+    def test_translate(self):
+        snapped = self.vrt.derive(srcWin=[100, 300, 256, 100], snap="expand")
+        self.assertEqual(snapped.src_rect, [0, 256, 512, 256])
+        self.assertEqual(snapped.dst_rect, [0, 0, 512, 256])
+        self.assertEqual((snapped.xsize, snapped.ysize), (512, 256))
+        self.assertEqual(snapped.blocks_read(), 2)
+        # The output grid follows the snapped window
+        plain = self.vrt.derive(srcWin=[0, 256, 512, 256])
+        self.assertEqual(snapped.data["VRTDataset"]["GeoTransform"], plain.data["VRTDataset"]["GeoTransform"])
+
+        # projWin is snapped after conversion to a srcWin
+        (xmin, xmax, ymin, ymax) = self.vrt.extent
+        projWin = [xmin + 100 * self.vrt.xres, ymax - 300 * self.vrt.yres, xmin + 356 * self.vrt.xres, ymin]
+        self.assertEqual(self.vrt.derive(projWin=projWin, snap="align").src_rect, [0, 256, 256, 322])
+
+        edge = self.vrt.derive(srcWin=[650, 600, 2, 22], snap="align")
+        self.assertEqual(edge.src_rect, [650, 512, 2, 22])
+        self.assertEqual((edge.xsize, edge.ysize), (2, 22))
+
+        # Deferred snapped translates are not fused
+        pipeline = self.vrt.deferred().translate(srcWin=[100, 300, 256, 100], snap="expand").translate(width=100)
+        self.assertEqual(len(pipeline.plan), 2)
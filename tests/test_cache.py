@@ -0,0 +1,89 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+from gdaljson.cache import DiskCache, MemoryCache, ResultCache
+
+
+class ResultCacheTestCases(unittest.TestCase):
+    """
+    Testing the translate/warp result cache
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.warped = VRTWarpedDataset(vrtfile.read())
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_memory(self):
+        cache = ResultCache(MemoryCache())
+        before = self.vrt.to_bytes()
+        first = cache.translate(self.vrt, srcWin=[0, 0, 100, 100])
+        # Equivalent parameters share an entry
+        second = cache.translate(self.vrt, srcWin=(0, 0, 100, 100), bandList=None, noData=None)
+        self.assertEqual(first, second)
+        self.assertEqual(self.vrt.to_bytes(), before)
+        self.assertEqual(first, self.vrt.derive(srcWin=[0, 0, 100, 100]).to_bytes())
+        cache.translate(self.vrt, srcWin=[0, 0, 50, 50])
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 2, "hit_rate": 1 / 3, "entries": 2})
+
+        # Different input documents never share an entry
+        self.vrt.nodata = 0
+        cache.translate(self.vrt, srcWin=[0, 0, 100, 100])
+        self.assertEqual(cache.stats["misses"], 3)
+
+    def test_warp_defaults(self):
+        cache = ResultCache()
+        cache.warp(self.warped, clipper=self.clipper, cropToCutline=True)
+        cache.warp(self.warped, clipper=self.clipper, cropToCutline=True, resample="NearestNeighbour", densifyPts=21)
+        self.assertEqual(cache.stats["hits"], 1)
+
+    def test_memory_eviction(self):
+        backend = MemoryCache(max_bytes=10)
+        backend.set("a", b"12345")
+        backend.set("b", b"12345")
+        backend.get("a")
+        backend.set("c", b"123")
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), b"12345")
+        self.assertEqual(backend.nbytes, 8)
+
+    def test_disk(self):
+        path = os.path.join(self.tmpdir.name, "results")
+        cache = ResultCache(DiskCache(path))
+        digest = cache.digest(self.vrt)
+        first = cache.translate(self.vrt, digest=digest, bandList=[1, 2])
+        # A new process (cache instance) reuses the stored result
+        cache = ResultCache(DiskCache(path))
+        self.assertEqual(cache.translate(self.vrt, bandList=[1, 2]), first)
+        self.assertEqual(cache.stats["hit_rate"], 1.0)
+
+        backend = DiskCache(path, max_bytes=len(first) + 1)
+        cache = ResultCache(backend)
+        cache.translate(self.vrt, bandList=[1])
+        self.assertEqual(len(backend), 1)
+
+        # A hit whose file is evicted between the read and the recency update
+        backend = DiskCache(path)
+        backend.set("a" * 64, b"value")
+        with mock.patch("gdaljson.cache.os.utime", side_effect=FileNotFoundError):
+            self.assertEqual(backend.get("a" * 64), b"value")
+
+    def test_path_params(self):
+        path = os.path.join(self.tmpdir.name, "Bilinear")
+        with open(path, "w") as f:
+            f.write("not a resampling algorithm")
+        # Only parameters documented as paths are keyed by file content
+        params = ResultCache.params(self.vrt, "translate", {"resampleAlg": path})
+        self.assertEqual(params["resampleAlg"], path)
+        params = ResultCache.params(self.warped, "warp", {"clipper": path})
+        self.assertIn("file", params["clipper"])
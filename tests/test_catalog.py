@@ -0,0 +1,110 @@
+import unittest
+import os
+import tempfile
+
+from shapely.geometry import Point
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+from gdaljson.catalog import Catalog, read_header
+
+
+class CatalogTestCases(unittest.TestCase):
+    """
+    Testing the spatial footprint catalog
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+        self.tiles = {}
+        for (i, tile) in enumerate(self.vrt.tiles(256)):
+            path = os.path.join(self.tmpdir.name, f"tile_{i}.vrt")
+            tile.to_xml(path)
+            self.tiles[path] = tile
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            warped = VRTWarpedDataset(vrtfile.read())
+        warped.warp(dstSRS=32611)
+        self.utm = os.path.join(self.tmpdir.name, "utm.vrt")
+        warped.to_xml(self.utm)
+        self.catalog = Catalog(os.path.join(self.tmpdir.name, "catalog.sqlite"))
+        self.catalog.add(list(self.tiles) + [self.utm])
+
+    def tearDown(self):
+        self.catalog.close()
+        self.tmpdir.cleanup()
+
+    def test_read_header(self):
+        for (path, tile) in self.tiles.items():
+            with open(path, "rb") as vrtfile:
+                header = read_header(vrtfile.read())
+            self.assertEqual(header.extent, tile.extent)
+            self.assertEqual(header.geogname, tile.geogname)
+            self.assertEqual(header.epsg, "4326")
+
+    def test_bbox_query(self):
+        self.assertEqual(len(self.catalog), 10)
+        first = min(self.tiles, key=lambda p: int(p.split("_")[-1][:-4]))
+        extent = self.tiles[first].extent
+        # A box inside the top left tile also hits the utm footprint, which covers the whole image
+        bbox = [extent[0] + 1e-4, extent[0] + 2e-4, extent[3] - 2e-4, extent[3] - 1e-4]
+        hits = self.catalog.query(bbox=bbox)
+        self.assertEqual(sorted(hit.path for hit in hits), sorted([first, self.utm]))
+        hit = [hit for hit in hits if hit.path == first][0]
+        self.assertEqual(hit.extent, extent)
+        self.assertEqual(hit.bands, 4)
+        self.assertEqual(hit.geogname, self.tiles[first].geogname)
+        self.assertEqual(self.catalog.query(bbox=[0, 1, 0, 1]), [])
+
+    def test_geometry_query(self):
+        # The corner shared by four tiles, plus the utm footprint
+        corner = Point(self.vrt.tlx + 256 * self.vrt.xres, self.vrt.tly - 256 * self.vrt.yres)
+        self.assertEqual(len(self.catalog.query(geometry=corner.buffer(1e-4))), 5)
+
+        utm = self.catalog.query(bbox=[-1e7, 1e7, -1e7, 1e7], epsg=32611)
+        self.assertEqual([hit.path for hit in utm], [self.utm])
+        self.assertEqual(utm[0].epsg, 32611)
+
+    def test_incremental(self):
+        self.assertEqual(self.catalog.add(self.utm), 0)
+        self.assertEqual(self.catalog.remove(self.utm), 1)
+        self.assertNotIn(self.utm, self.catalog)
+        self.assertEqual(self.catalog.query(bbox=[-1e7, 1e7, -1e7, 1e7], epsg=32611), [])
+
+        # Re-indexing a modified file replaces its entry
+        path = next(iter(self.tiles))
+        tile = self.tiles[path]
+        tile.tlx = tile.tlx + 10
+        tile.update_gt()
+        tile.to_xml(path)
+        os.utime(path, (0, 0))
+        self.assertEqual(self.catalog.add(path, update=True), 1)
+        self.assertEqual(len(self.catalog), 9)
+
+        # The index persists
+        self.catalog.close()
+        self.catalog = Catalog(self.catalog.path)
+        self.assertEqual(len(self.catalog), 9)
+        self.assertEqual(self.catalog.query(bbox=[tile.tlx, tile.tlx, tile.tly, tile.tly])[0].path, path)
+
+    def test_bad_files(self):
+        corrupt = os.path.join(self.tmpdir.name, "corrupt.vrt")
+        with open(corrupt, "w") as f:
+            f.write('<VRTDataset rasterXSize="10"')
+        missing = os.path.join(self.tmpdir.name, "missing.vrt")
+        catalog = Catalog()
+        paths = list(self.tiles)
+        self.assertEqual(catalog.add(paths[:3] + [corrupt] + paths[3:] + [missing]), len(paths))
+        self.assertEqual(len(catalog), len(paths))
+        self.assertEqual([path for (path, _) in catalog.failures], [corrupt, missing])
+        self.assertNotIn(corrupt, catalog)
+
+        # A file which became unreadable keeps its entry
+        with open(paths[0], "w") as f:
+            f.write("not xml")
+        os.utime(paths[0], (0, 0))
+        self.assertEqual(catalog.add(paths[0], update=True), 0)
+        self.assertIn(paths[0], catalog)
+        self.assertEqual(len(catalog.failures), 1)
+        catalog.close()
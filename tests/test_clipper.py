@@ -0,0 +1,142 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+from shapely.geometry import MultiPolygon, box, mapping
+from shapely.ops import unary_union
+
+from gdaljson import VRTWarpedDataset
+from gdaljson.clipper import Clipper, ClipperCache, clipper_cache, load_clipper
+
+
+class ClipperCacheTestCases(unittest.TestCase):
+    """
+    Testing the clipper geometry cache
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.clipper = os.path.join(self.tmpdir.name, "clipper.geojson")
+        shutil.copy(os.path.join(templates, "clipper.geojson"), self.clipper)
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.vrt = VRTWarpedDataset(vrtfile.read())
+        self.cache = ClipperCache(maxsize=4)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_files(self):
+        geom = self.cache.load(self.clipper)
+        self.assertIs(self.cache.load(self.clipper), geom)
+        self.assertTrue(geom.equals(load_clipper(self.clipper)))
+        self.assertEqual((self.cache.stats["hits"], self.cache.stats["misses"]), (1, 1))
+
+        # Editing the file invalidates its entry
+        with open(self.clipper) as f:
+            feature = json.load(f)
+        feature["geometry"]["coordinates"][0] = feature["geometry"]["coordinates"][0][::-1]
+        with open(self.clipper, "w") as f:
+            json.dump(feature, f)
+        os.utime(self.clipper, ns=(0, 0))
+        self.assertIsNot(self.cache.load(self.clipper), geom)
+        self.assertEqual(self.cache.stats["misses"], 2)
+
+    def test_content(self):
+        with open(self.clipper) as f:
+            feature = json.load(f)
+        geom = self.cache.load(feature)
+        self.assertIs(self.cache.load(json.loads(json.dumps(feature))), geom)
+        other = dict(feature, properties={"name": "other"})
+        self.assertIsNot(self.cache.load(other), geom)
+        # Arrays are hashed in full, not by their (truncated) repr
+        ring = np.zeros((2000, 2))
+        changed = ring.copy()
+        changed[1000] = 1
+        self.assertNotEqual(self.cache.key({"type": "LineString", "coordinates": ring}),
+                            self.cache.key({"type": "LineString", "coordinates": changed}))
+        self.assertIsNone(self.cache.key({"type": "Polygon", "coordinates": object()}))
+
+        projected = self.cache.projected(feature, 4326, 3857)
+        self.assertIs(self.cache.projected(feature, 4326, 3857), projected)
+        self.assertIsNot(self.cache.projected(feature, 4326, 32611), projected)
+        self.assertEqual((self.cache.stats["projected_hits"], self.cache.stats["projected_misses"]), (1, 2))
+
+        # Disabled
+        cache = ClipperCache(maxsize=0)
+        self.assertIsNot(cache.load(feature), cache.load(feature))
+        self.assertEqual(cache.stats["entries"], 0)
+
+    def test_warp(self):
+        clipper_cache.clear()
+        first = self.vrt.derive(dstSRS=3857, clipper=self.clipper, cropToCutline=True)
+        second = self.vrt.derive(dstSRS=3857, clipper=self.clipper, cropToCutline=True)
+        self.assertEqual(first.to_bytes(), second.to_bytes())
+        # Each warp looks the clipper up once, to embed it and crop to its reprojected bounds
+        self.assertEqual((clipper_cache.stats["hits"], clipper_cache.stats["misses"]), (1, 1))
+        self.assertEqual((clipper_cache.stats["projected_hits"], clipper_cache.stats["projected_misses"]), (1, 1))
+
+    def test_edited_dict(self):
+        with open(self.clipper) as f:
+            feature = json.load(f)
+        first = self.vrt.derive(clipper=feature).warp_options.cutline
+        # Shrink the polygon in place, keeping it inside the raster
+        ring = np.array(feature["geometry"]["coordinates"][0])
+        center = ring[:-1].mean(axis=0)
+        feature["geometry"]["coordinates"][0] = (center + (ring - center) / 2).tolist()
+        second = self.vrt.derive(clipper=feature).warp_options.cutline
+        self.assertNotEqual(second, first)
+        self.assertEqual(second, self.vrt.derive(clipper=json.loads(json.dumps(feature))).warp_options.cutline)
+
+    def test_collections(self):
+        (xmin, xmax, ymin, ymax) = self.vrt.extent
+        # Round coordinates, which survive geojson parsing unchanged
+        inside = [box(-120.25, 36.1, -120.2, 36.15), box(-120.2, 36.15, -120.15, 36.2)]
+        far = [box(-110 + i, 40 + i, -109.5 + i, 40.5 + i) for i in range(200)]
+        collection = {
+            "type": "FeatureCollection",
+            "features": [{"type": "Feature", "properties": {}, "geometry": mapping(geom)} for geom in far + inside],
+        }
+        footprint = box(xmin, ymin, xmax, ymax)
+
+        # Only the intersecting features are unioned
+        geom = self.cache.load(collection, footprint)
+        self.assertTrue(geom.equals(unary_union(inside)))
+        self.assertTrue(self.cache.load(collection).equals(unary_union(far + inside)))
+        self.assertTrue(load_clipper(MultiPolygon(far + inside), footprint).equals(geom))
+        self.assertTrue(load_clipper(collection, box(0, 0, 0.1, 0.1)).is_empty)
+
+        warped = self.vrt.derive(clipper=collection, cropToCutline=True)
+        expected = self.vrt.derive(clipper=unary_union(inside), cropToCutline=True)
+        self.assertEqual(warped.to_bytes(), expected.to_bytes())
+        outside = {"type": "FeatureCollection", "features": collection["features"][:10]}
+        for crop in (True, False):
+            with self.assertRaises(ValueError):
+                self.vrt.derive(clipper=outside, cropToCutline=crop)
+
+        # The selection is made once per warp, and reprojected bounds are those of the selection
+        calls = []
+        select = Clipper.select
+        with mock.patch.object(Clipper, "select", lambda *args: calls.append(args) or select(*args)):
+            warped = self.vrt.derive(dstSRS=3857, clipper=collection, cropToCutline=True)
+        self.assertEqual(len(calls), 1)
+        expected = self.vrt.derive(dstSRS=3857, clipper=unary_union(inside), cropToCutline=True)
+        self.assertEqual(warped.to_bytes(), expected.to_bytes())
+        # ... without computing the union of the whole collection
+        self.assertIsNone(clipper_cache.get(collection)._geom)
+
+        # A single feature outside the raster
+        for clipper in ({"type": "FeatureCollection", "features": collection["features"][:1]}, far[0]):
+            with self.assertRaises(ValueError):
+                self.vrt.derive(clipper=clipper)
+            with self.assertRaises(ValueError):
+                list(self.vrt.warp_many([clipper]))
+
+        # warp_many selects parts like warp
+        multi = MultiPolygon(far + inside)
+        (warped, ) = self.vrt.warp_many([multi], dstSRS=3857, cropToCutline=True)
+        self.assertEqual(warped.to_bytes(), self.vrt.derive(dstSRS=3857, clipper=multi, cropToCutline=True).to_bytes())
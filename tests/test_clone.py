@@ -0,0 +1,66 @@
+import unittest
+import os
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+
+
+class CloneTestCases(unittest.TestCase):
+    """
+    Testing copy-on-write clones
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        self.vrts = {}
+        for name in ("translate", "warped"):
+            with open(os.path.join(templates, f"{name}.vrt")) as vrtfile:
+                self.vrts[name] = vrtfile.read()
+
+    def test_clone_translate(self):
+        vrt = VRTDataset(self.vrts["translate"])
+        before = vrt.to_bytes()
+        derived = vrt.derive(srcWin=[10, 10, 100, 100], bandList=[1, 3])
+        self.assertEqual(vrt.to_bytes(), before)
+        self.assertEqual(derived.shape, (100, 100, 2))
+        self.assertEqual(derived.src_rect, [10, 10, 100, 100])
+
+        expected = VRTDataset(self.vrts["translate"])
+        expected.translate(srcWin=[10, 10, 100, 100], bandList=[1, 3])
+        self.assertEqual(derived.to_bytes(), expected.to_bytes())
+
+    def test_clone_shares_untouched(self):
+        vrt = VRTDataset(self.vrts["translate"])
+        derived = vrt.derive(srcWin=[0, 0, 50, 50])
+        original_band = vrt.get_band(1)
+        derived_band = derived.get_band(1)
+        self.assertIsNot(original_band, derived_band)
+        self.assertIs(original_band["ColorInterp"], derived_band["ColorInterp"])
+        self.assertIs(vrt.data["VRTDataset"]["SRS"], derived.data["VRTDataset"]["SRS"])
+
+    def test_original_writes(self):
+        vrt = VRTDataset(self.vrts["translate"])
+        clone = vrt.clone()
+        vrt.translate(srcWin=[0, 0, 50, 50])
+        self.assertEqual(clone.shape[:2], (652, 622))
+        self.assertEqual(clone.src_rect, [0, 0, 652, 622])
+        self.assertEqual(clone.to_bytes(), VRTDataset(self.vrts["translate"]).to_bytes())
+
+    def test_clone_warp(self):
+        vrt = VRTWarpedDataset(self.vrts["warped"])
+        before = vrt.to_bytes()
+        derived = vrt.derive(clipper=self.clipper, cropToCutline=True, dstAlpha=True)
+        self.assertEqual(vrt.to_bytes(), before)
+        self.assertEqual(derived.bands, vrt.bands + 1)
+        self.assertIn("Cutline", derived.data["VRTDataset"]["GDALWarpOptions"])
+        self.assertNotIn("Cutline", vrt.data["VRTDataset"]["GDALWarpOptions"])
+
+        expected = VRTWarpedDataset(self.vrts["warped"])
+        expected.warp(clipper=self.clipper, cropToCutline=True, dstAlpha=True)
+        self.assertEqual(derived.to_bytes(), expected.to_bytes())
+
+    def test_lazy_clone(self):
+        vrt = VRTDataset(self.vrts["translate"], lazy=True)
+        derived = vrt.derive(srcWin=[10, 10, 100, 100])
+        self.assertEqual(vrt.src_rect, [0, 0, 652, 622])
+        self.assertEqual(derived.src_rect, [10, 10, 100, 100])
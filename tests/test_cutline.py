@@ -0,0 +1,69 @@
+import unittest
+import os
+
+import shapely
+from shapely.geometry import Point, mapping
+
+from gdaljson import VRTWarpedDataset, instrument
+from gdaljson.clipper import optimize_cutlines
+
+
+class CutlineTestCases(unittest.TestCase):
+    """
+    Testing cutline optimization
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.vrt = VRTWarpedDataset(vrtfile.read())
+        # A finely segmented circle centered on the left edge, so half of it lies outside the raster
+        (xmin, xmax, ymin, ymax) = self.vrt.extent
+        geom = Point(xmin, (ymin + ymax) / 2).buffer((xmax - xmin) * 0.6, quad_segs=500)
+        self.clipper = {"type": "Feature", "properties": {}, "geometry": mapping(geom)}
+
+    def test_optimize_cutlines(self):
+        # Vertices far outside a 60x60 raster, and a nearly straight edge inside it
+        edge = [(x + 0.123456, 10 + 0.01 * (x % 2)) for x in range(10, 50)]
+        geom = shapely.Polygon([(-100, -100), (100, -100), (100, 10)] + edge[::-1] + [(-100, 10)])
+        ([cutline], [stats]) = optimize_cutlines([geom], 60, 60, margin=1, tolerance=0.25, precision=2)
+        self.assertEqual(cutline, "POLYGON ((-1 -1, -1 10, 61 10.01, 61 -1, -1 -1))")
+        self.assertEqual((stats.bytes_before, stats.bytes_after), (len(geom.wkt), len(cutline)))
+        self.assertEqual((stats.vertices_before, stats.vertices_after), (45, 5))
+        self.assertEqual(stats.vertices_removed, 40)
+
+    def test_invalid_result(self):
+        # A sliver which collapses to a line once rounded to 2 decimals is kept as it was
+        sliver = shapely.Polygon([(5, 5), (30, 5.001), (55, 5), (30, 5.003)])
+        square = shapely.box(10.123456, 10.123456, 20.123456, 20.123456)
+        ([kept, cutline], [stats, _]) = optimize_cutlines([sliver, square], 60, 60, precision=2)
+        self.assertEqual(kept, shapely.to_wkt(sliver, rounding_precision=-1))
+        self.assertTrue(shapely.from_wkt(kept).is_valid)
+        self.assertEqual((stats.vertices_removed, stats.bytes_after), (0, stats.bytes_before))
+        self.assertEqual(cutline, "POLYGON ((20.12 10.12, 20.12 20.12, 10.12 20.12, 10.12 10.12, 20.12 10.12))")
+
+    def test_warp(self):
+        plain = self.vrt.derive(clipper=self.clipper, cropToCutline=True)
+        self.assertIsNone(plain.cutline_stats)
+        with instrument.Collector() as collector:
+            optimized = self.vrt.derive(clipper=self.clipper, cropToCutline=True, optimizeCutline=True)
+        stats = optimized.cutline_stats
+        self.assertEqual(stats.bytes_before, len(plain.warp_options.cutline))
+        self.assertEqual(stats.bytes_after, len(optimized.warp_options.cutline))
+        self.assertGreater(stats.vertices_removed, stats.vertices_after)
+        self.assertEqual(len(plain.to_bytes()) - len(optimized.to_bytes()), stats.bytes_removed)
+        self.assertEqual(collector.stats["warp.cutline"]["counters"]["bytes_removed"], stats.bytes_removed)
+
+        # Only the cutline changes, and it still covers the same pixels to within the tolerance
+        self.assertEqual([plain.xsize, plain.ysize, plain.gt.gt], [optimized.xsize, optimized.ysize, optimized.gt.gt])
+        raster = shapely.box(0, 0, self.vrt.xsize, self.vrt.ysize)
+        before = shapely.from_wkt(plain.warp_options.cutline).intersection(raster)
+        after = shapely.from_wkt(optimized.warp_options.cutline).intersection(raster)
+        self.assertLess(before.symmetric_difference(after).area, before.length * 0.25)
+
+    def test_warp_many(self):
+        options = {"tolerance": 0.5, "precision": 1}
+        [clone] = self.vrt.warp_many([self.clipper], dstSRS=3857, cropToCutline=True, optimizeCutline=options)
+        expected = self.vrt.derive(clipper=self.clipper, dstSRS=3857, cropToCutline=True, optimizeCutline=options)
+        self.assertEqual(clone.to_bytes(), expected.to_bytes())
+        self.assertEqual(clone.cutline_stats, expected.cutline_stats)
@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon, MultiPolygon
+from shapely.ops import transform as transform_geom
+
+from gdaljson.vrt import GeoTransform
+
+
+class GeoTransformTestCases(unittest.TestCase):
+    """
+    Testing vectorized world to pixel conversion
+    """
+
+    def setUp(self):
+        self.gt = GeoTransform("-120.33027767128185,0.00032055500732212287,0.0,36.22815613923612,0.0,-0.00032055500732212287")
+        ring = [(-120.3 + 0.01 * np.cos(a), 36.1 + 0.01 * np.sin(a)) for a in np.linspace(0, 2 * np.pi, 500)]
+        self.geom = MultiPolygon([Polygon(ring), Polygon([(x + 0.05, y) for (x, y) in ring])])
+
+    def test_matches_per_vertex_path(self):
+        gt = self.gt
+
+        def per_vertex(x, y, z=None):
+            return ((x - gt.tlx) / gt.xres, (gt.tly - y) / gt.yres)
+
+        self.assertEqual(gt.geometry_to_pixel(self.geom).wkt, transform_geom(per_vertex, self.geom).wkt)
+
+    def test_rotated(self):
+        gt = GeoTransform("100.0,2.0,0.5,200.0,0.25,-2.0")
+        px, py = np.array([0.0, 10.0, 3.5]), np.array([0.0, 7.0, 11.0])
+        x = gt.gt[0] + px * gt.gt[1] + py * gt.gt[2]
+        y = gt.gt[3] + px * gt.gt[4] + py * gt.gt[5]
+        rx, ry = gt.world_to_pixel(x, y)
+        np.testing.assert_allclose(rx, px, atol=1e-9)
+        np.testing.assert_allclose(ry, py, atol=1e-9)
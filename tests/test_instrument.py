@@ -0,0 +1,75 @@
+import unittest
+import io
+import os
+
+from gdaljson import VRTDataset, VRTWarpedDataset, instrument
+from gdaljson.transformations import loads
+
+
+class InstrumentTestCases(unittest.TestCase):
+    """
+    Testing instrumentation spans
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.translate_xml = vrtfile.read()
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.warped_xml = vrtfile.read()
+
+    def test_disabled(self):
+        self.assertFalse(instrument.enabled())
+        self.assertIs(instrument.span("warp"), instrument.span("translate"))
+
+    def test_spans(self):
+        spans = []
+        callback = instrument.subscribe(spans.append)
+        try:
+            self.assertTrue(instrument.enabled())
+            vrt = VRTWarpedDataset(self.warped_xml)
+            vrt.warp(dstSRS=3857, clipper=self.clipper, cropToCutline=True)
+            vrt.to_xml(io.BytesIO())
+        finally:
+            instrument.unsubscribe(callback)
+        self.assertFalse(instrument.enabled())
+
+        names = [span.name for span in spans]
+        self.assertEqual(names, [
+            "loads", "init", "warp.crs_lookup", "warp.transformer", "warp.transform_extent", "warp.cutline",
+            "warp.finish", "warp", "to_xml"
+        ])
+        spans = {span.name: span for span in spans}
+        self.assertEqual(spans["loads"].parent, "init")
+        self.assertEqual(spans["warp.cutline"].parent, "warp")
+        self.assertIsNone(spans["warp"].parent)
+        self.assertEqual(spans["loads"].counters["bytes"], len(self.warped_xml.encode("utf-8")))
+        self.assertEqual(spans["warp"].counters["bands"], 4)
+        self.assertGreater(spans["warp.cutline"].counters["vertices"], 0)
+        self.assertEqual(spans["to_xml"].counters["bytes"], len(vrt.to_bytes()))
+        self.assertGreaterEqual(spans["warp"].duration, spans["warp.cutline"].duration)
+
+    def test_collector(self):
+        with instrument.Collector() as collector:
+            for _ in range(3):
+                VRTDataset(self.translate_xml).translate(srcWin=[0, 0, 10, 10], bandList=[1, 2])
+        self.assertFalse(instrument.enabled())
+        self.assertEqual(collector.stats["translate"]["count"], 3)
+        self.assertEqual(collector.stats["translate"]["counters"], {"bands": 6})
+        self.assertLessEqual(collector.stats["init"]["min"], collector.stats["init"]["max"])
+        self.assertIn("translate", collector.report())
+
+    def test_loads_bytes(self):
+        xml = '<VRTDataset><Description>Zürich</Description></VRTDataset>'
+        with instrument.Collector() as collector:
+            loads(xml)
+            loads(xml.encode("utf-8"))
+        self.assertEqual(collector.stats["loads"]["counters"]["bytes"], 2 * len(xml.encode("utf-8")))
+
+        # File objects are read before they are measured
+        with instrument.Collector() as collector:
+            data = loads(io.BytesIO(xml.encode("utf-8")), lazy=True)
+            VRTDataset(io.StringIO(self.translate_xml), lazy=True)
+        self.assertEqual(data, loads(xml))
+        self.assertEqual(collector.stats["loads"]["count"], 2)
@@ -0,0 +1,53 @@
+import unittest
+import io
+import os
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+from gdaljson import transformations
+
+
+class JSONTestCases(unittest.TestCase):
+    """
+    Testing the json load/store path
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.warped = VRTWarpedDataset(vrtfile.read())
+
+    def assertRoundTrip(self, vrt):
+        loaded = type(vrt).from_json(vrt.to_json())
+        self.assertEqual(loaded.data, vrt.data)
+        self.assertEqual(loaded.to_bytes(), vrt.to_bytes())
+        return loaded
+
+    def test_round_trip(self):
+        loaded = self.assertRoundTrip(self.vrt)
+        loaded.translate(srcWin=[10, 10, 100, 100], bandList=[3, 2, 1], noData=0)
+        self.vrt.translate(srcWin=[10, 10, 100, 100], bandList=[3, 2, 1], noData=0)
+        self.assertRoundTrip(self.vrt)
+        self.assertEqual(loaded.to_bytes(), self.vrt.to_bytes())
+
+        loaded = self.assertRoundTrip(self.warped)
+        loaded.warp(dstSRS=3857, clipper=self.clipper, cropToCutline=True)
+        self.warped.warp(dstSRS=3857, clipper=self.clipper, cropToCutline=True)
+        self.assertRoundTrip(self.warped)
+        self.assertEqual(loaded.to_bytes(), self.warped.to_bytes())
+        self.assertEqual(loaded.warp_options.opts, self.warped.warp_options.opts)
+
+    def test_lazy(self):
+        lazy = VRTDataset(self.vrt.to_bytes(), lazy=True)
+        self.assertEqual(VRTDataset.from_json(io.BytesIO(lazy.to_json())).data, self.vrt.data)
+
+    def test_stdlib_backend(self):
+        backend = transformations.orjson
+        transformations.orjson = None
+        try:
+            loaded = self.assertRoundTrip(self.warped)
+            self.assertEqual(VRTWarpedDataset.from_json(loaded.to_json().decode("utf-8")).data, self.warped.data)
+        finally:
+            transformations.orjson = backend
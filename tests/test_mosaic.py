@@ -0,0 +1,69 @@
+import unittest
+import io
+
+from gdaljson import VRTDataset
+from gdaljson.mosaic import MosaicSource, build_vrt, write_vrt
+from gdaljson.projection import wkt
+
+
+class MosaicTestCases(unittest.TestCase):
+    """
+    Testing the mosaic (buildvrt) builder
+    """
+
+    def setUp(self):
+        # A 3x2 grid of 256px tiles at 0.1 resolution, the last column at half resolution
+        self.sources = []
+        for col in range(3):
+            for row in range(2):
+                res = 0.2 if col == 2 else 0.1
+                size = 128 if col == 2 else 256
+                gt = [100 + col * 25.6, res, 0, 50 - row * 25.6, 0, -res]
+                self.sources.append(MosaicSource(f"tiles/{col}_{row}.tif", gt, size, size, 3, "UInt16", 0))
+
+    def test_grid(self):
+        vrt = build_vrt(self.sources, resolution="highest")
+        self.assertEqual((vrt.xsize, vrt.ysize), (768, 512))
+        self.assertEqual([vrt.tlx, vrt.xres, vrt.tly, vrt.yres], [100, 0.1, 50, 0.1])
+        self.assertEqual(vrt.bands, 3)
+        self.assertEqual(vrt.nodata, 0)
+
+        vrt = build_vrt(self.sources, resolution="lowest")
+        self.assertEqual((vrt.xsize, vrt.ysize), (384, 256))
+
+        with self.assertRaises(ValueError):
+            build_vrt(self.sources + [MosaicSource("other.tif", [0, 1, 0, 0, 0, -1], 10, 10)])
+
+    def test_sources(self):
+        vrt = build_vrt(self.sources, srs="EPSG:4326", resolution="highest", source_type="ComplexSource")
+        sources = vrt.data["VRTDataset"]["VRTRasterBand"][1]["ComplexSource"]
+        self.assertEqual(len(sources), 6)
+        last = sources[5]
+        self.assertEqual(last["SourceFilename"]["$"], "tiles/2_1.tif")
+        self.assertEqual(last["SourceFilename"]["@relativeToVRT"], 1)
+        self.assertEqual(last["SourceBand"]["$"], 2)
+        self.assertEqual([last["SrcRect"][k] for k in ("@xOff", "@yOff", "@xSize", "@ySize")], [0, 0, 128, 128])
+        self.assertEqual([last["DstRect"][k] for k in ("@xOff", "@yOff", "@xSize", "@ySize")], [512, 256, 256, 256])
+        self.assertEqual(last["NODATA"]["$"], 0)
+
+    def test_output(self):
+        srs = wkt(4326)
+        vrt = build_vrt(iter(self.sources), srs=srs)
+        outfile = io.BytesIO()
+        write_vrt([source._asdict() for source in self.sources], outfile, srs=srs)
+        self.assertEqual(outfile.getvalue(), vrt.to_bytes())
+        loaded = VRTDataset(outfile.getvalue())
+        self.assertEqual(loaded.epsg, "4326")
+        self.assertEqual(loaded.extent, vrt.extent)
+        self.assertEqual(loaded.to_bytes(), vrt.to_bytes())
+
+    def test_blocksize(self):
+        vrt = build_vrt(self.sources[:1])
+        self.assertEqual(vrt.blocksize, [256, 256])
+        self.assertEqual(vrt.blocks_read([0, 0, 256, 256]), 1)
+        tiled = [source._replace(blockxsize=64, blockysize=32) for source in self.sources]
+        vrt = build_vrt(tiled, resolution="highest")
+        self.assertEqual(vrt.blocksize, [64, 32])
+        self.assertEqual(vrt.blocks_read([60, 0, 8, 40]), 4)
+        props = vrt.data["VRTDataset"]["VRTRasterBand"][0]["SimpleSource"][5]["SourceProperties"]
+        self.assertEqual((props["@BlockXSize"], props["@BlockYSize"]), (64, 32))
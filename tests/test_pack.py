@@ -0,0 +1,66 @@
+import unittest
+import os
+import tempfile
+
+import numpy as np
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+from gdaljson.pack import PackFile, pack
+
+
+class PackTestCases(unittest.TestCase):
+    """
+    Testing the binary pack container
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "vrts.pack")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.warped = VRTWarpedDataset(vrtfile.read())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        reprojected = self.warped.clone()
+        reprojected.warp(dstSRS=3857, clipper=os.path.join(os.path.split(__file__)[0], "templates", "clipper.geojson"))
+        resized = self.vrt.derive(srcWin=[10, 10, 101, 99], width=37, noData=-1.5)
+        vrts = {"translate": self.vrt, "warped": self.warped, "reprojected": reprojected, "resized": resized}
+        self.assertEqual(pack(vrts, self.path), 4)
+        with PackFile(self.path) as vrtpack:
+            self.assertEqual(len(vrtpack), 4)
+            self.assertIn("warped", vrtpack)
+            for (name, vrt) in vrts.items():
+                loaded = vrtpack[name]
+                self.assertIs(type(loaded), type(vrt))
+                self.assertEqual(loaded.data, vrt.data)
+                self.assertEqual(loaded.to_bytes(), vrt.to_bytes())
+            self.assertEqual(vrtpack[-1].to_bytes(), resized.to_bytes())
+
+            # Decoded VRTs behave like parsed ones
+            loaded = vrtpack["warped"]
+            loaded.warp(dstSRS=3857, clipper=os.path.join(os.path.split(__file__)[0], "templates", "clipper.geojson"))
+            self.assertEqual(loaded.to_bytes(), reprojected.to_bytes())
+
+    def test_tiles(self):
+        tiles = list(self.vrt.tiles(128))
+        pack(tiles + [{"VRTDataset": {"GeoTransform": {"$": "0,1,0,0,0,-1"}, "x": [np.int64(-3), True, None]}}],
+             self.path)
+        self.assertLess(os.path.getsize(self.path), sum(len(tile.to_bytes()) for tile in tiles) / 2)
+        with PackFile(self.path) as vrtpack:
+            self.assertEqual([vrtpack[i].to_bytes() for i in range(len(tiles))], [tile.to_bytes() for tile in tiles])
+            self.assertEqual(vrtpack.data(len(tiles)),
+                             {"VRTDataset": {"GeoTransform": {"$": "0,1,0,0,0,-1"}, "x": [-3, True, None]}})
+            self.assertEqual(vrtpack.names, {})
+            with self.assertRaises(IndexError):
+                vrtpack.data(len(tiles) + 1)
+
+    def test_invalid(self):
+        with open(self.path, "wb") as f:
+            f.write(self.vrt.to_bytes())
+        with self.assertRaises(ValueError):
+            PackFile(self.path)
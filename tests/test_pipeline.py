@@ -0,0 +1,144 @@
+import unittest
+import os
+import re
+
+from gdaljson import VRTDataset, VRTWarpedDataset
+
+
+class PipelineTestCases(unittest.TestCase):
+    """
+    Testing deferred pipelines and operation fusion
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.warped = VRTWarpedDataset(vrtfile.read())
+
+    def assertPlanEqual(self, pipeline, vrt, **kwargs):
+        expected = vrt.clone()
+        if isinstance(vrt, VRTWarpedDataset):
+            expected.warp(**kwargs)
+        else:
+            expected.translate(**kwargs)
+        self.assertEqual(pipeline.to_bytes(), expected.to_bytes())
+
+    def assertChainEqual(self, pipeline, vrt):
+        """The pipeline gives the same VRT as the eager chain of its operations (up to floating point noise)"""
+        expected = vrt.clone()
+        for (op, kwargs) in pipeline.ops:
+            getattr(expected, op)(**kwargs)
+
+        def rounded(data):
+            return re.sub(rb"-?\d+\.\d+(e[-+]?\d+)?", lambda m: b"%.9g" % float(m.group()), data)
+
+        self.assertEqual(rounded(pipeline.to_bytes()), rounded(expected.to_bytes()))
+
+    def test_nested_srcwin(self):
+        before = self.vrt.to_bytes()
+        pipeline = self.vrt.deferred().translate(srcWin=[10, 20, 300, 300]).translate(srcWin=[5, 5, 100, 50])
+        self.assertEqual(pipeline.plan, [("translate", {"srcWin": [15, 25, 100, 50]})])
+        self.assertPlanEqual(pipeline, self.vrt, srcWin=[15, 25, 100, 50])
+        self.assertChainEqual(pipeline, self.vrt)
+        self.assertEqual(self.vrt.to_bytes(), before)
+
+    def test_resize(self):
+        pipeline = self.vrt.deferred().translate(width=100).translate(height=200, width=300)
+        self.assertEqual(pipeline.plan, [("translate", {"height": 200, "width": 300})])
+        self.assertChainEqual(pipeline, self.vrt)
+
+        # A single dimension is scaled from the rounded size of the previous output
+        pipeline = self.vrt.deferred().translate(width=100).translate(width=300)
+        self.assertEqual(len(pipeline.plan), 2)
+        self.assertChainEqual(pipeline, self.vrt)
+
+        # A window of a resized output is scaled back to source pixels
+        pipeline = self.vrt.deferred().translate(srcWin=[0, 0, 200, 200], width=100).translate(srcWin=[10, 10, 50, 50])
+        self.assertEqual(pipeline.plan, [("translate", {"srcWin": [20, 20, 100, 100], "width": 50, "height": 50})])
+        self.assertChainEqual(pipeline, self.vrt)
+
+        # Unless it doesn't line up with source pixels, in which case it is still a window of the previous output
+        pipeline = self.vrt.deferred().translate(srcWin=[0, 0, 200, 200], width=120).translate(srcWin=[1, 1, 50, 50])
+        self.assertEqual(len(pipeline.plan), 2)
+        self.assertChainEqual(pipeline, self.vrt)
+        result = pipeline.materialize()
+        self.assertAlmostEqual(result.src_rect[0], 1 / 0.6)
+        self.assertAlmostEqual(result.src_rect[2], 50 / 0.6)
+        self.assertEqual(result.dst_rect, [0, 0, 50, 50])
+        self.assertAlmostEqual(result.tlx, self.vrt.tlx + self.vrt.xres / 0.6)
+
+        # Resolutions round the output size
+        pipeline = self.vrt.deferred().translate(xRes=self.vrt.xres * 2.3, yRes=self.vrt.yres * 2.3).translate(
+            srcWin=[10, 10, 50, 50])
+        self.assertEqual(len(pipeline.plan), 2)
+        self.assertChainEqual(pipeline, self.vrt)
+
+    def test_bandlist(self):
+        pipeline = self.vrt.deferred().translate(bandList=[2, 3, 4]).translate(bandList=[3, 1], noData=0.5)
+        self.assertEqual(pipeline.plan, [("translate", {"bandList": [4, 2], "noData": 0.5})])
+        self.assertPlanEqual(pipeline, self.vrt, bandList=[4, 2], noData=0.5)
+        self.assertChainEqual(pipeline, self.vrt)
+
+        # Reordered bands keep the order of their band elements, which a later bandList selects from
+        pipeline = self.vrt.deferred().translate(bandList=[4, 3, 2]).translate(bandList=[3, 1])
+        self.assertEqual(len(pipeline.plan), 2)
+        self.assertChainEqual(pipeline, self.vrt)
+
+    def test_projwin(self):
+        (tlx, tly, res) = (self.vrt.tlx, self.vrt.tly, self.vrt.xres)
+        pipeline = self.vrt.deferred().translate(srcWin=[100, 100, 300, 300]).translate(
+            projWin=[tlx + 110.5 * res, tly - 120.5 * res, tlx + 160.5 * res, tly - 150.5 * res])
+        self.assertEqual(pipeline.plan, [("translate", {"srcWin": [110, 120, 50, 30]})])
+        self.assertChainEqual(pipeline, self.vrt)
+
+    def test_chain(self):
+        # Steps which aren't fused are applied to the output of the previous step
+        pipeline = self.vrt.deferred().translate(srcWin=[10, 20, 300, 300], scaleParams=[0, 100, 0, 255]).translate(
+            srcWin=[5, 5, 100, 50]).translate(width=40, bandList=[2])
+        self.assertEqual(len(pipeline.plan), 3)
+        self.assertChainEqual(pipeline, self.vrt)
+        self.assertEqual(pipeline.materialize().src_rect, [15, 25, 100, 50])
+
+    def test_warp(self):
+        pipeline = self.warped.deferred().warp(dstSRS=32611, clipper=self.clipper, cropToCutline=True).warp(
+            dstAlpha=True).warp(tune=True)
+        self.assertEqual(pipeline.plan, [("warp", {
+            "dstSRS": 32611,
+            "clipper": self.clipper,
+            "cropToCutline": True,
+            "dstAlpha": True,
+            "tune": True
+        })])
+        self.assertPlanEqual(pipeline, self.warped, dstSRS=32611, clipper=self.clipper, cropToCutline=True,
+                             dstAlpha=True, tune=True)
+        self.assertChainEqual(pipeline, self.warped)
+
+        # A resize is rounded from the previous output, whose size the block size was clamped to
+        pipeline = self.warped.deferred().warp(clipper=self.clipper, cropToCutline=True).warp(width=300).warp(
+            dstAlpha=True)
+        self.assertEqual(pipeline.plan, [("warp", {
+            "clipper": self.clipper,
+            "cropToCutline": True
+        }), ("warp", {
+            "width": 300,
+            "dstAlpha": True
+        })])
+        self.assertChainEqual(pipeline, self.warped)
+        pipeline = self.warped.deferred().warp(width=200).warp(width=300)
+        self.assertEqual(len(pipeline.plan), 2)
+        self.assertChainEqual(pipeline, self.warped)
+
+        pipeline = self.warped.deferred().warp(clipper=self.clipper).warp(dstSRS=32611)
+        self.assertEqual(len(pipeline.plan), 2)
+        self.assertChainEqual(pipeline, self.warped)
+
+        # A clipper is read in the SRS of the previous output, where this one misses the raster as in the eager chain
+        pipeline = self.warped.deferred().warp(dstSRS=32611).warp(clipper=self.clipper)
+        self.assertEqual(len(pipeline.plan), 2)
+        with self.assertRaises(ValueError):
+            pipeline.materialize()
+        with self.assertRaises(ValueError):
+            self.warped.derive(dstSRS=32611).warp(clipper=self.clipper)
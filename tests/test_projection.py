@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from gdaljson.projection import CRSRegistry, densify_extent, transform_extent, transformer
+
+
+class CRSRegistryTestCases(unittest.TestCase):
+    """
+    Testing the layered CRS resolver without network access
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmpdir.name, "crs.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_local_resolution(self):
+        registry = CRSRegistry(network=False)
+        wkt_string = registry.resolve(32611)
+        self.assertTrue(wkt_string.startswith("PROJCS"))
+        self.assertEqual(wkt_string.split(",")[-1][1:-3], "32611")
+        registry.resolve("32611")
+        self.assertEqual(registry.stats["local_hits"], 1)
+        self.assertEqual(registry.stats["memory_hits"], 1)
+        self.assertEqual(registry.stats["network_hits"], 0)
+
+    def test_persistent_store(self):
+        CRSRegistry(path=self.db, network=False).seed({4326: "SEEDED"})
+        registry = CRSRegistry(path=self.db, network=False)
+        self.assertEqual(registry.resolve(4326), "SEEDED")
+        self.assertEqual(registry.stats["disk_hits"], 1)
+        self.assertEqual(registry.stats["local_hits"], 0)
+
+    def test_unknown_code(self):
+        registry = CRSRegistry(network=False)
+        with self.assertRaises(ValueError):
+            registry.resolve(1)
+        self.assertEqual(registry.stats["errors"], 1)
+
+    def test_threaded_counters(self):
+        registry = CRSRegistry(network=False, maxsize=0)
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(registry.resolve, [4326] * 400))
+        self.assertEqual(registry.stats["local_hits"], 400)
+
+
+class TransformerPoolTestCases(unittest.TestCase):
+    """
+    Testing the pooled coordinate transformers
+    """
+
+    def test_reuse(self):
+        self.assertIs(transformer(4326, 32611), transformer("4326", "32611"))
+        self.assertIsNot(transformer(4326, 32611), transformer(4326, 3857))
+
+    def test_axis_order(self):
+        x, y = transformer(4326, 32611).transform(-117, 0)
+        self.assertAlmostEqual(x, 500000, places=3)
+        self.assertAlmostEqual(y, 0, places=3)
+
+
+class TransformExtentTestCases(unittest.TestCase):
+    """
+    Testing batched extent reprojection against the four-corner path
+    """
+
+    def setUp(self):
+        self.extent = [-120.33, -120.12, 36.02, 36.22]
+        self.proj_transformer = transformer(4326, 32611)
+
+    def test_corners(self):
+        proj_tl, proj_br, bounds = transform_extent(self.proj_transformer, self.extent, densify=2)
+        corners = [
+            self.proj_transformer.transform(x, y)
+            for (x, y) in [(-120.33, 36.22), (-120.33, 36.02), (-120.12, 36.02), (-120.12, 36.22)]
+        ]
+        self.assertEqual(proj_tl, corners[0])
+        self.assertEqual(proj_br, corners[2])
+        self.assertEqual(bounds[0], min(c[0] for c in corners))
+        self.assertEqual(bounds[3], max(c[1] for c in corners))
+
+    def test_densify_validation(self):
+        for densify in (1, 0, -3):
+            with self.assertRaises(ValueError):
+                densify_extent(self.extent, densify)
+            with self.assertRaises(ValueError):
+                transform_extent(self.proj_transformer, self.extent, densify=densify)
+
+    def test_densified_contains_corners(self):
+        corner_bounds = transform_extent(self.proj_transformer, self.extent, densify=2)[2]
+        bounds = transform_extent(self.proj_transformer, self.extent, densify=21)[2]
+        self.assertLessEqual(bounds[0], corner_bounds[0])
+        self.assertGreaterEqual(bounds[1], corner_bounds[1])
+        self.assertLessEqual(bounds[2], corner_bounds[2])
+        self.assertGreaterEqual(bounds[3], corner_bounds[3])
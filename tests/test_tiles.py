@@ -0,0 +1,81 @@
+import unittest
+import os
+
+from gdaljson import VRTDataset
+
+
+class TileTestCases(unittest.TestCase):
+    """
+    Testing the batch tile generator
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.vrt = VRTDataset(vrtfile.read())
+
+    def test_windows(self):
+        windows = self.vrt.tile_windows(256).tolist()
+        self.assertEqual(len(windows), 9)
+        self.assertEqual(windows[0], [0, 0, 256, 256])
+        # Edge tiles are truncated to the raster
+        self.assertEqual(windows[2], [512, 0, 140, 256])
+        self.assertEqual(windows[-1], [512, 512, 140, 110])
+
+    def test_overlap(self):
+        windows = self.vrt.tile_windows([300, 200], overlap=[50, 20]).tolist()
+        self.assertEqual([w[0] for w in windows[:3]], [0, 250, 500])
+        self.assertEqual(windows[2][2], 152)
+        self.assertEqual(sorted(set(w[1] for w in windows)), [0, 180, 360, 540])
+        with self.assertRaises(ValueError):
+            self.vrt.tile_windows(256, overlap=256)
+
+    def test_tiles_match_translate(self):
+        before = self.vrt.to_bytes()
+        windows = self.vrt.tile_windows(200, overlap=16).tolist()
+        tiles = list(self.vrt.tiles(200, overlap=16))
+        self.assertEqual(len(tiles), len(windows))
+        for (window, tile) in zip(windows, tiles):
+            self.assertEqual(tile.to_bytes(), self.vrt.derive(srcWin=window).to_bytes())
+        self.assertEqual(self.vrt.to_bytes(), before)
+
+    def test_tiles_of_derived(self):
+        # Windows are of the current output, which may already be windowed or resampled
+        for kwargs in ({"srcWin": [100, 100, 300, 300]}, {"width": 326}, {"srcWin": [10, 20, 400, 300], "width": 300}):
+            vrt = self.vrt.derive(**kwargs)
+            windows = vrt.tile_windows(128).tolist()
+            for (window, tile) in zip(windows, vrt.tiles(128)):
+                self.assertEqual(tile.to_bytes(), vrt.derive(srcWin=window).to_bytes())
+        tile = next(self.vrt.derive(srcWin=[100, 100, 300, 300]).tiles(128))
+        self.assertEqual(tile.src_rect, [100, 100, 128, 128])
+
+    def test_projwin(self):
+        projWin = [self.vrt.tlx + 100 * self.vrt.xres, self.vrt.tly - 50 * self.vrt.yres,
+                   self.vrt.tlx + 400 * self.vrt.xres, self.vrt.tly - 250 * self.vrt.yres]
+        window = self.vrt.projwin_to_srcwin(projWin)
+        tiles = list(self.vrt.tiles(128, projWin=projWin))
+        self.assertEqual(tiles[0].src_rect[:2], window[:2])
+        self.assertEqual(sum(tile.xsize for tile in tiles[:3]), window[2])
+        self.assertEqual(sum(tiles[i].ysize for i in range(0, len(tiles), 3)), window[3])
+
+    def test_projwin_outside(self):
+        # A region hanging 100 pixels off the left and top edges
+        projWin = [self.vrt.tlx - 100 * self.vrt.xres, self.vrt.tly + 100 * self.vrt.yres,
+                   self.vrt.tlx + 300 * self.vrt.xres, self.vrt.tly - 200 * self.vrt.yres]
+        windows = self.vrt.tile_windows(128, projWin=projWin).tolist()
+        self.assertEqual(windows[0], [0, 0, 28, 28])
+        self.assertEqual(windows[-1], [284, 156, 16, 44])
+        for (xoff, yoff, xsize, ysize) in windows:
+            self.assertTrue(xoff >= 0 and yoff >= 0 and xsize > 0 and ysize > 0)
+            self.assertTrue(xoff + xsize <= self.vrt.xsize and yoff + ysize <= self.vrt.ysize)
+        self.assertEqual(sum(w[2] for w in windows if w[1] == 0), 300)
+        tiles = list(self.vrt.tiles(128, projWin=projWin))
+        self.assertEqual(tiles[0].to_bytes(), self.vrt.derive(srcWin=windows[0]).to_bytes())
+
+        # Beyond the right and bottom edges, and entirely outside
+        windows = self.vrt.tile_windows(256, projWin=[self.vrt.extent[1] - 10 * self.vrt.xres, self.vrt.tly,
+                                                     self.vrt.extent[1] + 500 * self.vrt.xres, self.vrt.extent[2]])
+        self.assertEqual(windows.tolist(), [[642, 0, 10, 256], [642, 256, 10, 256], [642, 512, 10, 110]])
+        outside = [self.vrt.tlx - 500 * self.vrt.xres, self.vrt.tly,
+                   self.vrt.tlx - 100 * self.vrt.xres, self.vrt.extent[2]]
+        self.assertEqual(self.vrt.tile_windows(128, projWin=outside).shape, (0, 4))
@@ -0,0 +1,119 @@
+import unittest
+import io
+import os
+import xml.etree.ElementTree as ET
+
+from xmljsonfork import badgerfish as bf
+
+from gdaljson import VRTDataset, VRTWarpedDataset, dumps, loads
+from gdaljson.transformations import LazyList
+
+
+def mosaic(sources: int, bands: int = 2) -> str:
+    """Synthetic mosaic VRT with `sources` SimpleSources per band"""
+    template = (
+        '<SimpleSource><SourceFilename relativeToVRT="1">tile_{i}.tif</SourceFilename><SourceBand>{b}</SourceBand>'
+        '<SrcRect xOff="0" yOff="0" xSize="256" ySize="256" />'
+        '<DstRect xOff="{x}" yOff="{y}" xSize="256" ySize="256" /></SimpleSource>')
+    vrt_bands = [
+        f'<VRTRasterBand dataType="Byte" band="{b}"><NoDataValue>0</NoDataValue>' + "".join(
+            template.format(i=i, b=b, x=(i % 10) * 256, y=(i // 10) * 256) for i in range(sources)) +
+        "</VRTRasterBand>" for b in range(1, bands + 1)
+    ]
+    return ('<VRTDataset rasterXSize="2560" rasterYSize="2560"><SRS>EPSG:4326</SRS>'
+            "<GeoTransform>0.0, 1.0, 0.0, 0.0, 0.0, -1.0</GeoTransform>" + "".join(vrt_bands) + "</VRTDataset>")
+
+
+class LazyLoadTestCases(unittest.TestCase):
+    """
+    Testing the lazy loader against the eager badgerfish loader
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        with open(os.path.join(templates, "translate.vrt")) as vrtfile:
+            self.translatevrt = vrtfile.read()
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.warpedvrt = vrtfile.read()
+
+    def test_equivalent(self):
+        for vrt in (self.translatevrt, self.warpedvrt, mosaic(50)):
+            self.assertEqual(loads(vrt, lazy=True), loads(vrt))
+
+    def test_deferred(self):
+        data = loads(mosaic(50), lazy=True)
+        bands = data["VRTDataset"]["VRTRasterBand"]
+        self.assertIsInstance(bands, LazyList)
+        self.assertEqual(bands.materialized, 0)
+        sources = bands[0]["SimpleSource"]
+        self.assertEqual((bands.materialized, sources.materialized), (1, 0))
+        self.assertEqual(sources[3]["DstRect"]["@xOff"], 768)
+        self.assertEqual(sources.materialized, 1)
+        self.assertEqual(loads(dumps(data)), loads(mosaic(50)))
+
+    def test_empty_elements(self):
+        # Minified, with empty bands and sources right before their parent's end tag
+        vrt = ('<VRTDataset rasterXSize="1" rasterYSize="1"><GeoTransform>0, 1, 0, 0, 0, -1</GeoTransform>'
+               '<VRTRasterBand dataType="Byte" band="1"><NoDataValue>0</NoDataValue><SimpleSource /></VRTRasterBand>'
+               '<VRTRasterBand dataType="Byte" band="2"><SimpleSource></SimpleSource><SimpleSource/></VRTRasterBand>'
+               '<VRTRasterBand dataType="Byte" band="3"/></VRTDataset>')
+        data = loads(vrt, lazy=True)
+        ET.fromstring(dumps(data))
+        self.assertEqual(loads(dumps(data)), loads(vrt))
+        self.assertEqual(loads(vrt, lazy=True), loads(vrt))
+
+    def test_translate(self):
+        eager, lazy = VRTDataset(self.translatevrt), VRTDataset(self.translatevrt, lazy=True)
+        for vrt in (eager, lazy):
+            vrt.translate(bandList=[1, 3], srcWin=[10, 20, 100, 150])
+        self.assertEqual(loads(str(lazy)), loads(str(eager)))
+
+    def test_warp(self):
+        eager, lazy = VRTWarpedDataset(self.warpedvrt), VRTWarpedDataset(self.warpedvrt, lazy=True)
+        for vrt in (eager, lazy):
+            vrt.warp(xRes=0.001, yRes=0.001, dstAlpha=True)
+        self.assertEqual(loads(str(lazy)), loads(str(eager)))
+
+
+class WriterTestCases(unittest.TestCase):
+    """
+    Testing the direct xml writer against the badgerfish -> ElementTree path
+    """
+
+    @staticmethod
+    def etree_dumps(d):
+        return ET.tostring(bf.etree(d)[0])
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.docs = {}
+        for name in ("translate", "warped"):
+            with open(os.path.join(templates, f"{name}.vrt")) as vrtfile:
+                self.docs[name] = vrtfile.read()
+
+    def test_templates(self):
+        for xml in list(self.docs.values()) + [mosaic(20)]:
+            data = loads(xml)
+            self.assertEqual(dumps(data), self.etree_dumps(data))
+
+    def test_operations(self):
+        translated = VRTDataset(self.docs["translate"])
+        translated.translate(bandList=[1, 3], projWin=[-120.3, 36.2, -120.2, 36.1], scaleParams=[0, 10000, 0, 255])
+        warped = VRTWarpedDataset(self.docs["warped"])
+        warped.warp(clipper=os.path.join(os.path.split(__file__)[0], "templates/clipper.geojson"),
+                    cropToCutline=True,
+                    dstAlpha=True)
+        for vrt in (translated, warped):
+            self.assertEqual(vrt.to_bytes(), self.etree_dumps(vrt.data))
+            outfile = io.BytesIO()
+            vrt.to_xml(outfile)
+            self.assertEqual(outfile.getvalue(), self.etree_dumps(vrt.data))
+
+    def test_escaping(self):
+        data = loads(self.docs["translate"])
+        root = data["VRTDataset"]
+        root["SRS"]["$"] = 'a & b < c > "d" é\n'
+        root["@note"] = '1 "&" <\n\t\r>'
+        root["Empty"] = None
+        root["Flags"] = [{"$": 0}, {"$": ""}, {"@on": True, "$": 0.5}, False]
+        self.assertEqual(dumps(data), self.etree_dumps(data))
@@ -0,0 +1,68 @@
+import unittest
+import os
+
+from gdaljson import VRTWarpedDataset
+from gdaljson.tuning import MIN_BLOCK, chunk_bytes, kernel_radius, tune_warp
+
+
+class TuningTestCases(unittest.TestCase):
+    """
+    Testing warp block size, memory limit and option tuning
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.vrt = VRTWarpedDataset(vrtfile.read())
+
+    def test_rules(self):
+        # Small nearest neighbour output: one block clamped to the raster, single threaded, no source padding
+        tuning = tune_warp(300, 200, 3, "Byte", threads=8)
+        self.assertEqual(tuning.blocksize, [300, 200])
+        self.assertEqual(tuning.options, {"NUM_THREADS": "1"})
+        self.assertEqual(tuning.warp_memory_limit, 64 * 1024 * 1024)
+
+        # Large outputs get 512x512 blocks, threaded by rows
+        # Without a thread count, GDAL uses the CPUs of the host running the VRT
+        self.assertEqual(tune_warp(10000, 10000, 3, "Byte").options["NUM_THREADS"], "ALL_CPUS")
+        self.assertEqual(tune_warp(300, 200, 3, "Byte").options["NUM_THREADS"], "1")
+        tuning = tune_warp(10000, 10000, 3, "Byte", threads=4)
+        self.assertEqual(tuning.blocksize, [512, 512])
+        self.assertEqual(tuning.options["NUM_THREADS"], "4")
+
+        # Kernels with a radius pad the source window and are threaded even on small blocks
+        tuning = tune_warp(300, 200, 3, "Byte", resample="Cubic", threads=8)
+        self.assertEqual(tuning.options, {"NUM_THREADS": "3", "SOURCE_EXTRA": "3"})
+        self.assertEqual(kernel_radius("Lanczos", scale=2), 6)
+        self.assertEqual(kernel_radius("Average", scale=4), 2)
+        with self.assertRaises(ValueError):
+            kernel_radius("Gaussian")
+
+        # Blocks shrink, longer side first, until a chunk fits the budget
+        tuning = tune_warp(10000, 10000, 8, "Float64", memory=8 * 1024 * 1024, scale=2)
+        self.assertEqual(tuning.blocksize, [128, 128])
+        self.assertLessEqual(tuning.chunk_bytes, 8 * 1024 * 1024)
+        self.assertEqual(tuning.chunk_bytes, chunk_bytes([128, 128], 8, "Float64", scale=2))
+        tuning = tune_warp(10000, 10000, 8, "Float64", memory=1024)
+        self.assertEqual(tuning.blocksize, [MIN_BLOCK, MIN_BLOCK])
+
+    def test_warp(self):
+        warped = self.vrt.derive(width=300, resample="Bilinear", tune={"memory": 32 * 1024 * 1024, "threads": 2})
+        self.assertEqual(warped.blocksize, [300, 286])
+        self.assertEqual(warped.warp_options.warp_memory_limit, 32 * 1024 * 1024)
+        self.assertEqual(warped.warp_options.option("NUM_THREADS"), "2")
+        # Downsampling by ~2.2 widens the bilinear kernel to 3 pixels
+        self.assertEqual(warped.warp_options.option("SOURCE_EXTRA"), "4")
+        self.assertEqual(warped.warp_options.option("INIT_DEST"), "NO_DATA")
+        self.assertIsNone(self.vrt.warp_options.option("NUM_THREADS"))
+        self.assertEqual(self.vrt.blocksize, [512, 128])
+
+        # Retuning replaces options instead of appending them
+        warped.warp(resample="NearestNeighbour", tune=True)
+        self.assertEqual([o["@name"] for o in warped.warp_options.opts["Option"]], ["INIT_DEST", "NUM_THREADS"])
+
+    def test_untuned_blocksize(self):
+        # Without tuning, blocks are only clamped to the raster
+        self.assertEqual(self.vrt.derive(width=300).blocksize, [300, 128])
+        self.assertEqual(self.vrt.derive(width=100).blocksize, [100, 95])
+        self.assertEqual(self.vrt.derive(width=1000).blocksize, [512, 128])
@@ -0,0 +1,53 @@
+import unittest
+import os
+
+from shapely.affinity import translate
+from shapely.geometry import mapping
+
+from gdaljson import VRTWarpedDataset
+from gdaljson.clipper import load_clipper, load_clippers
+
+
+class WarpManyTestCases(unittest.TestCase):
+    """
+    Testing batch warps with many cutlines
+    """
+
+    def setUp(self):
+        templates = os.path.join(os.path.split(__file__)[0], "templates")
+        self.clipper = os.path.join(templates, "clipper.geojson")
+        with open(os.path.join(templates, "warped.vrt")) as vrtfile:
+            self.vrt = VRTWarpedDataset(vrtfile.read())
+        geom = load_clipper(self.clipper)
+        self.geoms = [translate(geom, 0.002 * i, -0.001 * i) for i in range(5)]
+
+    def assertMatchesWarp(self, warped, **kwargs):
+        warped = list(warped)
+        self.assertEqual(len(warped), len(self.geoms))
+        for (geom, vrt) in zip(self.geoms, warped):
+            self.assertEqual(vrt.to_bytes(), self.vrt.derive(clipper=geom, **kwargs).to_bytes())
+
+    def test_load_clippers(self):
+        collection = {
+            "type": "FeatureCollection",
+            "features": [{"type": "Feature", "properties": {}, "geometry": mapping(g)} for g in self.geoms],
+        }
+        self.assertEqual(load_clippers(collection), self.geoms)
+        self.assertEqual(load_clippers(self.geoms), self.geoms)
+        self.assertEqual(len(load_clippers(self.clipper)), 1)
+        with self.assertRaises(ValueError):
+            load_clippers([1])
+
+    def test_warp_many(self):
+        before = self.vrt.to_bytes()
+        self.assertMatchesWarp(self.vrt.warp_many(self.geoms, cropToCutline=True, dstAlpha=True),
+                               cropToCutline=True, dstAlpha=True)
+        self.assertEqual(self.vrt.to_bytes(), before)
+
+    def test_warp_many_reproject(self):
+        self.assertMatchesWarp(self.vrt.warp_many(self.geoms, dstSRS=32611, cropToCutline=True),
+                               dstSRS=32611, cropToCutline=True)
+
+    def test_warp_many_workers(self):
+        self.assertMatchesWarp(self.vrt.warp_many(self.geoms, cropToCutline=True, workers=2),
+                               cropToCutline=True)